@@ -1,4 +1,8 @@
-from src.ui.main_window import run
-
-if __name__ == "__main__":
+import multiprocessing
+from src.modules.logger import logger
+from src.ui.main_window import run
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support() # 打包后进程模式的子进程需要
+    logger.init() # 日志写在当前目录，与配置文件放在一起
     run()
\ No newline at end of file
@@ -0,0 +1,252 @@
+import sys
+import json
+import time
+import argparse
+import functools
+import threading
+from PySide6.QtCore import Qt
+from .modules.logger import logger
+from .modules.thread_budget import thread_budget
+
+REPLAY_HWND = 1 # 回放时使用的占位窗口句柄
+
+
+class ProgressPrinter:
+    """
+    把执行器的信号和日志以 JSON 行输出到标准输出，便于脚本读取.
+
+    每行一个对象，包含 ts(时间戳) 和 event(事件类型)，其余字段随事件类型不同：
+    - started / finished / stopped / paused / resumed
+    - status: status
+    - progress: progress
+    - task: task, index
+    - log: level, message
+    - replay: frames, clicks（--replay 时，clicks 为 [模拟时间, x, y] 列表）
+    - result: status, elapsed
+    """
+
+    def __init__(self, stream=None):
+        """
+        Args:
+            stream: 输出流，默认为标准输出。
+        """
+        self.stream = stream or sys.stdout
+        self.status = "未运行"
+        self._lock = threading.Lock()
+
+    def emit(self, event: str, **fields):
+        """
+        输出一行事件，可在任务线程中调用.
+        """
+        record = {"ts": round(time.time(), 3), "event": event}
+        record.update(fields)
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+    def on_status(self, status: str):
+        self.status = status
+        self.emit("status", status=status)
+
+    def on_log(self, message: str, level: str, mode: int):
+        self.emit("log", level=level, message=message)
+
+    def connect(self, runner):
+        """
+        连接执行器的信号，直接在发出信号的线程中输出，不需要 Qt 事件循环.
+        """
+        direct = Qt.ConnectionType.DirectConnection
+        for name in ("started", "finished", "stopped", "paused", "resumed"):
+            getattr(runner, name).connect(functools.partial(self.emit, name), direct)
+        runner.status_msg_changed.connect(self.on_status, direct)
+        runner.progress_changed.connect(lambda progress: self.emit("progress", progress=progress), direct)
+        runner.current_task_changed.connect(lambda name, index: self.emit("task", task=name, index=index), direct)
+
+
+def parse_overrides(items: list[str]) -> dict:
+    """
+    解析 key=value 形式的配置覆盖，值按 JSON 解析，失败时作为字符串.
+
+    Args:
+        items (list[str]): 如 ["match_loop_delay=1.5", "window_title=一梦江湖"]。
+
+    Returns:
+        dict: 配置项 -> 值。
+
+    Raises:
+        ValueError: 缺少 "="。
+    """
+    overrides = {}
+    for item in items:
+        if "=" not in item:
+            raise ValueError(f"配置覆盖格式应为 key=value: {item}")
+        key, value = item.split("=", 1)
+        try:
+            overrides[key.strip()] = json.loads(value)
+        except ValueError:
+            overrides[key.strip()] = value
+    return overrides
+
+
+def load_config(path: str | None, overrides: dict) -> dict:
+    """
+    读取任务配置并应用命令行覆盖，不写回配置文件.
+
+    Args:
+        path (str | None): 配置文件路径，为 None 时使用 task_config.json。
+        overrides (dict): 命令行覆盖的配置项。
+
+    Returns:
+        dict: 生效的任务配置（即 task_cfg_model.task_cfg）。
+    """
+    from .ui.models.task_cfg_model import task_cfg_model
+    if path is not None:
+        with open(path, "r", encoding="utf-8") as f:
+            task_cfg_model.task_cfg.update(json.load(f))
+    task_cfg_model.task_cfg.update(overrides)
+    return task_cfg_model.task_cfg
+
+
+def resolve_window(window: str, finder) -> int | None:
+    """
+    把 --window 参数解析为窗口句柄.
+
+    Args:
+        window (str): 窗口句柄（十进制或 0x 开头的十六进制）或标题关键词/正则表达式。
+        finder (Callable[[str], list[int]]): 按标题查找窗口句柄的函数。
+
+    Returns:
+        int | None: 窗口句柄，按标题找不到时返回 None。
+    """
+    try:
+        return int(window, 0)
+    except ValueError:
+        pass
+    handles = finder(window)
+    return handles[0] if handles else None
+
+
+def run(args) -> int:
+    """
+    run 子命令：在一个窗口上运行任务队列直到完成或被中断.
+
+    Returns:
+        int: 退出码，任务全部完成为 0，否则为 1。
+    """
+    logger.init(args.log_dir)
+    printer = ProgressPrinter()
+    if not args.no_logs:
+        logger.add_listener(printer.on_log)
+
+    try:
+        cfg = load_config(args.config, parse_overrides(args.set))
+    except (OSError, ValueError) as e:
+        printer.emit("error", message=f"读取配置失败: {e}")
+        return 1
+    loops = args.loops if args.loops is not None else cfg.get("loop_count", 1)
+    timeout = args.timeout if args.timeout is not None else cfg.get("timeout", 600)
+    stuck_timeout = cfg.get("stuck_timeout", 60)
+
+    from .ui.models.task_data_model import TaskDataModel
+    task_names = [name.strip() for name in args.tasks.replace("，", ",").split(",") if name.strip()]
+    unknown = [name for name in task_names if name not in TaskDataModel.TASK_MAP]
+    if not task_names or unknown:
+        printer.emit("error", message=f"未知任务: {', '.join(unknown) or '(空)'}，可用任务: {', '.join(TaskDataModel.TASK_MAP)}")
+        return 1
+
+    # 单实例运行，线程预算全部给这一个窗口
+    thread_budget.configure(cfg.get("thread_budget", 0), cfg.get("match_workers", 0))
+    thread_budget.apply(1)
+
+    replay_clicker = None
+    if args.replay:
+        # 回放录制的画面，点击只记录不发送，默认按虚拟时间快速跑完
+        from .modules.clock import VirtualClock, real_clock
+        from .modules.replay_capture import ReplayCapture, ReplayClicker
+        from .ui.core.task_runner import TaskRunner
+        from .simulator.desktop import isolate_records
+        clock = real_clock if args.real_time else VirtualClock()
+        try:
+            wincap = ReplayCapture(args.replay, clock=clock)
+        except (OSError, ValueError) as e:
+            printer.emit("error", message=f"读取录制失败: {e}")
+            return 1
+        isolate_records("ymjh_cli_")
+        replay_clicker = ReplayClicker(clock)
+        hwnd = REPLAY_HWND
+        runner = TaskRunner(wincap=wincap, clicker=replay_clicker, clock=clock)
+    elif args.sim:
+        from .simulator.desktop import SimDesktop, isolate_records
+        isolate_records("ymjh_cli_")
+        desktop = SimDesktop(virtual_time=not args.real_time)
+        hwnd = desktop.create_window(args.scenario)
+        runner = desktop.create_runner(hwnd, record_dir=args.record)
+    else:
+        from .ui.core.window_manager import WindowManager
+        from .ui.core.task_runner import TaskRunner
+        hwnd = resolve_window(args.window or cfg.get("window_title", ""), WindowManager().get_windows_by_filter)
+        if hwnd is None:
+            printer.emit("error", message=f"未找到窗口: {args.window}")
+            return 1
+        wincap = None
+        if args.record:
+            from .modules.window_capture import WindowCapture
+            from .modules.replay_capture import RecordingCapture
+            wincap = RecordingCapture(WindowCapture(), args.record)
+        runner = TaskRunner(wincap=wincap)
+
+    data_model = TaskDataModel()
+    data_model.add_tasks_by_names(task_names)
+    printer.connect(runner)
+    printer.emit("config", hwnd=hwnd, tasks=task_names, loops=loops, timeout=timeout, stuck_timeout=stuck_timeout)
+
+    start_time = time.time()
+    runner.start(data_model.get_tasks(), hwnd, loop_count=loops, timeout=timeout, stuck_timeout=stuck_timeout)
+    try:
+        while runner.is_running():
+            time.sleep(0.2)
+    except KeyboardInterrupt:
+        runner.stop()
+    # 等待工作线程发完收尾信号
+    if getattr(runner, "_thread", None) is not None:
+        runner._thread.join(timeout=5)
+    if replay_clicker is not None:
+        printer.emit("replay", frames=wincap.frame_count,
+                     clicks=[[round(t, 2), x, y] for t, x, y in replay_clicker.clicks])
+    printer.emit("result", status=printer.status, elapsed=round(time.time() - start_time, 2))
+    logger.save_log_to_file()
+    return 0 if printer.status == "已完成" else 1
+
+
+def main():
+    """
+    命令行入口: python -m src.cli run --window 一梦江湖 --tasks 日常副本,论剑 --loops 5
+    """
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="不启动界面运行任务队列，进度以 JSON 行输出")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="在一个窗口上运行任务队列")
+    run_parser.add_argument("--window", default=None, help="窗口句柄或标题关键词，默认使用配置中的目标窗口标题")
+    run_parser.add_argument("--tasks", default="日常副本", help="逗号分隔的任务名称，如 日常副本,论剑")
+    run_parser.add_argument("--loops", type=int, default=None, help="循环次数，默认使用配置中的循环次数")
+    run_parser.add_argument("--timeout", type=int, default=None, help="单个任务超时时间（秒），默认使用配置")
+    run_parser.add_argument("--config", default=None, help="任务配置文件，默认为 task_config.json")
+    run_parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                            help="覆盖配置项，可重复指定，如 --set match_loop_delay=1.5")
+    run_parser.add_argument("--no-logs", action="store_true", help="不输出日志行，只输出状态和进度")
+    run_parser.add_argument("--log-dir", default=logger.DEFAULT_LOG_DIR, help="日志文件目录，默认为当前目录")
+    run_parser.add_argument("--sim", action="store_true", help="在模拟窗口上运行，不需要游戏客户端")
+    run_parser.add_argument("--scenario", default="一梦江湖", help="--sim 时的模拟场景名称")
+    run_parser.add_argument("--real-time", action="store_true", help="--sim / --replay 时使用真实时间而不是虚拟时间")
+    run_parser.add_argument("--record", default=None, metavar="DIR", help="把任务看到的画面录制到 DIR，供 --replay 回放")
+    run_parser.add_argument("--replay", default=None, metavar="DIR",
+                            help="在 --record 录制的画面上运行任务，不需要游戏窗口，点击只记录不发送")
+    run_parser.set_defaults(handler=run)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
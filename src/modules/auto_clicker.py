@@ -3,9 +3,10 @@ import time
 import win32api
 import win32con
 import win32gui
+from .interfaces import InputDevice
 
 
-class AutoClicker:
+class AutoClicker(InputDevice):
     """
     使用 pywinauto 在后台点击指定窗口坐标.
 
@@ -0,0 +1,106 @@
+import threading
+import time
+
+
+class Clock:
+    """
+    真实时钟.
+
+    任务、看门狗和任务执行器通过时钟对象读取时间和等待，而不是直接调用 time.time() / Event.wait()，
+    这样回放和模拟时可以替换为 VirtualClock，让等待瞬间完成。
+    """
+
+    def time(self) -> float:
+        """
+        获取当前时间戳.
+
+        Returns:
+            float: 当前时间（秒）。
+        """
+        return time.time()
+
+    def wait(self, event: threading.Event, timeout: float) -> bool:
+        """
+        等待事件被设置或超时.
+
+        Args:
+            event (threading.Event): 要等待的事件（通常是停止事件）。
+            timeout (float): 最长等待时间（秒）。
+
+        Returns:
+            bool: 事件在超时前被设置返回 True。
+        """
+        return event.wait(timeout)
+
+    def sleep(self, seconds: float):
+        """
+        阻塞等待指定时间.
+
+        Args:
+            seconds (float): 等待时间（秒）。
+        """
+        time.sleep(seconds)
+
+    def real_delay(self, seconds: float) -> float:
+        """
+        把一段等待换算为需要真实等待的时间，供协作式调度器安排定时.
+
+        Args:
+            seconds (float): 等待时间（秒）。
+
+        Returns:
+            float: 需要真实等待的时间（秒）。
+        """
+        return max(0.0, seconds)
+
+
+class VirtualClock(Clock):
+    """
+    虚拟时钟.
+
+    wait() 和 sleep() 不会阻塞，而是直接把虚拟时间向前推进，
+    用于回放录制画面或模拟器中快速跑完整个任务流程。
+    """
+
+    def __init__(self, start: float = 0.0):
+        """
+        初始化虚拟时钟.
+
+        Args:
+            start (float): 起始时间（秒）。
+        """
+        self._now = start
+        self._lock = threading.Lock()
+
+    def time(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float):
+        """
+        推进虚拟时间.
+
+        Args:
+            seconds (float): 推进的时间（秒），负数会被忽略。
+        """
+        if seconds <= 0:
+            return
+        with self._lock:
+            self._now += seconds
+
+    def wait(self, event: threading.Event, timeout: float) -> bool:
+        if event.is_set():
+            return True
+        self.advance(timeout)
+        return event.is_set()
+
+    def sleep(self, seconds: float):
+        self.advance(seconds)
+
+    def real_delay(self, seconds: float) -> float:
+        # 虚拟时间直接推进，不需要真实等待
+        self.advance(seconds)
+        return 0.0
+
+
+# 默认使用的真实时钟
+real_clock = Clock()
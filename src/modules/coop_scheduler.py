@@ -0,0 +1,266 @@
+import heapq
+import itertools
+import threading
+import time
+import traceback
+from typing import Any, Callable, Generator, Optional
+from .clock import Clock, real_clock
+from .steps import Await, Sleep, Step, Throttle, WaitTemplate
+
+
+class CoopJob:
+    """
+    调度器中的一个步骤生成器（通常是一个窗口的任务队列）.
+    """
+
+    def __init__(self, steps: Generator, clock: Clock, should_stop: Callable[[], bool],
+                 is_paused: Callable[[], bool], on_done: Optional[Callable[[Any, Optional[BaseException]], None]]):
+        self.steps = steps
+        self.stack: list[Generator] = [steps]   # 正在推进的生成器，WaitTemplate 等组合步骤的 steps() 压在上面
+        self.clock = clock
+        self.should_stop = should_stop
+        self.is_paused = is_paused
+        self.on_done = on_done
+        self.step: Optional[Step] = None        # 正在等待的步骤
+        self.deadline: Optional[float] = None   # 步骤等待结束的时间（按任务自己的时钟）
+        self.value: Any = None                  # 下次 send 回生成器的值
+        self.error: Optional[BaseException] = None # 下次抛回生成器的异常（等待的工作出错时）
+        self.version = 0                        # 定时堆中只有版本一致的条目有效
+        self.active = False                     # 是否正在被调度线程推进
+        self.woken = False                      # 推进期间是否收到了唤醒
+        self.done = False
+
+
+class CoopScheduler:
+    """
+    单线程协作式调度器.
+
+    每个窗口的任务逻辑是一个 yield 等待步骤（Sleep / WaitTemplate / Await / Throttle）的生成器，
+    调度线程用定时堆记录各生成器下次需要推进的时间，到点推进一步，再按 yield 出来的步骤重新排队。
+    几十个窗口共用一个线程，而不是每个窗口一个大部分时间都在 sleep 的线程。
+    推进一步时不能阻塞：模板匹配提交到 match_pool 后 yield Await，任务挂起到匹配完成时才被唤醒，
+    调速器的排队和截图失败的重试也都是等待步骤，调度线程只执行截图和点击。
+    """
+    PAUSE_POLL_INTERVAL = 0.2 # 暂停时检查恢复的间隔（秒）
+    PARKED = float("inf")     # 挂起，不放入定时堆，由 wake() 重新排队
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._heap: list = []                   # (真实时间, 序号, 版本, job)
+        self._counter = itertools.count()
+        self._jobs: set[CoopJob] = set()
+        self._thread: Optional[threading.Thread] = None
+
+    def spawn(self, steps: Generator, clock: Optional[Clock] = None,
+              should_stop: Optional[Callable[[], bool]] = None, is_paused: Optional[Callable[[], bool]] = None,
+              on_done: Optional[Callable[[Any, Optional[BaseException]], None]] = None) -> CoopJob:
+        """
+        加入一个步骤生成器，立即开始推进.
+
+        Args:
+            steps (Generator): 步骤生成器。
+            clock (Clock | None): 生成器使用的时钟，虚拟时钟下等待不占用真实时间。
+            should_stop (Callable[[], bool] | None): 返回 True 时正在进行的等待立即结束。
+            is_paused (Callable[[], bool] | None): 返回 True 时暂停推进。
+            on_done (Callable | None): 生成器结束时调用 on_done(返回值, 异常)，在调度线程中执行。
+
+        Returns:
+            CoopJob: 调度任务，可传给 wake()。
+        """
+        job = CoopJob(steps, clock if clock is not None else real_clock,
+                      should_stop or (lambda: False), is_paused or (lambda: False), on_done)
+        with self._lock:
+            self._jobs.add(job)
+            self._push(job, 0)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name="CoopScheduler", daemon=True)
+                self._thread.start()
+        return job
+
+    def wake(self, job: CoopJob):
+        """
+        立即重新检查一个任务（停止、恢复时调用），不必等当前的等待结束.
+
+        Args:
+            job (CoopJob): 调度任务。
+        """
+        with self._lock:
+            if job.done:
+                return
+            if job.active:
+                job.woken = True
+            else:
+                self._push(job, 0)
+
+    def job_count(self) -> int:
+        """
+        获取正在调度的任务数.
+
+        Returns:
+            int: 任务数。
+        """
+        with self._lock:
+            return len(self._jobs)
+
+    def _push(self, job: CoopJob, delay: float):
+        """
+        按真实时间把任务放入定时堆，调用方需持有锁.
+        """
+        job.version += 1
+        heapq.heappush(self._heap, (time.monotonic() + delay, next(self._counter), job.version, job))
+        self._wakeup.notify()
+
+    def _next_job(self) -> CoopJob:
+        """
+        取出下一个到点的任务，没有时阻塞等待.
+        """
+        with self._lock:
+            while True:
+                if not self._heap:
+                    self._wakeup.wait()
+                    continue
+                when, _, version, job = self._heap[0]
+                if version != job.version or job.done:
+                    heapq.heappop(self._heap) # 已被重新安排或已结束的旧条目
+                    continue
+                delay = when - time.monotonic()
+                if delay > 0:
+                    self._wakeup.wait(delay)
+                    continue
+                heapq.heappop(self._heap)
+                job.active = True
+                job.woken = False
+                return job
+
+    def _loop(self):
+        """
+        调度线程主循环.
+        """
+        while True:
+            job = self._next_job()
+            delay = self._advance(job)
+            with self._lock:
+                job.active = False
+                if job.done:
+                    self._jobs.discard(job)
+                elif job.woken:
+                    self._push(job, 0)
+                elif delay < self.PARKED:
+                    self._push(job, delay)
+
+    def _advance(self, job: CoopJob) -> float:
+        """
+        推进一个任务，直到它需要等待或结束.
+
+        Returns:
+            float: 下次推进前需要真实等待的时间（秒），等待其它线程的工作时为 PARKED。
+        """
+        while True:
+            if job.step is not None:
+                delay = self._poll(job)
+                if delay is not None:
+                    return delay
+            value, job.value = job.value, None
+            error, job.error = job.error, None
+            steps = job.stack[-1]
+            try:
+                step = steps.send(value) if error is None else steps.throw(error)
+            except StopIteration as e:
+                job.stack.pop()
+                if not job.stack:
+                    self._finish(job, e.value, None)
+                    return 0
+                job.value = e.value # 组合步骤结束，结果交给外层生成器
+                continue
+            except Exception as e:
+                job.stack.pop()
+                if not job.stack:
+                    self._finish(job, None, e)
+                    return 0
+                job.error = e
+                continue
+            if isinstance(step, WaitTemplate):
+                # 组合步骤：直接推进它的 steps()，其中的匹配和等待同样不阻塞调度线程
+                job.stack.append(step.steps())
+                continue
+            job.step = step
+            job.deadline = None
+
+    def _poll(self, job: CoopJob) -> Optional[float]:
+        """
+        检查正在等待的步骤.
+
+        Returns:
+            float | None: 仍需等待时返回真实等待时间（挂起时为 PARKED）；步骤已完成时返回 None，结果保存在 job.value 或 job.error。
+        """
+        step = job.step
+        if isinstance(step, Await):
+            # 匹配不受停止和暂停影响，完成前挂起，完成时由回调唤醒（已完成时回调立即执行）
+            if not step.future.done():
+                if job.deadline is None:
+                    job.deadline = self.PARKED # 标记已注册回调
+                    step.future.add_done_callback(lambda _: self.wake(job))
+                return self.PARKED
+            job.step = None
+            try:
+                job.value = step.future.result()
+            except Exception as e:
+                job.error = e
+            return None
+
+        if isinstance(step, Throttle):
+            # 调速器的排队按真实时间计时
+            if job.deadline is None:
+                job.deadline = time.monotonic() + step.seconds
+            remaining = job.deadline - time.monotonic()
+            if remaining <= 0:
+                job.step = None
+                return None
+            return remaining
+
+        task = getattr(step, "task", None)
+        if job.should_stop() or (task is not None and not task.running):
+            # 被要求停止：Sleep 返回 True，其它步骤返回 None，与阻塞执行时一致
+            job.value = True if isinstance(step, Sleep) else None
+            job.step = None
+            return None
+        if job.is_paused():
+            job.deadline = None # 恢复后重新计时
+            return self.PAUSE_POLL_INTERVAL
+
+        if isinstance(step, Sleep):
+            if job.deadline is None:
+                job.deadline = job.clock.time() + step.seconds
+            remaining = job.deadline - job.clock.time()
+            if remaining <= 0:
+                job.value = False
+                job.step = None
+                return None
+            return job.clock.real_delay(remaining)
+
+        # 未知步骤：在调度线程中阻塞执行
+        try:
+            job.value = step.run_blocking(lambda seconds: job.clock.sleep(seconds) or job.should_stop()) # type: ignore
+        except Exception as e:
+            job.error = e
+        job.step = None
+        return None
+
+    def _finish(self, job: CoopJob, result: Any, error: Optional[BaseException]):
+        """
+        生成器结束后的清理.
+        """
+        job.done = True
+        job.step = None
+        if error is not None and job.on_done is None:
+            print(f"协作任务异常退出: {error}\n{traceback.format_exc()}")
+        if job.on_done is not None:
+            try:
+                job.on_done(result, error)
+            except Exception as e:
+                print(f"协作任务回调出错: {e}")
+
+
+# 全局实例
+coop_scheduler = CoopScheduler()
@@ -0,0 +1,184 @@
+import os
+import threading
+import time
+
+
+class CpuGovernor:
+    """
+    全局 CPU 调速器.
+
+    所有窗口的模板匹配共用一个令牌桶：每次匹配取一个令牌，令牌不够时排队等待，
+    总匹配速率不会超过设定的上限，机器忙时各窗口一起变慢，而不是全部卡住导致点击时机错乱。
+    同时根据最近的匹配需求计算轮询间隔的拉长倍数，让任务主动少截图少匹配，减少排队。
+
+    两种限制方式可以同时使用：
+    - 匹配速率上限（次/秒）：令牌速率固定。
+    - CPU 占用上限（%）：按本进程最近的 CPU 占用动态调整令牌速率，超出时降速，空闲时逐步恢复。
+    """
+    INITIAL_CPU_RATE = 20.0     # 只限制 CPU 占用时的初始匹配速率（次/秒）
+    MIN_RATE = 1.0              # CPU 占用限制下的最低匹配速率（次/秒）
+    MAX_STRETCH = 4.0           # 轮询间隔最多拉长的倍数
+    SAMPLE_INTERVAL = 1.0       # 统计匹配需求和 CPU 占用的周期（秒）
+
+    def __init__(self, max_rate: float = 0, max_cpu_percent: float = 0):
+        """
+        初始化调速器.
+
+        Args:
+            max_rate (float): 匹配速率上限（次/秒），0 表示不限制。
+            max_cpu_percent (float): 本进程 CPU 占用上限（占全部核心的百分比），0 表示不限制。
+        """
+        self._lock = threading.Lock()
+        self._cpu_count = max(1, os.cpu_count() or 1)
+        self._max_rate = 0.0
+        self._max_cpu = 0.0
+        self._rate = 0.0                        # 当前令牌速率（次/秒），0 为不限
+        self._tokens = 0.0                      # 桶中令牌数，为负数时表示已预定的等待
+        self._last_refill = time.monotonic()
+        self._sample_start = self._last_refill
+        self._cpu_start = time.process_time()
+        self._requests = 0                      # 本周期的匹配请求数
+        self._demand = 0.0                      # 最近一个周期的匹配请求速率（次/秒）
+        self._cpu_percent = 0.0                 # 最近一个周期的 CPU 占用（%）
+        self._stretch = 1.0                     # 轮询间隔拉长倍数
+        self._throttled = 0                     # 累计需要排队的匹配次数
+        self._wait_total = 0.0                  # 累计排队时间（秒）
+        self.configure(max_rate, max_cpu_percent)
+
+    def configure(self, max_rate: float = 0, max_cpu_percent: float = 0):
+        """
+        设置限制，两项都为 0 时关闭调速.
+
+        Args:
+            max_rate (float): 匹配速率上限（次/秒），0 表示不限制。
+            max_cpu_percent (float): 本进程 CPU 占用上限（%），0 表示不限制。
+        """
+        with self._lock:
+            self._max_rate = max(0.0, float(max_rate or 0))
+            self._max_cpu = max(0.0, float(max_cpu_percent or 0))
+            if self._max_rate > 0:
+                self._rate = self._max_rate
+            elif self._max_cpu > 0:
+                self._rate = self.INITIAL_CPU_RATE
+            else:
+                self._rate = 0.0
+                self._stretch = 1.0
+            self._tokens = min(self._tokens, self._burst())
+
+    @property
+    def enabled(self) -> bool:
+        """
+        是否开启了调速.
+        """
+        return self._rate > 0
+
+    def _burst(self) -> float:
+        """
+        令牌桶容量（1 秒的令牌），调用方需持有锁.
+        """
+        return max(1.0, self._rate)
+
+    def _refill(self, now: float):
+        """
+        按经过的时间补充令牌，调用方需持有锁.
+        """
+        self._tokens = min(self._burst(), self._tokens + (now - self._last_refill) * self._rate)
+        self._last_refill = now
+
+    def _sample(self, now: float):
+        """
+        每个统计周期更新需求速率、CPU 占用、令牌速率和拉长倍数，调用方需持有锁.
+        """
+        elapsed = now - self._sample_start
+        if elapsed < self.SAMPLE_INTERVAL:
+            return
+        cpu_now = time.process_time()
+        self._demand = self._requests / elapsed
+        self._cpu_percent = (cpu_now - self._cpu_start) / elapsed / self._cpu_count * 100
+        self._requests = 0
+        self._sample_start = now
+        self._cpu_start = cpu_now
+
+        if self._max_cpu > 0:
+            ceiling = self._max_rate if self._max_rate > 0 else float("inf")
+            if self._cpu_percent > self._max_cpu:
+                self._rate = max(self.MIN_RATE, self._rate * 0.8)
+            elif self._cpu_percent < self._max_cpu * 0.9 and self._demand >= self._rate * 0.9:
+                self._rate = min(ceiling, self._rate * 1.1 + 1)
+
+        # 已拉长的间隔压低了测得的需求，乘回去得到任务本来的需求
+        wanted = self._demand * self._stretch
+        target = min(self.MAX_STRETCH, max(1.0, wanted / self._rate)) if self._rate > 0 else 1.0
+        self._stretch = round(0.5 * self._stretch + 0.5 * target, 3)
+
+    def acquire(self) -> float:
+        """
+        取一个匹配令牌，令牌不够时阻塞等待.
+
+        Returns:
+            float: 排队等待的时间（秒），未开启调速时为 0。
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def reserve(self) -> float:
+        """
+        取一个匹配令牌但不等待，由调用方自己等待返回的时间（协作式调度时不阻塞调度线程）.
+
+        Returns:
+            float: 需要排队等待的时间（秒），未开启调速时为 0。
+        """
+        if not self.enabled:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._requests += 1
+            self._sample(now)
+            self._refill(now)
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            # 预定下一个令牌，按到达顺序依次放行
+            wait = -self._tokens / self._rate
+            self._throttled += 1
+            self._wait_total += wait
+        return wait
+
+    def stretch(self, delay: float) -> float:
+        """
+        按当前负载拉长轮询间隔.
+
+        Args:
+            delay (float): 原始等待时间（秒）。
+
+        Returns:
+            float: 拉长后的等待时间（秒）。
+        """
+        if not self.enabled:
+            return delay
+        return delay * self._stretch
+
+    def get_stats(self) -> dict:
+        """
+        获取调速状态.
+
+        Returns:
+            dict: rate(当前匹配速率上限), demand(最近的匹配需求), cpu_percent(最近的 CPU 占用),
+                  stretch(轮询间隔拉长倍数), throttled(累计排队次数), wait_total(累计排队秒数)。
+        """
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "rate": round(self._rate, 2),
+                "demand": round(self._demand, 2),
+                "cpu_percent": round(self._cpu_percent, 1),
+                "stretch": self._stretch,
+                "throttled": self._throttled,
+                "wait_total": round(self._wait_total, 2),
+            }
+
+
+# 全局实例
+cpu_governor = CpuGovernor()
@@ -0,0 +1,140 @@
+import os
+import json
+import threading
+from typing import Optional
+
+
+class DwellTimeModel:
+    """
+    状态停留时间模型.
+
+    记录每个状态（如日常副本的战斗状态）历次的停留时长，据此估计本次大致何时结束，
+    在状态前期稀疏轮询、接近预计结束时密集轮询。轮询间隔始终不超过 max_interval，
+    保证剧情等突发事件能在有限延迟内被发现。
+    """
+
+    def __init__(self, file_path: str = "dwell_times.json", max_samples: int = 20, min_samples: int = 3,
+                 min_interval: float = 1.0, max_interval: float = 8.0):
+        """
+        初始化停留时间模型.
+
+        Args:
+            file_path (str): 记录文件路径。
+            max_samples (int): 每个状态最多保留的样本数，超出时丢弃最旧的样本。
+            min_samples (int): 样本数不足该值时不做估计，使用默认轮询间隔。
+            min_interval (float): 接近预计结束时的轮询间隔（秒）。
+            max_interval (float): 最大轮询间隔（秒），即突发事件的最大响应延迟。
+        """
+        self.file_path = os.path.abspath(file_path)
+        self.max_samples = max_samples
+        self.min_samples = min_samples
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._samples: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def set_file_path(self, file_path: str):
+        """
+        切换记录文件并重新加载，模拟器压测时用于隔离真实的记录.
+
+        Args:
+            file_path (str): 记录文件路径。
+        """
+        self.file_path = os.path.abspath(file_path)
+        with self._lock:
+            self._samples = {}
+        self.load()
+
+    def load(self):
+        """
+        从文件加载历史记录.
+        """
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            with self._lock:
+                self._samples = {key: [float(v) for v in values][-self.max_samples:] for key, values in data.items()}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"加载停留时间记录失败: {e}")
+
+    def save(self):
+        """
+        保存历史记录到文件.
+        """
+        try:
+            with self._lock:
+                data = dict(self._samples)
+            with open(self.file_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=4, ensure_ascii=False)
+        except Exception as e:
+            print(f"保存停留时间记录失败: {e}")
+
+    def record(self, key: str, duration: float):
+        """
+        记录一次状态停留时长.
+
+        Args:
+            key (str): 状态标识，如 "日常副本.CombatState"。
+            duration (float): 停留时长（秒）。
+        """
+        if duration <= 0:
+            return
+        with self._lock:
+            samples = self._samples.setdefault(key, [])
+            samples.append(round(duration, 2))
+            if len(samples) > self.max_samples:
+                del samples[:len(samples) - self.max_samples]
+        self.save()
+
+    def _quantile(self, key: str, q: float) -> Optional[float]:
+        """
+        计算样本分位数，样本不足时返回 None.
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(key, []))
+        if len(samples) < self.min_samples:
+            return None
+        index = min(len(samples) - 1, max(0, int(q * (len(samples) - 1))))
+        return samples[index]
+
+    def expected(self, key: str) -> Optional[float]:
+        """
+        获取预计停留时长（中位数）.
+
+        Args:
+            key (str): 状态标识。
+
+        Returns:
+            float | None: 预计时长（秒），样本不足时返回 None。
+        """
+        return self._quantile(key, 0.5)
+
+    def next_interval(self, key: str, elapsed: float, default: float) -> float:
+        """
+        根据已停留时间计算下一次轮询的间隔.
+
+        以历史样本中较短的一次（10% 分位数）作为最早可能结束的时间，
+        在此之前按剩余时间的一半稀疏轮询，之后按 min_interval 密集轮询。
+
+        Args:
+            key (str): 状态标识。
+            elapsed (float): 本次已停留时间（秒）。
+            default (float): 样本不足时使用的默认间隔（秒）。
+
+        Returns:
+            float: 轮询间隔（秒），范围在 [min_interval, max_interval] 内。
+        """
+        earliest = self._quantile(key, 0.1)
+        if earliest is None:
+            return default
+        remaining = earliest - elapsed
+        if remaining <= 0:
+            return self.min_interval
+        return max(self.min_interval, min(self.max_interval, remaining / 2))
+
+
+# 全局实例
+dwell_model = DwellTimeModel()
@@ -0,0 +1,72 @@
+import threading
+import time
+from typing import Hashable
+
+
+class EventRateLimiter:
+    """
+    按键限速并合并重复事件.
+
+    同一个键在 interval 秒的窗口内最多放行 burst 次，之后的事件只计数不输出；
+    窗口过后该键的下一条事件放行，并带上期间被合并的次数（"重复 N 次"）。
+    被丢弃的事件只做一次字典查找和计数，重试风暴下日志开销保持平稳。
+    """
+    MAX_KEYS = 4096 # 键数超过该值时清理过期的键
+
+    def __init__(self, interval: float = 5.0, burst: int = 3):
+        """
+        Args:
+            interval (float): 限速窗口（秒）。
+            burst (int): 每个窗口内每个键最多放行的事件数。
+        """
+        self.interval = interval
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._states: dict = {} # 键 -> [窗口开始时间, 窗口内已放行数, 已合并数]
+
+    def check(self, key: Hashable, now: float | None = None) -> tuple[bool, int]:
+        """
+        判断一条事件是否放行.
+
+        Args:
+            key (Hashable): 限速键。
+            now (float | None): 当前时间（单调时钟，秒），默认取 time.monotonic()。
+
+        Returns:
+            tuple[bool, int]: (是否放行, 放行时附带的此前被合并的次数)。
+        """
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            state = self._states.get(key)
+            if state is None or now - state[0] >= self.interval:
+                repeated = state[2] if state is not None else 0
+                if state is None and len(self._states) >= self.MAX_KEYS:
+                    self._prune(now)
+                self._states[key] = [now, 1, 0]
+                return True, repeated
+            if state[1] < self.burst:
+                state[1] += 1
+                return True, 0
+            state[2] += 1
+            return False, 0
+
+    def _prune(self, now: float):
+        """
+        清理窗口已过且没有待报告合并数的键，调用方需持有锁.
+        """
+        for key in [k for k, state in self._states.items() if now - state[0] >= self.interval and not state[2]]:
+            del self._states[key]
+
+    def drain(self) -> list[tuple[Hashable, int]]:
+        """
+        取出所有尚未报告的合并次数并清零（如程序退出时）.
+
+        Returns:
+            list[tuple[Hashable, int]]: (键, 合并次数) 列表。
+        """
+        with self._lock:
+            pending = [(key, state[2]) for key, state in self._states.items() if state[2]]
+            for key, _ in pending:
+                self._states[key][2] = 0
+        return pending
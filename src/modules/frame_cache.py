@@ -0,0 +1,152 @@
+import time
+import threading
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+from .interfaces import FrameSource
+
+
+class FrameCache:
+    """
+    各窗口最近画面的缩略图缓存.
+
+    任务截图时由工作线程顺带写入：同一个窗口每隔 min_interval 秒才缩小一次，其余截图直接跳过，
+    界面按自己的刷新频率读取，不会为了显示缩略图额外截图或缩放。
+    """
+    THUMBNAIL_WIDTH = 320       # 缩略图宽度（像素），高度按窗口比例
+    MIN_INTERVAL = 0.5          # 同一个窗口两次缩小之间的最短间隔（秒）
+
+    def __init__(self, width: int = THUMBNAIL_WIDTH, min_interval: float = MIN_INTERVAL, sink=None):
+        """
+        Args:
+            width (int): 缩略图宽度（像素）。
+            min_interval (float): 同一个窗口两次缩小之间的最短间隔（秒）。
+            sink (SharedFrameBuffer | None): 缩略图同时写入的共享内存，任务子进程中用于把缩略图交给主进程。
+        """
+        self.width = width
+        self.min_interval = min_interval
+        self.sink = sink
+        self._lock = threading.Lock()
+        self._entries: dict = {} # hwnd -> [序号, 缩略图, 上次缩小的时间]
+
+    @staticmethod
+    def make_thumbnail(frame: np.ndarray, width: int = THUMBNAIL_WIDTH) -> np.ndarray:
+        """
+        按宽度等比缩小画面.
+
+        Args:
+            frame (np.ndarray): BGR 图像。
+            width (int): 缩略图宽度，画面本身更窄时不放大。
+
+        Returns:
+            np.ndarray: 缩略图（连续内存）。
+        """
+        h, w = frame.shape[:2]
+        if w <= width:
+            return np.ascontiguousarray(frame)
+        height = max(1, round(h * width / w))
+        return cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+
+    def put(self, hwnd, frame: np.ndarray, now: float | None = None) -> bool:
+        """
+        写入窗口的最新画面，距上次缩小不足 min_interval 秒时直接跳过.
+
+        Args:
+            hwnd (int): 窗口句柄。
+            frame (np.ndarray): 刚截取的 BGR 图像。
+            now (float | None): 当前时间（单调时钟，秒），默认取 time.monotonic()。
+
+        Returns:
+            bool: 更新了缩略图返回 True。
+        """
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(hwnd)
+            if entry is not None and now - entry[2] < self.min_interval:
+                return False
+            if entry is None:
+                entry = self._entries[hwnd] = [0, None, now]
+            entry[2] = now
+        # 缩放在锁外进行，不阻塞其它窗口
+        thumbnail = self.make_thumbnail(frame, self.width)
+        with self._lock:
+            entry[0] += 1
+            entry[1] = thumbnail
+        if self.sink is not None:
+            self.sink.write(thumbnail)
+        return True
+
+    def get(self, hwnd) -> Tuple[int, Optional[np.ndarray]]:
+        """
+        读取窗口的最新缩略图.
+
+        Args:
+            hwnd (int): 窗口句柄。
+
+        Returns:
+            Tuple[int, Optional[np.ndarray]]: (序号, 缩略图)，序号不变说明缩略图没有更新；没有缩略图时为 (0, None)。
+        """
+        with self._lock:
+            entry = self._entries.get(hwnd)
+            if entry is None:
+                return 0, None
+            return entry[0], entry[1]
+
+    def remove(self, hwnd):
+        """
+        删除窗口的缩略图.
+        """
+        with self._lock:
+            self._entries.pop(hwnd, None)
+
+    def clear(self):
+        """
+        清空所有缩略图.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+class ThumbnailCapture(FrameSource):
+    """
+    包装截图对象，每次截图后把画面交给 FrameCache 生成缩略图.
+    """
+
+    def __init__(self, inner: FrameSource, cache: FrameCache):
+        """
+        Args:
+            inner (FrameSource): 被包装的截图对象。
+            cache (FrameCache): 缩略图缓存。
+        """
+        self.inner = inner
+        self.cache = cache
+
+    @property
+    def hwnd(self):
+        return getattr(self.inner, "hwnd", None)
+
+    def set_hwnd(self, hwnd: int):
+        self.inner.set_hwnd(hwnd)
+
+    def is_window_valid(self) -> bool:
+        return self.inner.is_window_valid()
+
+    def get_window_size(self) -> Optional[Tuple[int, int]]:
+        return self.inner.get_window_size()
+
+    def capture(self) -> Optional[np.ndarray]:
+        frame = self.inner.capture()
+        if frame is not None:
+            self.cache.put(self.hwnd, frame)
+        return frame
+
+    def get_cache(self) -> Optional[np.ndarray]:
+        return self.inner.get_cache()
+
+    def clear_cache(self):
+        self.inner.clear_cache()
+
+
+# 全局实例，本进程中所有执行器共用
+frame_cache = FrameCache()
@@ -0,0 +1,120 @@
+from abc import ABC, abstractmethod
+from typing import Optional, Tuple
+import numpy as np
+
+
+class FrameSource(ABC):
+    """
+    画面来源接口.
+
+    任务只通过这些方法获取画面，WindowCapture（真实窗口）、ReplayCapture（录制回放）
+    和模拟器中的 SimCapture 都实现该接口，可以互相替换。
+    """
+
+    @abstractmethod
+    def set_hwnd(self, hwnd: int):
+        """
+        设置目标窗口句柄.
+
+        Args:
+            hwnd (int): 目标窗口句柄。
+        """
+        pass
+
+    @abstractmethod
+    def is_window_valid(self) -> bool:
+        """
+        检查目标窗口是否存在且可见.
+
+        Returns:
+            bool: 窗口有效返回 True。
+        """
+        pass
+
+    @abstractmethod
+    def get_window_size(self) -> Optional[Tuple[int, int]]:
+        """
+        获取窗口尺寸.
+
+        Returns:
+            Optional[Tuple[int, int]]: (宽度, 高度)，窗口无效返回 None。
+        """
+        pass
+
+    @abstractmethod
+    def capture(self) -> Optional[np.ndarray]:
+        """
+        截取当前画面.
+
+        Returns:
+            Optional[np.ndarray]: BGR 图像，失败返回 None。
+        """
+        pass
+
+    @abstractmethod
+    def get_cache(self) -> Optional[np.ndarray]:
+        """
+        获取最近一次截取的画面.
+
+        Returns:
+            Optional[np.ndarray]: BGR 图像，没有缓存返回 None。
+        """
+        pass
+
+    @abstractmethod
+    def clear_cache(self):
+        """
+        清空缓存画面.
+        """
+        pass
+
+
+class InputDevice(ABC):
+    """
+    输入设备接口.
+
+    任务只通过这些方法向窗口发送点击，AutoClicker（真实窗口）、ReplayClicker（录制回放）
+    和模拟器中的 SimClicker 都实现该接口，可以互相替换。
+    """
+
+    @abstractmethod
+    def set_hwnd(self, hwnd: int):
+        """
+        设置目标窗口句柄.
+
+        Args:
+            hwnd (int): 目标窗口句柄。
+        """
+        pass
+
+    @abstractmethod
+    def connect_window(self):
+        """
+        连接目标窗口，句柄无效时抛出异常.
+        """
+        pass
+
+    @abstractmethod
+    def click(self, x: int, y: int, random_range: int | tuple = 0) -> bool:
+        """
+        点击窗口内坐标.
+
+        Args:
+            x (int): 点击位置的 x 坐标。
+            y (int): 点击位置的 y 坐标。
+            random_range (int | tuple): 随机偏移范围。
+
+        Returns:
+            bool: 点击成功返回 True。
+        """
+        pass
+
+    @abstractmethod
+    def is_window_ready(self) -> bool:
+        """
+        检查窗口是否仍然存在.
+
+        Returns:
+            bool: 窗口可用返回 True。
+        """
+        pass
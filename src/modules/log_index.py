@@ -0,0 +1,267 @@
+import os
+import gzip
+import sqlite3
+import threading
+from collections import Counter
+
+
+class LogIndex:
+    """
+    日志的 SQLite 索引，支持按窗口、任务、日志类型和时间筛选.
+
+    由 LogFileWriter 的后台线程在每批日志写入文件后调用 add()，写日志的线程不做任何索引工作。
+    每行日志只保存时间、窗口句柄、任务名、日志类型和它在日志文件中的位置 (文件序号, 字节偏移, 字节长度)，不保存日志内容，
+    行号即写入顺序，按窗口、任务、类型、时间以及窗口 + 类型、任务 + 类型建立索引
+    （等值条件的索引按行号有序，按行号倒序取最新日志时不需要排序），
+    另有按分钟汇总的计数表和出现过的 (窗口, 任务, 类型) 组合表，条数统计和筛选项只读这两张小表。查询时时间范围先换算成行号范围，
+    再沿索引从最新的日志往前取，从日志文件中读出内容，取够就停。文件序号每次轮转加 1，当前文件与它的差即轮转次数，
+    由 locate 换算为文件路径（见 LogFileWriter.segment_path()），所在文件已被删除的日志不再返回。超过 max_rows 条时删除最旧的日志。
+    """
+    BUCKET_SECONDS = 60             # 汇总表的时间桶大小（秒）
+    DEFAULT_MAX_ROWS = 1000000      # 最多保留的日志行数
+    PRUNE_EVERY = 10000             # 每写入多少行检查一次是否需要删除旧日志
+
+    def __init__(self, db_path: str = "log_index.db", max_rows: int = DEFAULT_MAX_ROWS, locate=None):
+        """
+        Args:
+            db_path (str): 索引数据库路径，首次写入时创建。
+            max_rows (int): 最多保留的日志行数，0 表示不限制。
+            locate (Callable[[int], str | None] | None): 轮转次数 -> 日志文件路径，文件已删除时返回 None，
+                一般为写入日志的 LogFileWriter.segment_path；为 None 时查询不返回日志。
+        """
+        self.db_path = db_path
+        self.max_rows = max_rows
+        self.locate = locate
+        self._segment: int | None = None    # 当前日志文件的序号，首次连接时从数据库读取
+        self._write_conn: sqlite3.Connection | None = None  # 只在写入线程中使用
+        self._read_conn: sqlite3.Connection | None = None   # 查询共用，由 _read_lock 保护
+        self._read_lock = threading.Lock()
+        self._since_prune = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        打开数据库并建表.
+        """
+        directory = os.path.dirname(os.path.abspath(self.db_path))
+        os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # WAL 模式下查询和写入互不阻塞
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # 旧版本的索引保存了日志内容，直接重建
+        if "message" in [row[1] for row in conn.execute("PRAGMA table_info(logs)")]:
+            conn.executescript("DROP TABLE logs; DROP TABLE IF EXISTS buckets; DROP TABLE IF EXISTS keys;")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS logs (
+                id INTEGER PRIMARY KEY, ts REAL NOT NULL, hwnd INTEGER NOT NULL, task TEXT NOT NULL, level TEXT NOT NULL,
+                segment INTEGER NOT NULL, offset INTEGER NOT NULL, length INTEGER NOT NULL);
+            CREATE INDEX IF NOT EXISTS logs_ts ON logs(ts);
+            CREATE INDEX IF NOT EXISTS logs_hwnd ON logs(hwnd);
+            CREATE INDEX IF NOT EXISTS logs_task ON logs(task);
+            CREATE INDEX IF NOT EXISTS logs_level ON logs(level);
+            CREATE INDEX IF NOT EXISTS logs_hwnd_level ON logs(hwnd, level);
+            CREATE INDEX IF NOT EXISTS logs_task_level ON logs(task, level);
+            CREATE TABLE IF NOT EXISTS buckets (
+                bucket INTEGER NOT NULL, hwnd INTEGER NOT NULL, task TEXT NOT NULL, level TEXT NOT NULL,
+                count INTEGER NOT NULL, PRIMARY KEY (bucket, hwnd, task, level));
+            CREATE TABLE IF NOT EXISTS keys (
+                hwnd INTEGER NOT NULL, task TEXT NOT NULL, level TEXT NOT NULL, PRIMARY KEY (hwnd, task, level));
+            CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+        """)
+        if self._segment is None:
+            row = conn.execute("SELECT value FROM meta WHERE name = 'segment'").fetchone()
+            self._segment = row[0] if row is not None else 0
+        return conn
+
+    # --- 写入线程 ---
+    def add(self, records: list, spans: list, rotated: bool = False):
+        """
+        写入一批日志，在 LogFileWriter 的后台线程中调用.
+
+        Args:
+            records (list): 每项的前 4 个元素为 (时间戳, 日志类型, 窗口句柄 | None, 任务名 | None)，
+                其余元素和不是元组的项被忽略。
+            spans (list): 每项日志在当前日志文件中的 (字节偏移, 字节长度)，与 records 一一对应。
+            rotated (bool): 写入这一批之前日志文件是否发生了轮转。
+        """
+        if self._write_conn is None:
+            self._write_conn = self._connect()
+        conn = self._write_conn
+        if rotated:
+            self._segment += 1 # type: ignore
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('segment', ?)", (self._segment,))
+        rows = [(r[0], r[2] or 0, r[3] or "", r[1], self._segment, offset, length)
+                for r, (offset, length) in zip(records, spans) if isinstance(r, tuple) and len(r) >= 4]
+        if not rows:
+            return
+        counts = Counter((int(row[0] // self.BUCKET_SECONDS),) + row[1:4] for row in rows)
+        with conn:
+            conn.executemany("INSERT INTO logs (ts, hwnd, task, level, segment, offset, length) "
+                             "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.executemany("INSERT INTO buckets (bucket, hwnd, task, level, count) VALUES (?, ?, ?, ?, ?) "
+                             "ON CONFLICT (bucket, hwnd, task, level) DO UPDATE SET count = count + excluded.count",
+                             [key + (count,) for key, count in counts.items()])
+            conn.executemany("INSERT OR IGNORE INTO keys (hwnd, task, level) VALUES (?, ?, ?)",
+                             {key[1:] for key in counts})
+        self._since_prune += len(rows)
+        if self.max_rows > 0 and self._since_prune >= self.PRUNE_EVERY:
+            self._since_prune = 0
+            self._prune(conn)
+
+    def _prune(self, conn: sqlite3.Connection):
+        """
+        删除超出保留行数的旧日志和对应的汇总，按剩下的汇总重建组合表.
+        """
+        row = conn.execute("SELECT id, ts FROM logs ORDER BY id DESC LIMIT 1 OFFSET ?", (self.max_rows,)).fetchone()
+        if row is None:
+            return
+        with conn:
+            conn.execute("DELETE FROM logs WHERE id <= ?", (row[0],))
+            conn.execute("DELETE FROM buckets WHERE bucket < ?", (int(row[1] // self.BUCKET_SECONDS),))
+            conn.execute("DELETE FROM keys")
+            conn.execute("INSERT INTO keys SELECT DISTINCT hwnd, task, level FROM buckets")
+
+    def close(self):
+        """
+        关闭数据库连接.
+        """
+        if self._write_conn is not None:
+            self._write_conn.close()
+            self._write_conn = None
+        with self._read_lock:
+            if self._read_conn is not None:
+                self._read_conn.close()
+                self._read_conn = None
+
+    # --- 查询 ---
+    def _reader(self) -> sqlite3.Connection | None:
+        """
+        查询用的连接，索引文件还不存在时返回 None.
+        """
+        if self._read_conn is None:
+            if not os.path.exists(self.db_path):
+                return None
+            self._read_conn = self._connect()
+        return self._read_conn
+
+    @staticmethod
+    def _where(hwnd, task, level, start, end, column: str) -> tuple[str, list]:
+        """
+        生成筛选条件，start 和 end 是 column 列的范围.
+        """
+        clauses, params = [], []
+        for name, value in (("hwnd", hwnd), ("task", task), ("level", level)):
+            if value is not None:
+                clauses.append(f"{name} = ?")
+                params.append(value)
+        if start is not None:
+            clauses.append(f"{column} >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append(f"{column} < ?")
+            params.append(end)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, hwnd: int | None = None, task: str | None = None, level: str | None = None, text: str | None = None,
+              start: float | None = None, end: float | None = None, limit: int = 500) -> list[dict]:
+        """
+        按条件查询日志，从最新的往前取.
+
+        Args:
+            hwnd (int | None): 窗口句柄，0 表示不属于任何窗口的日志，为 None 时不限。
+            task (str | None): 任务名，"" 表示不属于任何任务的日志，为 None 时不限。
+            level (str | None): 日志类型，如 "ERROR"，为 None 时不限。
+            text (str | None): 日志内容包含的文字，为空时不限（需要逐条读出内容比较）。
+            start (float | None): 起始时间戳（含）。
+            end (float | None): 结束时间戳（不含）。
+            limit (int): 最多返回的条数。
+
+        Returns:
+            list[dict]: 按时间从旧到新排列的日志，每项包含 ts、hwnd、task、level、message、line（与 log.txt 相同格式的日志行）。
+        """
+        results = []
+        files = {}  # 本次查询读出的日志文件内容，按序号缓存
+        with self._read_lock:
+            conn = self._reader()
+            if conn is None or self.locate is None:
+                return []
+            # 日志按时间顺序写入，时间范围换算成行号范围后可以直接按行号倒序扫描
+            first_id = self._first_id(conn, start)
+            end_id = self._first_id(conn, end)
+            where, params = self._where(hwnd, task, level, first_id, end_id, column="id")
+            sql = f"SELECT ts, hwnd, task, level, segment, offset, length FROM logs{where} ORDER BY id DESC"
+            for ts, row_hwnd, row_task, row_level, segment, offset, length in conn.execute(sql, params):
+                if segment not in files:
+                    files[segment] = self._read_segment(segment)
+                data = files[segment]
+                if data is None:
+                    break   # 所在文件已被删除，更早的日志也都不在了
+                line = data[offset:offset + length].decode("utf-8", errors="replace")
+                # 日志行格式为 "[时间] [类型] 内容"（多开日志前面还有 "[多开]"），对不上说明文件已轮转而索引还没更新
+                _, sep, message = line.partition(f"] [{row_level}] ")
+                if not sep or (text and text not in message):
+                    continue
+                results.append({"ts": ts, "hwnd": row_hwnd, "task": row_task, "level": row_level,
+                                "message": message, "line": line})
+                if len(results) >= limit:
+                    break
+        results.reverse()
+        return results
+
+    def _read_segment(self, segment: int) -> bytes | None:
+        """
+        读出序号为 segment 的日志文件的全部内容，文件已删除时返回 None.
+        """
+        path = self.locate(self._segment - segment) if self._segment is not None else None # type: ignore
+        if path is None or not os.path.exists(path):
+            return None
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rb") as f:
+            return f.read()
+
+    @staticmethod
+    def _first_id(conn: sqlite3.Connection, ts: float | None) -> int | None:
+        """
+        时间不早于 ts 的第一行日志的行号，没有这样的日志时返回最大行号 + 1，ts 为 None 时返回 None.
+        """
+        if ts is None:
+            return None
+        row = conn.execute("SELECT id FROM logs WHERE ts >= ? ORDER BY ts LIMIT 1", (ts,)).fetchone()
+        if row is not None:
+            return row[0]
+        return (conn.execute("SELECT MAX(id) FROM logs").fetchone()[0] or 0) + 1
+
+    def count(self, hwnd: int | None = None, task: str | None = None, level: str | None = None,
+              start: float | None = None, end: float | None = None) -> int:
+        """
+        按条件统计日志条数，只读汇总表，时间按时间桶取整.
+
+        Returns:
+            int: 日志条数。
+        """
+        bucket_start = None if start is None else int(start // self.BUCKET_SECONDS)
+        bucket_end = None if end is None else int(end // self.BUCKET_SECONDS) + 1
+        where, params = self._where(hwnd, task, level, bucket_start, bucket_end, column="bucket")
+        with self._read_lock:
+            conn = self._reader()
+            if conn is None:
+                return 0
+            row = conn.execute(f"SELECT SUM(count) FROM buckets{where}", params).fetchone()
+        return row[0] or 0
+
+    def facets(self) -> dict:
+        """
+        各筛选项出现过的值，只读组合表.
+
+        Returns:
+            dict: {"hwnd": [...], "task": [...], "level": [...]}。
+        """
+        result = {"hwnd": [], "task": [], "level": []}
+        with self._read_lock:
+            conn = self._reader()
+            if conn is None:
+                return result
+            for name in result:
+                result[name] = [row[0] for row in conn.execute(f"SELECT DISTINCT {name} FROM keys ORDER BY {name}")]
+        return result
@@ -0,0 +1,283 @@
+import os
+import gzip
+import time
+import queue
+import shutil
+import threading
+
+
+class LogFileWriter:
+    """
+    后台日志文件写入器.
+
+    日志行放入有界队列后立即返回，由后台线程批量写入文件并定期刷新，写日志的任务线程不做磁盘 I/O。
+    队列满时丢弃新日志并计数，下次写入时补一行丢弃提示，内存占用不会随运行时间增长。
+    文件超过大小上限或写入时间超过轮转间隔时轮转为 log.1.txt(.gz)、log.2.txt(.gz)……，
+    超出保留数量的旧文件被删除。文件以二进制方式写入（UTF-8，换行符为 LF），交给索引的字节偏移与文件内容一致。
+    """
+    DEFAULT_MAX_QUEUE = 10000               # 队列最多缓存的日志行数
+    DEFAULT_FLUSH_INTERVAL = 1.0            # 刷新到磁盘的间隔（秒）
+    DEFAULT_MAX_BYTES = 5 * 1024 * 1024     # 单个日志文件的大小上限（字节）
+    DEFAULT_ROTATE_INTERVAL = 24 * 3600     # 轮转间隔（秒）
+    DEFAULT_BACKUP_COUNT = 5                # 保留的历史日志文件数
+
+    def __init__(self, file_path: str = "log.txt", max_queue: int = DEFAULT_MAX_QUEUE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL, max_bytes: int = DEFAULT_MAX_BYTES,
+                 rotate_interval: float = DEFAULT_ROTATE_INTERVAL, backup_count: int = DEFAULT_BACKUP_COUNT,
+                 compress: bool = True, formatter=None, indexer=None):
+        """
+        Args:
+            file_path (str): 日志文件路径。
+            max_queue (int): 队列最多缓存的日志行数。
+            flush_interval (float): 刷新到磁盘的间隔（秒）。
+            max_bytes (int): 单个日志文件的大小上限（字节），0 表示不按大小轮转。
+            rotate_interval (float): 轮转间隔（秒），0 表示不按时间轮转。
+            backup_count (int): 保留的历史日志文件数，0 表示轮转时直接删除旧日志。
+            compress (bool): 历史日志文件是否用 gzip 压缩。
+            formatter (Callable[[Any], str] | None): 在后台线程中把写入的对象转换为日志行，如 json.dumps，
+                丢弃提示也会以 {"type": "log_dropped", "dropped": 数量} 交给它；为 None 时写入的必须是字符串。
+            indexer (Callable[[list, list, bool], None] | None): 每批日志写入文件后在后台线程中调用，参数为
+                (这一批写入的原始对象, 每个对象在当前文件中的 (字节偏移, 字节长度), 写入前是否发生了轮转)，
+                用于建立索引（见 LogIndex.add()）。
+        """
+        self.file_path = file_path
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.compress = compress
+        self.formatter = formatter
+        self.indexer = indexer
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self._dropped = 0                   # 队列满时丢弃的日志数
+        self._file = None
+        self._opened_at = 0.0               # 当前文件开始写入的时间
+
+    # --- 调用方线程 ---
+    def write(self, line) -> bool:
+        """
+        写入一行日志（只放入队列）.
+
+        Args:
+            line (str | Any): 日志行，不含换行符；设置了 formatter 时可以是任意对象。
+
+        Returns:
+            bool: 放入队列返回 True，队列已满或已关闭返回 False。
+        """
+        if self._closed:
+            return False
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(line)
+            return True
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            return False
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        等待队列中已有的日志全部写入磁盘.
+
+        Args:
+            timeout (float): 最长等待时间（秒）。
+
+        Returns:
+            bool: 在超时前写完返回 True。
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0):
+        """
+        写完队列中的日志并停止后台线程.
+        """
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        if self._thread is not None and self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            self._thread.join(timeout)
+
+    @property
+    def dropped(self) -> int:
+        """
+        累计丢弃的日志数.
+        """
+        return self._dropped
+
+    def _start(self):
+        """
+        首次写入时启动后台线程.
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="LogFileWriter", daemon=True)
+                self._thread.start()
+
+    # --- 后台线程 ---
+    def _run(self):
+        """
+        后台线程：批量取出日志写入文件，定期刷新.
+        """
+        last_flush = time.monotonic()
+        running = True
+        while running:
+            try:
+                items = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                items = []
+            # 一次取出已排队的所有日志，合并写入
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = []
+            records = []
+            waiters = []
+            for item in items:
+                if item is None:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                elif self.formatter is not None:
+                    try:
+                        lines.append(self.formatter(item))
+                        records.append(item)
+                    except Exception as e:
+                        print(f"格式化日志失败: {e}")
+                else:
+                    lines.append(item)
+                    records.append(item)
+            with self._lock:
+                dropped, self._dropped = self._dropped, 0
+            if dropped:
+                if self.formatter is not None:
+                    lines.append(self.formatter({"type": "log_dropped", "dropped": dropped}))
+                else:
+                    lines.append(f"[日志] 写入队列已满，丢弃了 {dropped} 条日志")
+
+            spans, rotated = [], False
+            try:
+                if lines:
+                    spans, rotated = self._write_lines(lines)
+                now = time.monotonic()
+                if self._file is not None and (waiters or not running or now - last_flush >= self.flush_interval):
+                    self._file.flush()
+                    last_flush = now
+            except Exception as e:
+                print(f"写入日志文件失败: {e}")
+            if (records or rotated) and self.indexer is not None:
+                try:
+                    # 丢弃提示排在最后，没有对应的原始对象
+                    self.indexer(records, spans[:len(records)], rotated)
+                except Exception as e:
+                    print(f"写入日志索引失败: {e}")
+            for waiter in waiters:
+                waiter.set()
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write_lines(self, lines: list[str]) -> tuple[list[tuple[int, int]], bool]:
+        """
+        写入若干行，需要时先轮转.
+
+        Returns:
+            tuple[list[tuple[int, int]], bool]: 每行在当前文件中的 (字节偏移, 字节长度，不含换行符)，以及写入前是否发生了轮转。
+        """
+        rotated = False
+        if self._file is None:
+            self._open()
+        elif self._should_rotate():
+            self._rotate()
+            rotated = True
+        encoded = [line.encode("utf-8") for line in lines]
+        offset = self._file.tell() # type: ignore
+        spans = []
+        for data in encoded:
+            spans.append((offset, len(data)))
+            offset += len(data) + 1
+        self._file.write(b"\n".join(encoded) + b"\n") # type: ignore
+        return spans, rotated
+
+    def _open(self):
+        """
+        以追加方式打开日志文件.
+        """
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(self.file_path, "ab")
+        self._opened_at = time.time()
+
+    def _should_rotate(self) -> bool:
+        """
+        当前文件是否超过大小上限或轮转间隔.
+        """
+        if self.max_bytes > 0 and self._file.tell() >= self.max_bytes: # type: ignore
+            return True
+        return self.rotate_interval > 0 and time.time() - self._opened_at >= self.rotate_interval
+
+    def _backup_path(self, index: int) -> str:
+        """
+        第 index 个历史日志文件的路径.
+        """
+        base, ext = os.path.splitext(self.file_path)
+        return f"{base}.{index}{ext}" + (".gz" if self.compress else "")
+
+    def segment_path(self, age: int) -> str | None:
+        """
+        轮转 age 次之前写入的日志文件的路径.
+
+        Args:
+            age (int): 0 表示当前文件，1 表示最新的历史文件，依此类推。
+
+        Returns:
+            str | None: 文件路径，该文件已超出保留数量被删除时返回 None。
+        """
+        if age == 0:
+            return self.file_path
+        if 0 < age <= self.backup_count:
+            return self._backup_path(age)
+        return None
+
+    def _rotate(self):
+        """
+        关闭当前文件，历史文件依次后移，当前文件成为第 1 个历史文件.
+        """
+        self._file.close() # type: ignore
+        self._file = None
+        if self.backup_count > 0:
+            oldest = self._backup_path(self.backup_count)
+            if os.path.exists(oldest):
+                os.remove(oldest)
+            for index in range(self.backup_count - 1, 0, -1):
+                src = self._backup_path(index)
+                if os.path.exists(src):
+                    os.replace(src, self._backup_path(index + 1))
+            if self.compress:
+                with open(self.file_path, "rb") as f_in, gzip.open(self._backup_path(1), "wb") as f_out:
+                    shutil.copyfileobj(f_in, f_out)
+                os.remove(self.file_path)
+            else:
+                os.replace(self.file_path, self._backup_path(1))
+        else:
+            os.remove(self.file_path)
+        self._open()
@@ -0,0 +1,438 @@
+from collections import deque
+import threading
+import datetime
+import atexit
+import json
+import os
+import time
+import multiprocessing
+from .log_writer import LogFileWriter
+from .log_index import LogIndex
+from .event_limiter import EventRateLimiter
+
+
+def _dump_event(record: dict) -> str:
+    """
+    把结构化事件序列化为一行 JSON（在写入线程中执行）.
+    """
+    return json.dumps(record, ensure_ascii=False, default=str)
+
+
+def _format_line(item) -> str:
+    """
+    取出日志记录中写入 log.txt 的日志行（在写入线程中执行）.
+
+    Args:
+        item (tuple | dict | str): (时间戳, 日志类型, 窗口句柄, 任务名, 日志内容, 日志行)，或写入器的丢弃提示。
+    """
+    if isinstance(item, tuple):
+        return item[-1]
+    if isinstance(item, dict):
+        return f"[日志] 写入队列已满，丢弃了 {item.get('dropped', 0)} 条日志"
+    return item
+
+
+class _Logger:
+    """
+    日志类，负责日志格式化、缓存和写入文件，不依赖 Qt.
+
+    需要显示到界面的日志交给通过 add_listener() 注册的监听函数，
+    界面由 src/ui/core/logger.py 中的适配器把它们转为 Qt 信号；任务、匹配和截图模块只依赖这里，无界面运行时不会加载 Qt.
+    日志文件（log.txt、log_index.db、events.jsonl）在 init() 指定的目录中创建，调用 init() 之前
+    （如导入模块时）的日志先缓存在内存中，init() 时写入；主进程一直没有调用 init() 时，缓存满、查询日志或程序退出时
+    在当前目录创建。子进程（如匹配服务、进程模式的任务）没有调用 init() 时不会自动创建文件，
+    缓存的日志要么交给转发函数，要么丢弃，避免与主进程写同一个 log.txt 而打乱索引中的字节偏移.
+    """
+    auto_save = True
+    RECENT_LINES = 1000 # 内存中保留的最近日志行数
+    DEFAULT_LOG_DIR = "." # 没有调用 init() 时的日志目录
+    PENDING_LIMIT = 1000  # 调用 init() 之前最多缓存的日志和事件数
+    # 单例模式
+    _instance = None
+    _lock = threading.Lock()
+    _files_lock = threading.Lock()
+    log_cache = deque(maxlen=RECENT_LINES)  # 最近的日志，文件由后台写入器写入
+    _index: LogIndex | None = None                  # 日志索引，按窗口、任务、类型和时间筛选，由写入线程更新
+    _writer: LogFileWriter | None = None            # 后台日志文件写入器
+    _event_writer: LogFileWriter | None = None      # 结构化事件写入器（JSONL）
+    _pending: list = []                             # 日志文件创建前的 (是否为事件, 日志记录)
+    _limiter = EventRateLimiter()           # 结构化事件的限速与重复合并
+    _forwarder = None # 日志转发函数，设置后日志不在本进程输出，而是交给它处理（子进程中使用）
+    _event_forwarder = None # 结构化事件转发函数，与 _forwarder 一起设置
+    _listeners: list = [] # 界面日志监听函数，参数为 (message, type, mode)
+    _context = threading.local() # 当前线程的日志上下文 {"hwnd": ..., "task": ...}，由执行器设置
+
+    def __new__(cls):
+        """
+        单例模式，确保只有一个 Logger 实例.
+        """
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                atexit.register(cls._instance._auto_save) # 程序退出时自动保存日志
+        return cls._instance
+
+    def init(self, log_dir: str = DEFAULT_LOG_DIR):
+        """
+        指定日志目录，之后的日志写入该目录下的 log.txt、log_index.db 和 events.jsonl.
+
+        程序入口（main.py、命令行）在启动时调用；已经在写的日志文件写完剩余日志后关闭.
+
+        Args:
+            log_dir (str): 日志目录，不存在时创建.
+        """
+        with self._files_lock:
+            old = (self._event_writer, self._writer, self._index)
+            self._open_files(log_dir)
+        for item in old:
+            if item is not None:
+                item.close()
+
+    def _open_files(self, log_dir: str):
+        """
+        在 log_dir 中创建日志写入器、事件写入器和日志索引，调用方需持有 _files_lock.
+        """
+        os.makedirs(log_dir, exist_ok=True)
+        self._index = LogIndex(os.path.join(log_dir, "log_index.db"))
+        self._writer = LogFileWriter(os.path.join(log_dir, "log.txt"), formatter=_format_line, indexer=self._index.add)
+        self._index.locate = self._writer.segment_path
+        self._event_writer = LogFileWriter(os.path.join(log_dir, "events.jsonl"), formatter=_dump_event)
+        # 写入创建文件前缓存的日志
+        for is_event, item in self._pending:
+            (self._event_writer if is_event else self._writer).write(item)
+        self._pending.clear()
+
+    def _write(self, is_event: bool, item):
+        """
+        把日志记录或事件放入写入队列，日志文件还没有创建时先缓存，缓存满时主进程在默认目录创建，子进程丢弃新的日志.
+        """
+        if self._writer is None:
+            with self._files_lock:
+                if self._writer is None:
+                    if len(self._pending) < self.PENDING_LIMIT:
+                        self._pending.append((is_event, item))
+                    if len(self._pending) >= self.PENDING_LIMIT and self._is_main_process():
+                        self._open_files(self.DEFAULT_LOG_DIR)
+                    return
+        (self._event_writer if is_event else self._writer).write(item) # type: ignore
+
+    @staticmethod
+    def _is_main_process() -> bool:
+        """
+        当前进程是否为主进程（不是 multiprocessing 创建的子进程）.
+        """
+        return multiprocessing.parent_process() is None
+
+    def _files(self) -> tuple[LogFileWriter, LogFileWriter, LogIndex]:
+        """
+        获取日志写入器、事件写入器和日志索引，没有调用过 init() 时在默认目录创建.
+        """
+        if self._writer is None:
+            with self._files_lock:
+                if self._writer is None:
+                    self._open_files(self.DEFAULT_LOG_DIR)
+        return self._writer, self._event_writer, self._index # type: ignore
+
+    def log(self, message: str, type: str = "INFO", mode: int = 0, hwnd: int | None = None, task: str | None = None):
+        """
+        发送日志消息到 UI.
+
+        Args:
+            message (str): 要发送的日志消息.
+            type (str): 日志类型，默认值为 "INFO".
+            mode (int): 日志模式，0代表同时发送给ui和文件, 1代表仅保存到文件， 2代表只发送给ui，3代表多开窗口日志输出，4代表仅存到多开日志文件默认值为0.
+            hwnd (int | None): 日志所属的窗口句柄，为 None 时取当前线程的日志上下文，用于日志索引.
+            task (str | None): 日志所属的任务名，为 None 时取当前线程的日志上下文，用于日志索引.
+        """
+        if self._forwarder is not None:
+            self._forwarder(message, type, mode)
+            return
+
+        ts = self.get_time()
+        msg = f"{ts} [{type}] {message}"
+
+        # 仅保存到文件
+        if mode == 1:
+            self.add_log_to_cache(msg, type, message, hwnd, task)
+            return
+        
+        if mode == 0:
+            self._notify(msg, type, mode)
+            self.add_log_to_cache(msg, type, message, hwnd, task)
+        elif mode == 1:
+            self.add_log_to_cache(msg, type, message, hwnd, task)
+        elif mode == 2:
+            self._notify(msg, type, mode)
+        elif mode == 3:
+            msg = f"[多开]{msg}"
+            self._notify(msg, type, mode)
+            self.add_log_to_cache(msg, type, message, hwnd, task)
+        elif mode == 4:
+            msg = f"[多开]{msg}"
+            self.add_log_to_cache(msg, type, message, hwnd, task)
+
+
+    def event(self, event_type: str, message: str = "", level: str = "INFO", mode: int | None = 0,
+              hwnd: int | None = None, task: str | None = None, template: str | None = None,
+              score: float | None = None, duration: float | None = None, key=None, **fields) -> bool:
+        """
+        记录一条结构化事件.
+
+        事件以 JSON 行写入 events.jsonl，便于统计分析；同一个键（默认为事件类型、窗口、任务和模板）
+        短时间内重复出现时只记录前几条，之后的只计数，下一条放行的事件带上 "repeated" 合并次数。
+        被合并的事件不做任何格式化，重试风暴下开销保持平稳。
+
+        Args:
+            event_type (str): 事件类型，如 "capture_failed"、"click"。
+            message (str): 文字日志模板，可以用 {template}、{score:.3f} 等引用事件字段，只在放行时格式化。
+            level (str): 日志类型，"INFO"、"WARN" 或 "ERROR"。
+            mode (int | None): 文字日志的日志模式（同 log()），为 None 时只写结构化事件。
+            hwnd (int | None): 窗口句柄。
+            task (str | None): 任务名称。
+            template (str | None): 模板路径。
+            score (float | None): 匹配相似度。
+            duration (float | None): 耗时（秒）。
+            key (Hashable | None): 限速键，默认为 (event_type, hwnd, task, template)。
+            **fields: 其它事件字段。
+
+        Returns:
+            bool: 事件被记录返回 True，被限速合并返回 False。
+        """
+        if key is None:
+            key = (event_type, hwnd, task, template)
+        allowed, repeated = self._limiter.check(key)
+        if not allowed:
+            return False
+
+        record = {"ts": round(time.time(), 3), "type": event_type, "level": level}
+        for name, value in (("hwnd", hwnd), ("task", task), ("template", template), ("score", score), ("duration", duration)):
+            if value is not None:
+                record[name] = value
+        record.update(fields)
+        if repeated:
+            record["repeated"] = repeated
+
+        if message and mode is not None:
+            try:
+                text = message.format_map(record)
+            except (KeyError, ValueError, IndexError):
+                text = message
+            if repeated:
+                text += f" (已合并 {repeated} 条重复日志)"
+            record["msg"] = text
+            self.log(text, level, mode, hwnd=hwnd, task=task)
+        if self._forwarder is not None:
+            # 子进程中交给主进程写入 events.jsonl
+            if self._event_forwarder is not None:
+                self._event_forwarder(record)
+        elif self.auto_save:
+            self._write(True, record)
+        return True
+
+    def write_event(self, record: dict):
+        """
+        写入一条已经生成的结构化事件（如子进程转发来的），不再限速.
+
+        事件中没有窗口或任务时取当前线程的日志上下文，与 add_log_to_cache() 相同.
+
+        Args:
+            record (dict): 事件记录，格式同 event() 写入 events.jsonl 的内容.
+        """
+        if not self.auto_save or self._forwarder is not None:
+            return
+        context = getattr(self._context, "value", None)
+        if context is not None:
+            for name in ("hwnd", "task"):
+                if record.get(name) is None and context.get(name) is not None:
+                    record[name] = context[name]
+        self._write(True, record)
+
+    def _notify(self, message: str, type: str, mode: int):
+        """
+        把需要显示的日志交给各监听函数.
+        """
+        for listener in self._listeners:
+            try:
+                listener(message, type, mode)
+            except Exception as e:
+                print(f"日志监听函数出错: {e}")
+
+    def set_context(self, context: dict | None) -> dict | None:
+        """
+        设置当前线程的日志上下文，之后本线程没有指定窗口和任务的日志都归到这个上下文.
+
+        Args:
+            context (dict | None): {"hwnd": 窗口句柄, "task": 任务名}，执行器持有并随任务切换更新，为 None 时清除。
+
+        Returns:
+            dict | None: 原来的日志上下文，用于恢复。
+        """
+        previous = getattr(self._context, "value", None)
+        self._context.value = context
+        return previous
+
+    def get_log_index(self) -> LogIndex:
+        """
+        等待已排队的日志写入文件和索引后返回日志索引，用于查询.
+
+        Returns:
+            LogIndex: 日志索引.
+        """
+        writer, _, index = self._files()
+        writer.flush()
+        return index
+
+    def add_listener(self, listener):
+        """
+        注册界面日志监听函数.
+
+        Args:
+            listener (Callable[[str, str, int], None]): 参数为 (带时间戳的日志, 日志类型, 日志模式)，
+                只收到需要显示的日志（模式 0、2 和 3），可能在任务线程中被调用。
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """
+        移除界面日志监听函数.
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def info(self, message: str, mode: int = 0, hwnd: int | None = None):
+        """
+        发送信息日志消息到 UI.
+
+        Args:
+            message (str): 要发送的信息日志消息.
+            mode (int, optional): 日志模式
+            hwnd (int | None, optional): 日志所属的窗口句柄，为 None 时取当前线程的日志上下文
+        """
+        self.log(f"{message}", type="INFO", mode=mode, hwnd=hwnd)
+
+    def error(self, message: str, mode: int = 0, hwnd: int | None = None):
+        """
+        发送错误日志消息到 UI.
+
+        Args:
+            message (str): 要发送的错误日志消息.
+            mode (int, optional): 日志模式
+            hwnd (int | None, optional): 日志所属的窗口句柄，为 None 时取当前线程的日志上下文
+        """
+        self.log(f"{message}", type="ERROR", mode=mode, hwnd=hwnd)
+
+    def warning(self, message: str, mode: int = 0, hwnd: int | None = None):
+        """
+        发送警告日志消息到 UI.
+
+        Args:
+            message (str): 要发送的警告日志消息.
+            mode (int, optional): 日志模式
+            hwnd (int | None, optional): 日志所属的窗口句柄，为 None 时取当前线程的日志上下文
+        """
+        self.log(f"{message}", type="WARN", mode=mode, hwnd=hwnd)
+
+    def get_time(self):
+        """
+        获取当前时间.
+
+        Returns:
+            str: 当前时间，格式为 "[HH:MM:SS]".
+        """
+        return datetime.datetime.now().strftime("[%H:%M:%S]")
+    
+    def save_log_to_file(self, file_path: str | None = None):
+        """
+        将日志保存到文件.
+
+        日志由后台写入器持续写入日志文件，这里只等待已排队的日志落盘；
+        指定其它路径时把内存中最近的日志导出到该文件.
+
+        Args:
+            file_path (str | None): 日志文件路径，默认为当前日志文件.
+        """
+        if file_path is None or (self._writer is not None and file_path == self._writer.file_path):
+            writer, event_writer, _ = self._files()
+            writer.flush()
+            event_writer.flush()
+            return
+        with open(file_path, "a", encoding="utf-8") as f:
+            f.write("\n".join(self.log_cache) + "\n")
+
+    def _auto_save(self):
+        """
+        程序退出时写完剩余日志并关闭日志文件.
+        """
+        # 把尚未报告的合并次数写入事件日志
+        if self.auto_save and self._forwarder is None:
+            for key, repeated in self._limiter.drain():
+                event_type = key[0] if isinstance(key, tuple) else str(key)
+                self._write(True, {"ts": round(time.time(), 3), "type": event_type, "repeated": repeated, "key": key})
+            if self._pending and self._is_main_process():
+                self._files() # 主进程一直没有调用 init()，把缓存的日志写到默认目录
+        for item in (self._event_writer, self._writer, self._index):
+            if item is not None:
+                item.close()
+
+    def add_log_to_cache(self, message: str="", type: str = "INFO", text: str | None = None, hwnd: int | None = None, task: str | None = None):
+        """
+        将日志消息添加到缓存，开启自动保存时同时放入后台写入队列，写入文件后再写入日志索引.
+
+        Args:
+            message (str): 要添加的日志消息（带时间戳的日志行）.
+            type (str): 日志类型.
+            text (str | None): 不带时间戳的日志内容，为 None 时与 message 相同.
+            hwnd (int | None): 窗口句柄，为 None 时取当前线程的日志上下文.
+            task (str | None): 任务名，为 None 时取当前线程的日志上下文.
+        """
+        self.log_cache.append(message)
+        if self.auto_save:
+            context = getattr(self._context, "value", None)
+            if context is not None:
+                hwnd = context.get("hwnd") if hwnd is None else hwnd
+                task = context.get("task") if task is None else task
+            self._write(False, (time.time(), type, hwnd, task, message if text is None else text, message))
+
+    def set_log_file(self, writer: LogFileWriter):
+        """
+        更换日志文件写入器，旧的写入器写完剩余日志后关闭.
+
+        新写入器没有设置 formatter 和 indexer 时使用默认的日志行格式和日志索引.
+
+        Args:
+            writer (LogFileWriter): 新的写入器（可指定路径、轮转和压缩参数）.
+        """
+        old, _, index = self._files()
+        if writer.formatter is None:
+            writer.formatter = _format_line
+        if writer.indexer is None:
+            writer.indexer = index.add
+            index.locate = writer.segment_path
+        with self._files_lock:
+            self._writer = writer
+        old.close()
+
+    def set_forwarder(self, forwarder, event_forwarder=None):
+        """
+        设置日志转发函数，子进程中用于把日志交给主进程输出.
+
+        Args:
+            forwarder (Callable[[str, str, int], None] | None): 转发函数，参数为 (message, type, mode)，为 None 时恢复本地输出.
+            event_forwarder (Callable[[dict], None] | None): 结构化事件转发函数，参数为完整的事件记录，
+                由主进程用 write_event() 写入；为 None 时子进程的事件只转发文字日志.
+        """
+        self._forwarder = forwarder
+        self._event_forwarder = event_forwarder if forwarder is not None else None
+
+    def set_auto_save(self, auto_save: bool):
+        """
+        设置是否自动保存日志.
+
+        Args:
+            auto_save (bool): 是否自动保存日志.
+        """
+        self.auto_save = auto_save
+
+# 全局实例
+logger = _Logger()
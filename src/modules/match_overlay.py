@@ -0,0 +1,184 @@
+import os
+import time
+import threading
+import cv2
+import numpy as np
+from typing import Callable, Optional, Tuple
+
+# 匹配记录: (模板名称, 搜索区域 rect, 基准窗口大小 base_size, 中心坐标 center | None, 相似度, 模板尺寸 size | None, 阈值)
+# rect 和 base_size 的含义同 TemplateMatcher.match_scaled()，center 和 size 为截图坐标
+
+
+class MatchOverlay:
+    """
+    记录任务最近一轮匹配的画面和结果，供界面实时预览.
+
+    默认关闭，关闭时任务线程中的记录调用只判断一次开关；打开后每秒最多记录 fps 轮，
+    任务线程只保存截图的引用和匹配结果，不复制、不缩放也不绘制，绘制由界面调用 render_overlay() 完成。
+    一轮从任务截图（begin）开始，到下一次被记录的截图为止，期间的匹配结果都画在这张截图上。
+    """
+    DEFAULT_FPS = 5     # 默认每秒最多记录的轮数
+
+    def __init__(self, fps: float = DEFAULT_FPS, listener: Callable[[tuple], None] | None = None):
+        """
+        Args:
+            fps (float): 每秒最多记录的轮数。
+            listener (Callable[[tuple], None] | None): 记录的转发函数，任务子进程中用于把匹配结果交给主进程，
+                参数为 ("begin", (宽, 高)) 或 ("match", 匹配记录)。
+        """
+        self.enabled = False
+        self.fps = fps
+        self.listener = listener
+        self._lock = threading.Lock()
+        self._seq = 0                   # 轮次序号
+        self._frame = None              # 本轮截图（引用）
+        self._matches: list = []        # 本轮的匹配记录
+        self._recording = False         # 本轮是否被记录
+        self._last_time = float("-inf") # 上次记录的时间
+
+    def set_enabled(self, enabled: bool, fps: float | None = None):
+        """
+        打开或关闭记录.
+
+        Args:
+            enabled (bool): 是否记录。
+            fps (float | None): 每秒最多记录的轮数，为 None 时不修改。
+        """
+        if fps is not None:
+            self.fps = fps
+        self.enabled = enabled
+        if not enabled:
+            self.clear()
+
+    def begin(self, frame: np.ndarray, now: float | None = None) -> bool:
+        """
+        任务截图后调用，距上次记录不足 1/fps 秒时本轮不记录.
+
+        Args:
+            frame (np.ndarray): 刚截取的 BGR 图像，只保存引用。
+            now (float | None): 当前时间（单调时钟，秒），默认取 time.monotonic()。
+
+        Returns:
+            bool: 本轮被记录返回 True。
+        """
+        if not self.enabled:
+            return False
+        if now is None:
+            now = time.monotonic()
+        if self.fps > 0 and now - self._last_time < 1 / self.fps:
+            self._recording = False
+            return False
+        self._last_time = now
+        h, w = frame.shape[:2]
+        with self._lock:
+            self._seq += 1
+            self._frame = frame
+            self._matches = []
+            self._recording = True
+        if self.listener is not None:
+            self.listener(("begin", (w, h)))
+        return True
+
+    def add(self, match: tuple):
+        """
+        记录本轮的一次匹配结果，本轮没有被记录时忽略.
+
+        Args:
+            match (tuple): 匹配记录，见模块开头的说明。
+        """
+        if not self._recording:
+            return
+        with self._lock:
+            self._matches.append(match)
+        if self.listener is not None:
+            self.listener(("match", match))
+
+    def apply(self, record: tuple):
+        """
+        应用子进程转发的记录，主进程中调用，没有截图引用，预览时使用共享内存中的最新画面.
+
+        Args:
+            record (tuple): listener 收到的记录。
+        """
+        with self._lock:
+            if record[0] == "begin":
+                self._seq += 1
+                self._frame = None
+                self._matches = []
+            elif record[0] == "match":
+                self._matches.append(record[1])
+
+    def snapshot(self) -> Tuple[int, Optional[np.ndarray], list]:
+        """
+        读取最近一轮的截图和匹配结果.
+
+        Returns:
+            Tuple[int, Optional[np.ndarray], list]: (序号, 截图, 匹配记录列表的副本)，还没有记录时为 (0, None, [])。
+        """
+        with self._lock:
+            return self._seq, self._frame, list(self._matches)
+
+    def clear(self):
+        """
+        丢弃当前记录的截图.
+        """
+        with self._lock:
+            self._frame = None
+            self._matches = []
+            self._recording = False
+
+
+def make_match_record(template_path: str, rect, base_size, center, score: float, size, threshold: float) -> tuple:
+    """
+    生成匹配记录，模板名称取文件名（不含扩展名）.
+
+    Returns:
+        tuple: 匹配记录，见模块开头的说明。
+    """
+    name = os.path.splitext(os.path.basename(template_path))[0]
+    return (name, tuple(rect) if rect else None, tuple(base_size), center, float(score), size, threshold)
+
+
+def render_overlay(frame: np.ndarray, matches: list, width: int = 640) -> np.ndarray:
+    """
+    把匹配结果绘制在缩小后的截图上.
+
+    搜索区域画黄色细框，达到阈值的匹配画绿色框，未达到阈值的只在搜索区域旁标出红色的相似度。
+
+    Args:
+        frame (np.ndarray): BGR 截图。
+        matches (list): 匹配记录列表。
+        width (int): 输出图像宽度，截图本身更窄时不放大。
+
+    Returns:
+        np.ndarray: 绘制后的 BGR 图像（新数组）。
+    """
+    h, w = frame.shape[:2]
+    scale = min(1.0, width / w)
+    if scale < 1.0:
+        # 预览按帧率反复绘制，用 INTER_LINEAR（2560 宽的截图约 1ms），INTER_AREA 要慢一个数量级
+        image = cv2.resize(frame, (max(1, round(w * scale)), max(1, round(h * scale))), interpolation=cv2.INTER_LINEAR)
+    else:
+        image = frame.copy()
+    if image.ndim == 2:
+        image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+
+    for name, rect, base_size, center, score, size, threshold in matches:
+        label = f"{name} {score:.2f}"
+        label_pos = None
+        if rect and all(coord > 0 for coord in rect) and base_size[0] and base_size[1]:
+            # rect 是基准窗口坐标，先换算到截图坐标再缩放
+            sx = w / base_size[0] * scale
+            sy = h / base_size[1] * scale
+            x1, y1, x2, y2 = (int(rect[0] * sx), int(rect[1] * sy), int(rect[2] * sx), int(rect[3] * sy))
+            cv2.rectangle(image, (x1, y1), (x2, y2), (0, 255, 255), 1)
+            label_pos = (x1, max(10, y1 - 4))
+        if center is not None and size is not None and score >= threshold:
+            cx, cy = center[0] * scale, center[1] * scale
+            tw, th = size[0] * scale, size[1] * scale
+            top_left = (int(cx - tw / 2), int(cy - th / 2))
+            cv2.rectangle(image, top_left, (int(cx + tw / 2), int(cy + th / 2)), (0, 255, 0), 2)
+            cv2.putText(image, label, (top_left[0], max(10, top_left[1] - 4)), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 255, 0), 1)
+        elif label_pos is not None:
+            cv2.putText(image, label, label_pos, cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 0, 255), 1)
+    return image
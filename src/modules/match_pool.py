@@ -0,0 +1,180 @@
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable
+
+
+class MatchPool:
+    """
+    进程内共享的模板匹配线程池.
+
+    所有窗口的任务把匹配工作提交到同一个线程池，线程数与 CPU 核数相关而不是与窗口数相关
+    （cv2.matchTemplate 执行时会释放 GIL，多个线程可以真正并行）。
+    每个窗口有独立的队列，工作线程按窗口轮流取任务，某个窗口提交得再多也不会饿死其它窗口。
+    """
+
+    def __init__(self, workers: int = 0):
+        """
+        初始化线程池，工作线程在第一次提交任务时才启动.
+
+        Args:
+            workers (int): 工作线程数，小于等于 0 时使用 CPU 核数。
+        """
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._queues: dict[Hashable, deque] = {}    # 窗口 -> 待执行的任务
+        self._ready: deque = deque()                # 有待执行任务的窗口，按轮转顺序排列
+        self._threads: list[threading.Thread] = []
+        self._target_workers = self._resolve_workers(workers)
+        self._shutdown = False
+
+    @staticmethod
+    def _resolve_workers(workers: int) -> int:
+        """
+        计算实际的工作线程数.
+        """
+        if workers and workers > 0:
+            return int(workers)
+        return max(1, os.cpu_count() or 1)
+
+    def set_workers(self, workers: int):
+        """
+        调整工作线程数，多余的线程在完成手头的任务后退出.
+
+        Args:
+            workers (int): 工作线程数，小于等于 0 时使用 CPU 核数。
+        """
+        with self._lock:
+            self._target_workers = self._resolve_workers(workers)
+            if self._threads:
+                self._spawn_workers()
+            self._not_empty.notify_all()
+
+    def get_workers(self) -> int:
+        """
+        获取目标工作线程数.
+
+        Returns:
+            int: 工作线程数。
+        """
+        return self._target_workers
+
+    def _spawn_workers(self):
+        """
+        补齐工作线程，调用方需持有锁.
+        """
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self._target_workers:
+            thread = threading.Thread(target=self._worker, name=f"MatchPool-{len(self._threads)}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def submit(self, owner: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        提交一个匹配任务.
+
+        Args:
+            owner (Hashable): 任务所属的窗口（通常是窗口句柄），用于公平调度。
+            fn (Callable): 要执行的函数。
+            *args: 函数参数。
+            **kwargs: 函数关键字参数。
+
+        Returns:
+            Future: 任务结果。
+
+        Raises:
+            RuntimeError: 线程池已关闭。
+        """
+        future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("匹配线程池已关闭")
+            if not self._threads:
+                self._spawn_workers()
+            queue = self._queues.get(owner)
+            if queue is None:
+                queue = self._queues[owner] = deque()
+                self._ready.append(owner)
+            queue.append((future, fn, args, kwargs))
+            self._not_empty.notify()
+        return future
+
+    def run(self, owner: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        提交一个匹配任务并等待结果.
+
+        Args:
+            owner (Hashable): 任务所属的窗口。
+            fn (Callable): 要执行的函数。
+
+        Returns:
+            Any: 函数返回值，函数抛出的异常会原样抛出。
+        """
+        return self.submit(owner, fn, *args, **kwargs).result()
+
+    def _next_job(self):
+        """
+        按窗口轮转取出下一个任务，没有任务时阻塞；需要退出时返回 None.
+        """
+        with self._lock:
+            while True:
+                if self._shutdown or len(self._threads) > self._target_workers:
+                    # 线程数被调小时，多余的线程退出
+                    current = threading.current_thread()
+                    if current in self._threads:
+                        self._threads.remove(current)
+                    return None
+                if self._ready:
+                    owner = self._ready.popleft()
+                    queue = self._queues[owner]
+                    job = queue.popleft()
+                    if queue:
+                        self._ready.append(owner) # 还有任务，排到队尾等下一轮
+                    else:
+                        del self._queues[owner]
+                    return job
+                self._not_empty.wait()
+
+    def _worker(self):
+        """
+        工作线程主循环.
+        """
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            future, fn, args, kwargs = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def pending_count(self) -> int:
+        """
+        获取排队中的任务数.
+
+        Returns:
+            int: 任务数。
+        """
+        with self._lock:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def shutdown(self):
+        """
+        关闭线程池，排队中的任务会被取消.
+        """
+        with self._lock:
+            self._shutdown = True
+            for queue in self._queues.values():
+                for future, _, _, _ in queue:
+                    future.cancel()
+            self._queues.clear()
+            self._ready.clear()
+            self._not_empty.notify_all()
+
+
+# 全局实例
+match_pool = MatchPool()
@@ -0,0 +1,397 @@
+import os
+import threading
+import multiprocessing
+from multiprocessing.connection import Client, Listener
+from typing import Optional, Tuple
+import numpy as np
+from .shared_frame import SharedFrameBuffer
+
+
+def parse_cpu_list(text: str) -> list[int]:
+    """
+    解析 CPU 列表，如 "0-3,6".
+
+    Args:
+        text (str): CPU 列表字符串，为空时返回空列表。
+
+    Returns:
+        list[int]: CPU 编号列表。
+
+    Raises:
+        ValueError: 格式错误。
+    """
+    cpus = set()
+    for part in (text or "").replace("，", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = (int(v) for v in part.split("-", 1))
+            cpus.update(range(start, end + 1))
+        else:
+            cpus.add(int(part))
+    return sorted(cpus)
+
+
+def set_cpu_affinity(cpus: list[int]) -> bool:
+    """
+    把当前进程绑定到指定 CPU.
+
+    Args:
+        cpus (list[int]): CPU 编号列表，为空时不做限制。
+
+    Returns:
+        bool: 设置成功返回 True。
+    """
+    if not cpus:
+        return False
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, cpus)
+            return True
+        import win32api
+        import win32con
+        import win32process
+        mask = 0
+        for cpu in cpus:
+            mask |= 1 << cpu
+        handle = win32api.OpenProcess(win32con.PROCESS_ALL_ACCESS, False, os.getpid())
+        win32process.SetProcessAffinityMask(handle, mask)
+        return True
+    except Exception as e:
+        print(f"设置匹配服务 CPU 亲和性失败: {e}")
+        return False
+
+
+class _MatchService:
+    """
+    匹配服务进程中的模板库和请求处理.
+
+    所有连接共用一份模板库（原图、灰度图、掩模）和缩放模板缓存，每个连接在自己的线程中处理请求。
+    """
+
+    def __init__(self):
+        self.templates: dict = {}           # 模板路径 -> (模板, 灰度图, 掩模)，所有连接共用
+        self.requests = 0                   # 累计处理的匹配请求数
+        self._lock = threading.Lock()
+
+    def _new_matcher(self):
+        """
+        创建共用模板库的匹配器.
+        """
+        from .template_matcher import TemplateMatcher
+        matcher = TemplateMatcher()
+        matcher.cache = self.templates
+        return matcher
+
+    def warm(self, paths: list[str]) -> int:
+        """
+        预先加载模板.
+
+        Returns:
+            int: 模板库中的模板数。
+        """
+        self._new_matcher().load_templates_to_cache(paths)
+        return len(self.templates)
+
+    def serve(self, conn, on_shutdown):
+        """
+        处理一个连接的请求，直到连接断开.
+        """
+        matcher = self._new_matcher()
+        frames: Optional[SharedFrameBuffer] = None
+        try:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                kind = request[0]
+                try:
+                    if kind == "match":
+                        _, buffer_name, template_path, threshold, rect, base_size = request
+                        # 客户端换了更大的缓冲区时重新连接
+                        if frames is None or frames.name != buffer_name:
+                            if frames is not None:
+                                frames.close()
+                            frames = SharedFrameBuffer(buffer_name, create=False)
+                        _, screenshot = frames.read()
+                        if screenshot is None:
+                            raise RuntimeError("共享内存中没有画面")
+                        matcher.set_template(template_path)
+                        result = matcher.match_scaled(screenshot, threshold=threshold, rect=rect, base_size=base_size)
+                        with self._lock:
+                            self.requests += 1
+                        conn.send(("ok", result))
+                    elif kind == "warm":
+                        conn.send(("ok", self.warm(request[1])))
+                    elif kind == "stats":
+                        from .template_matcher import scaled_template_cache
+                        conn.send(("ok", {
+                            "pid": os.getpid(),
+                            "requests": self.requests,
+                            "templates": len(self.templates),
+                            "scaled_templates": len(scaled_template_cache),
+                        }))
+                    elif kind == "shutdown":
+                        conn.send(("ok", None))
+                        on_shutdown()
+                        return
+                    else:
+                        conn.send(("error", f"未知请求: {kind}"))
+                except Exception as e:
+                    conn.send(("error", str(e)))
+        finally:
+            if frames is not None:
+                frames.close()
+            conn.close()
+
+
+def _server_main(ready_conn, authkey: bytes, affinity: list[int], templates: list[str]):
+    """
+    匹配服务进程入口：监听本地连接，每个连接一个线程.
+    """
+    from .logger import logger
+    # 匹配服务不写日志文件，避免和主进程写同一个 log.txt
+    logger.set_auto_save(False)
+    set_cpu_affinity(affinity)
+    service = _MatchService()
+    service.warm(templates)
+    listener = Listener(authkey=authkey)
+    closing = threading.Event()
+
+    def shutdown():
+        closing.set()
+        # 连接自己一次，让阻塞在 accept() 的主线程醒来
+        try:
+            Client(listener.address, authkey=authkey).close()
+        except Exception:
+            pass
+
+    ready_conn.send(listener.address)
+    ready_conn.close()
+    try:
+        while not closing.is_set():
+            try:
+                conn = listener.accept()
+            except Exception: # 认证失败等，继续等待下一个连接
+                continue
+            if closing.is_set():
+                conn.close()
+                break
+            threading.Thread(target=service.serve, args=(conn, shutdown), daemon=True).start()
+    finally:
+        listener.close()
+
+
+class MatchClient:
+    """
+    匹配服务的客户端，每个执行器一个.
+
+    截图写入客户端自己的共享内存，请求只发送共享内存名称和模板路径，画面数据不经过 pickle。
+    """
+
+    def __init__(self, address, authkey: bytes):
+        """
+        Args:
+            address: 匹配服务的监听地址。
+            authkey (bytes): 连接认证密钥。
+        """
+        self._conn = Client(address, authkey=authkey)
+        self._frames: Optional[SharedFrameBuffer] = None
+        self._lock = threading.Lock()
+
+    def _request(self, *request):
+        """
+        发送请求并等待结果，调用方需持有锁.
+
+        Raises:
+            RuntimeError: 服务返回错误。
+        """
+        self._conn.send(request)
+        status, value = self._conn.recv()
+        if status != "ok":
+            raise RuntimeError(value)
+        return value
+
+    def _write_frame(self, screenshot: np.ndarray):
+        """
+        把截图写入共享内存，容量不够时换一块更大的缓冲区.
+        """
+        h, w = screenshot.shape[:2]
+        if self._frames is None or not self._frames.write(screenshot):
+            if self._frames is not None:
+                self._frames.close()
+            self._frames = SharedFrameBuffer(max_size=(w, h))
+            self._frames.write(screenshot)
+        return self._frames.name
+
+    def match(self, screenshot: np.ndarray, template_path: str, threshold: float = 0.6,
+              rect: Optional[Tuple[int, int, int, int]] = None, base_size: tuple = (2560, 1351)) -> tuple:
+        """
+        在匹配服务中执行缩放模板匹配，参数和返回值同 TemplateMatcher.match_scaled().
+        """
+        # 写入画面和等待结果都在锁内，结果返回前共享内存不会被覆盖
+        with self._lock:
+            buffer_name = self._write_frame(screenshot)
+            return self._request("match", buffer_name, template_path, threshold, rect, base_size)
+
+    def warm(self, paths: list[str]) -> int:
+        """
+        让匹配服务预先加载模板.
+
+        Returns:
+            int: 服务模板库中的模板数。
+        """
+        with self._lock:
+            return self._request("warm", list(paths))
+
+    def get_stats(self) -> dict:
+        """
+        获取匹配服务的统计.
+
+        Returns:
+            dict: pid, requests(累计匹配次数), templates(模板数), scaled_templates(缩放模板缓存数)。
+        """
+        with self._lock:
+            return self._request("stats")
+
+    def close(self):
+        """
+        断开连接并释放共享内存.
+        """
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            if self._frames is not None:
+                self._frames.close()
+                self._frames = None
+
+
+class MatchServer:
+    """
+    独立的模板匹配服务进程.
+
+    模板库和缩放模板缓存只在服务进程中保存一份，所有实例（线程或子进程）通过本地连接提交匹配，
+    缓存只需预热一次，界面进程和各执行器不再各自持有模板数据，服务进程可以单独绑定 CPU。
+    """
+    START_TIMEOUT = 10 # 等待服务进程启动的时间（秒）
+
+    def __init__(self, address=None, authkey: bytes | None = None):
+        """
+        Args:
+            address: 已运行服务的监听地址，为 None 时需调用 start() 启动服务。
+            authkey (bytes | None): 已运行服务的认证密钥。
+        """
+        self.address = address
+        self.authkey = authkey
+        self._process = None
+
+    @classmethod
+    def attach(cls, address, authkey: bytes) -> "MatchServer":
+        """
+        连接其它进程启动的匹配服务（如任务子进程中），只能创建客户端，不能停止服务.
+        """
+        return cls(address, authkey)
+
+    def start(self, affinity: list[int] | None = None, templates: list[str] | None = None):
+        """
+        启动服务进程.
+
+        Args:
+            affinity (list[int] | None): 服务进程绑定的 CPU，为空时不限制。
+            templates (list[str] | None): 启动时预先加载的模板路径。
+
+        Raises:
+            RuntimeError: 服务进程启动失败或超时。
+        """
+        if self.is_running():
+            return
+        ctx = multiprocessing.get_context("spawn")
+        self.authkey = os.urandom(16)
+        ready_recv, ready_send = ctx.Pipe(duplex=False)
+        self._process = ctx.Process(
+            target=_server_main,
+            args=(ready_send, self.authkey, list(affinity or []), list(templates or [])),
+            name="MatchServer",
+            daemon=True
+        )
+        self._process.start()
+        ready_send.close()
+        error = None
+        try:
+            if ready_recv.poll(self.START_TIMEOUT):
+                self.address = ready_recv.recv()
+            else:
+                error = "匹配服务启动超时"
+        except EOFError: # 服务进程在发出地址前退出
+            error = "匹配服务进程启动失败"
+        finally:
+            ready_recv.close()
+        if error is not None:
+            self._process.terminate()
+            self._process = None
+            raise RuntimeError(error)
+
+    def is_running(self) -> bool:
+        """
+        服务是否可用（本进程启动的服务检查进程是否存活）.
+        """
+        if self._process is not None:
+            return self._process.is_alive()
+        return self.address is not None
+
+    @property
+    def pid(self) -> int | None:
+        """
+        服务进程 PID.
+        """
+        return self._process.pid if self._process is not None else None
+
+    def connect(self) -> MatchClient:
+        """
+        创建一个客户端连接.
+
+        Raises:
+            RuntimeError: 服务未运行。
+        """
+        if not self.is_running():
+            raise RuntimeError("匹配服务未运行")
+        return MatchClient(self.address, self.authkey) # type: ignore
+
+    def client_args(self) -> tuple | None:
+        """
+        传给任务子进程的连接参数，服务未运行时返回 None.
+
+        Returns:
+            tuple | None: (address, authkey)，子进程中用 MatchServer.attach(*args) 连接。
+        """
+        if not self.is_running():
+            return None
+        return self.address, self.authkey
+
+    def stop(self, timeout: float = 3.0):
+        """
+        停止本进程启动的服务进程.
+        """
+        if self._process is None:
+            return
+        if self._process.is_alive():
+            try:
+                client = MatchClient(self.address, self.authkey) # type: ignore
+                client._request("shutdown")
+                client.close()
+            except Exception:
+                pass
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+        self._process = None
+        self.address = None
+        self.authkey = None
+
+
+# 全局实例，按配置由管理器启动
+match_server = MatchServer()
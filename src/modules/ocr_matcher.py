@@ -1,9 +1,9 @@
-from rapidocr_onnxruntime import RapidOCR
 import os
 import cv2
 import numpy as np
 from typing import Any, Dict, Optional, Tuple, List, Union
 from PIL import Image, ImageDraw, ImageFont
+from .thread_budget import thread_budget
 
 class OCRMatcher:
     """
@@ -13,17 +13,23 @@ class OCRMatcher:
     模仿 TemplateMatcher 增加了分辨率自适应和区域裁剪功能。
     """
 
-    def __init__(self, thread_num: int = 2, det_model_path: Optional[str] = None):
+    def __init__(self, thread_num: Optional[int] = None, det_model_path: Optional[str] = None):
         """
         初始化 OCR 匹配器。
 
         Args:
-            thread_num (int): OMP 和 ONNX 的线程数。
+            thread_num (int, optional): OMP 和 ONNX 的线程数，默认按全局线程预算分配。
             det_model_path (str, optional): 自定义检测模型路径。
         """
-        self.ocr = RapidOCR(det_model_path=det_model_path)
-        os.environ["OMP_NUM_THREADS"] = str(thread_num)
-        os.environ["ONNX_NUM_THREADS"] = str(thread_num)
+        if thread_num is None:
+            options = thread_budget.ort_options()
+        else:
+            options = {"intra_op_num_threads": thread_num, "inter_op_num_threads": 1}
+        # 线程数必须在引擎创建（导入 onnxruntime）之前设置，之后再改环境变量不会生效
+        os.environ["OMP_NUM_THREADS"] = str(options["intra_op_num_threads"])
+        os.environ["ONNX_NUM_THREADS"] = str(options["intra_op_num_threads"])
+        from rapidocr_onnxruntime import RapidOCR
+        self.ocr = RapidOCR(det_model_path=det_model_path, **options)
         self.last_results = [] # 上次匹配的所有结果
 
     def match_text(self, screenshot: np.ndarray, keywords: Union[str, List[str]], threshold: float = 0.6, 
@@ -143,20 +149,25 @@ class OCRMatcher:
         self.last_results = matches
         return matches
 
-    def visualize_match(self, screenshot: np.ndarray, results: list = None): # type: ignore
+    def visualize_match(self, screenshot: np.ndarray, results: list = None) -> Optional[np.ndarray]: # type: ignore
         """
         可视化 OCR 匹配结果。
 
+        在截图副本上绘制结果并返回，不弹出窗口、不阻塞调用线程。
+
         Args:
             screenshot (np.ndarray): 输入的截图图像 (BGR 格式)。
             results (list, optional): OCR 匹配结果列表。如果不传则使用最近一次结果。
+
+        Returns:
+            Optional[np.ndarray]: 绘制后的图像 (BGR 格式)，没有结果时返回 None。
         """
         if results is None:
             results = self.last_results
 
         if not results:
             print("没有可显示的结果。")
-            return
+            return None
 
         img_show = screenshot.copy()
         
@@ -177,9 +188,7 @@ class OCRMatcher:
             # 绘制中心点
             cv2.circle(img_show, center, 3, (0, 255, 0), -1)
 
-        cv2.imshow("OCR Match", img_show)
-        cv2.waitKey(0)
-        cv2.destroyAllWindows()
+        return img_show
 
     def _put_chinese_text(self, img_cv, text, position, text_color=(0, 255, 0), text_size=20):
         """
@@ -0,0 +1,50 @@
+import math
+import random
+
+
+class PhaseOffset:
+    """
+    多开实例的轮询相位.
+
+    把时间划分为固定长度的周期，第 index 个实例（共 count 个）的轮询都对齐到周期内的第 index 个时隙，
+    不同实例的截图和匹配均匀错开，而不是同时醒来造成周期性的 CPU 尖峰。
+    对齐时取离原定唤醒时间最近的时隙，平均等待时间不变，并在时隙内保留少量随机抖动。
+    """
+    PERIOD = 1.0        # 相位周期（秒），短于一个周期的等待不做对齐
+    JITTER = 0.4        # 时隙内的随机抖动幅度（占时隙宽度的比例）
+
+    def __init__(self, index: int, count: int, period: float = PERIOD):
+        """
+        Args:
+            index (int): 实例序号，从 0 开始。
+            count (int): 实例总数。
+            period (float): 相位周期（秒）。
+        """
+        count = max(1, count)
+        self.index = index % count
+        self.count = count
+        self.period = period
+        self.slot = period / count                  # 每个实例的时隙宽度
+        self.offset = self.index * self.slot        # 本实例在周期内的相位
+
+    def align(self, now: float, delay: float) -> float:
+        """
+        把一次等待的唤醒时间对齐到本实例的相位.
+
+        Args:
+            now (float): 当前时间（秒）。
+            delay (float): 原定等待时间（秒）。
+
+        Returns:
+            float: 对齐后的等待时间（秒）。
+        """
+        if delay < self.period:
+            return delay
+        target = now + delay
+        base = math.floor((target - self.offset) / self.period) * self.period + self.offset
+        aligned = base if target - base <= self.period / 2 else base + self.period
+        aligned += random.uniform(-self.JITTER, self.JITTER) * self.slot / 2
+        return max(0.0, aligned - now)
+
+    def __repr__(self):
+        return f"PhaseOffset({self.index}/{self.count}, offset={self.offset:.3f})"
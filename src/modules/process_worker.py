@@ -0,0 +1,115 @@
+import queue
+import functools
+from .shared_frame import SharedFrameBuffer, SharedFrameCapture
+from .thread_budget import thread_budget
+from .match_server import MatchServer
+from .frame_cache import FrameCache
+from .match_overlay import MatchOverlay
+from .logger import logger
+
+# 需要从子进程转发回主进程的 TaskRunner 信号
+FORWARDED_SIGNALS = ("started", "finished", "stopped", "paused", "resumed",
+                     "status_msg_changed", "progress_changed", "current_task_changed")
+
+
+def _forward_signal(event_queue, name: str, *args):
+    """
+    子进程中把 TaskRunner 的信号放入事件队列.
+    """
+    event_queue.put(("signal", name, args))
+
+
+def _forward_log(event_queue, message: str, type: str, mode: int):
+    """
+    子进程中把日志放入事件队列，由主进程的 logger 统一输出和保存.
+    """
+    event_queue.put(("log", message, type, mode))
+
+
+def _forward_event(event_queue, record: dict):
+    """
+    子进程中把结构化事件放入事件队列，由主进程写入 events.jsonl.
+    """
+    event_queue.put(("event", record))
+
+
+def _forward_overlay(event_queue, record: tuple):
+    """
+    子进程中把匹配预览记录放入事件队列，只在预览打开时按预览帧率发送.
+    """
+    event_queue.put(("overlay", record))
+
+
+def _create_child_runner(log_mode: int, frame_buffer: SharedFrameBuffer, thumbnail_buffer: SharedFrameBuffer | None = None,
+                         overlay: MatchOverlay | None = None):
+    """
+    在子进程中创建 TaskRunner，截图同时写入共享内存，缩略图写入另一块共享内存，匹配预览记录转发给主进程.
+    """
+    from ..ui.core.task_runner import TaskRunner
+    from .window_capture import WindowCapture
+    return TaskRunner(log_mode, wincap=SharedFrameCapture(WindowCapture(), frame_buffer),
+                      thumbnails=FrameCache(sink=thumbnail_buffer), overlay=overlay)
+
+
+def child_main(cmd_queue, event_queue, task_names: list[str], config: dict, hwnd: int, loop_count: int,
+               timeout: int, stuck_timeout: float, log_mode: int, frame_buffer_name: str, phase=None, budget: int = 1,
+               match_server_args: tuple | None = None, thumbnail_buffer_name: str | None = None, preview: tuple | None = None):
+    """
+    任务子进程入口（见 ProcessRunner）：创建任务和 TaskRunner 并运行，同时处理主进程发来的停止/暂停/恢复命令.
+
+    本模块不导入界面、配置模型和 Qt 日志适配器，子进程只加载 TaskRunner 的信号需要的 QtCore。
+    """
+    from PySide6.QtCore import Qt
+    from ..tasks.registry import TASK_MAP
+
+    logger.set_auto_save(False)
+    logger.set_forwarder(functools.partial(_forward_log, event_queue), functools.partial(_forward_event, event_queue))
+    # 每个实例已经独占一个进程，匹配线程只需要一个，分到的预算都给 OpenCV 和 ONNX Runtime
+    thread_budget.configure(budget, match_workers=1)
+    thread_budget.apply(1)
+
+    frame_buffer = SharedFrameBuffer(frame_buffer_name, create=False)
+    thumbnail_buffer = SharedFrameBuffer(thumbnail_buffer_name, create=False) if thumbnail_buffer_name else None
+    overlay = MatchOverlay(listener=functools.partial(_forward_overlay, event_queue))
+    if preview is not None:
+        overlay.set_enabled(*preview)
+    runner = _create_child_runner(log_mode, frame_buffer, thumbnail_buffer, overlay)
+    runner.set_phase(phase)
+    if match_server_args is not None:
+        # 连接主进程启动的匹配服务，子进程不再各自缓存缩放模板
+        runner.set_match_server(MatchServer.attach(*match_server_args))
+    for name in FORWARDED_SIGNALS:
+        # 子进程没有事件循环，必须直接连接
+        getattr(runner, name).connect(functools.partial(_forward_signal, event_queue, name), Qt.ConnectionType.DirectConnection)
+
+    try:
+        tasks = []
+        for name in task_names:
+            task_class = TASK_MAP.get(name)
+            if task_class is None:
+                logger.error(f"未知任务: {name}", mode=log_mode)
+                continue
+            tasks.append(task_class(config=config))
+
+        runner.start(tasks, hwnd, loop_count=loop_count, timeout=timeout, stuck_timeout=stuck_timeout)
+        while runner.is_running():
+            try:
+                cmd = cmd_queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            if cmd == "stop":
+                runner.stop()
+            elif cmd == "pause":
+                runner.pause()
+            elif cmd == "resume":
+                runner.resume()
+            elif isinstance(cmd, tuple) and cmd[0] == "preview":
+                runner.set_preview(cmd[1], cmd[2])
+        # 等待工作线程发完收尾信号
+        if runner._thread is not None:
+            runner._thread.join(timeout=5)
+    finally:
+        event_queue.put(("exit",))
+        frame_buffer.close()
+        if thumbnail_buffer is not None:
+            thumbnail_buffer.close()
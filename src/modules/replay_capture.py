@@ -0,0 +1,191 @@
+import os
+import json
+import bisect
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+from .clock import Clock, real_clock
+from .interfaces import FrameSource, InputDevice
+
+
+class RecordingCapture:
+    """
+    录制截图.
+
+    包装一个真实的截图对象，截图的同时按固定间隔把画面保存到目录中，
+    并在 index.json 中记录每一帧相对于开始录制的时间，供 ReplayCapture 回放。
+    """
+
+    def __init__(self, inner, out_dir: str, interval: float = 0.5, clock: Clock = real_clock):
+        """
+        初始化录制截图.
+
+        Args:
+            inner: 被包装的截图对象（如 WindowCapture）。
+            out_dir (str): 保存目录。
+            interval (float): 最小保存间隔（秒）。
+            clock (Clock): 时钟对象。
+        """
+        self.inner = inner
+        self.out_dir = out_dir
+        self.interval = interval
+        self.clock = clock
+        self._start_time: Optional[float] = None
+        self._last_save_time = float("-inf")
+        self._frames: list[dict] = []
+        os.makedirs(out_dir, exist_ok=True)
+
+    def __getattr__(self, name):
+        # 其余方法（set_hwnd, get_window_size 等）直接转发给被包装对象
+        return getattr(self.inner, name)
+
+    def capture(self) -> Optional[np.ndarray]:
+        """
+        截图并按间隔保存.
+
+        Returns:
+            Optional[np.ndarray]: 截图图像，失败返回 None。
+        """
+        frame = self.inner.capture()
+        if frame is None:
+            return None
+        now = self.clock.time()
+        if self._start_time is None:
+            self._start_time = now
+        if now - self._last_save_time >= self.interval:
+            self._last_save_time = now
+            filename = f"{len(self._frames):06d}.png"
+            cv2.imwrite(os.path.join(self.out_dir, filename), frame)
+            self._frames.append({"t": round(now - self._start_time, 3), "file": filename})
+            self._save_index()
+        return frame
+
+    def _save_index(self):
+        """
+        保存帧索引.
+        """
+        with open(os.path.join(self.out_dir, "index.json"), "w", encoding="utf-8") as f:
+            json.dump(self._frames, f, ensure_ascii=False)
+
+
+class ReplayCapture(FrameSource):
+    """
+    回放截图.
+
+    按时钟时间回放 RecordingCapture 录制的画面，接口与 WindowCapture 相同。
+    配合 VirtualClock 使用时，几分钟的录制可以在很短时间内跑完。
+    """
+
+    def __init__(self, record_dir: str, clock: Clock = real_clock, loop: bool = False):
+        """
+        初始化回放截图.
+
+        Args:
+            record_dir (str): 录制目录（包含 index.json）。
+            clock (Clock): 时钟对象，回放进度由它决定。
+            loop (bool): 播放完后是否从头循环，默认停在最后一帧。
+        """
+        self.record_dir = record_dir
+        self.clock = clock
+        self.loop = loop
+        self.hwnd = None
+        self.cache = None
+        with open(os.path.join(record_dir, "index.json"), "r", encoding="utf-8") as f:
+            self._frames: list[dict] = json.load(f)
+        if not self._frames:
+            raise ValueError(f"录制目录中没有画面: {record_dir}")
+        self._times = [frame["t"] for frame in self._frames] # 各帧的时间，录制时递增
+        self._loaded: dict[int, np.ndarray] = {}
+        self._start_time: Optional[float] = None
+
+    @property
+    def frame_count(self) -> int:
+        """
+        录制的帧数.
+        """
+        return len(self._frames)
+
+    def set_hwnd(self, hwnd: int):
+        self.hwnd = hwnd
+
+    def is_window_valid(self) -> bool:
+        return True
+
+    def rewind(self):
+        """
+        回到录制的开头.
+        """
+        self._start_time = None
+
+    def _frame_index_at(self, elapsed: float) -> int:
+        """
+        获取指定时间点应显示的帧序号.
+        """
+        duration = self._times[-1]
+        if self.loop and duration > 0:
+            elapsed = elapsed % duration
+        return max(0, bisect.bisect_right(self._times, elapsed) - 1)
+
+    def capture(self) -> Optional[np.ndarray]:
+        """
+        返回当前时间点对应的录制画面.
+
+        Returns:
+            Optional[np.ndarray]: 画面图像。
+        """
+        now = self.clock.time()
+        if self._start_time is None:
+            self._start_time = now
+        index = self._frame_index_at(now - self._start_time)
+        if index not in self._loaded:
+            frame = cv2.imread(os.path.join(self.record_dir, self._frames[index]["file"]), cv2.IMREAD_COLOR)
+            if frame is None:
+                return None
+            self._loaded[index] = frame
+        self.cache = self._loaded[index]
+        return self.cache
+
+    def get_window_size(self) -> Optional[Tuple[int, int]]:
+        frame = self.capture() if self.cache is None else self.cache
+        if frame is None:
+            return None
+        h, w = frame.shape[:2]
+        return (w, h)
+
+    def get_cache(self) -> Optional[np.ndarray]:
+        return self.cache
+
+    def clear_cache(self):
+        self.cache = None
+
+
+class ReplayClicker(InputDevice):
+    """
+    回放点击器.
+
+    接口与 AutoClicker 相同，只记录点击位置，不向任何窗口发送消息。
+    """
+
+    def __init__(self, clock: Clock = real_clock):
+        """
+        初始化回放点击器.
+
+        Args:
+            clock (Clock): 时钟对象，用于记录点击时间。
+        """
+        self.hwnd = None
+        self.clock = clock
+        self.clicks: list[tuple[float, int, int]] = [] # (时间, x, y)
+
+    def set_hwnd(self, hwnd: int):
+        self.hwnd = hwnd
+
+    def connect_window(self):
+        pass
+
+    def click(self, x: int, y: int, random_range: int | tuple = 0) -> bool:
+        self.clicks.append((self.clock.time(), x, y))
+        return True
+
+    def is_window_ready(self) -> bool:
+        return True
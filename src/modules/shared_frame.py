@@ -0,0 +1,159 @@
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+from .interfaces import FrameSource
+
+
+class SharedFrameBuffer:
+    """
+    共享内存画面缓冲区.
+
+    子进程截图后写入，主进程随时读取最新一帧，画面数据不经过 pickle 和队列。
+    头部保存 [序号, 高, 宽, 通道, 是否有读取方]，写入时序号先变为奇数、写完再变为偶数，
+    读取方发现序号为奇数或读取前后不一致时重试，避免读到写了一半的画面。
+    是否有读取方由主进程通过 set_active() 设置，SharedFrameCapture 只在有读取方时写入。
+    """
+    HEADER_SIZE = 40                            # 头部字节数（5 个 uint64）
+    DEFAULT_MAX_SIZE = (2560, 1440)             # 默认支持的最大画面尺寸 (宽, 高)
+
+    def __init__(self, name: Optional[str] = None, max_size: Tuple[int, int] = DEFAULT_MAX_SIZE, create: bool = True):
+        """
+        创建或连接共享内存缓冲区.
+
+        Args:
+            name (str | None): 共享内存名称，连接已有缓冲区时必须提供。
+            max_size (Tuple[int, int]): 支持的最大画面尺寸 (宽, 高)，超出的画面不会写入。
+            create (bool): True 为创建新的缓冲区，False 为连接已有的缓冲区。
+        """
+        self.capacity = max_size[0] * max_size[1] * 3
+        self.owner = create
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=self.HEADER_SIZE + self.capacity)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.capacity = self.shm.size - self.HEADER_SIZE
+        self._header = np.ndarray((5,), dtype=np.uint64, buffer=self.shm.buf[:self.HEADER_SIZE])
+        if create:
+            self._header[:] = 0
+
+    @property
+    def name(self) -> str:
+        """
+        共享内存名称，传给子进程用于连接.
+        """
+        return self.shm.name
+
+    @property
+    def active(self) -> bool:
+        """
+        是否有读取方在使用画面.
+        """
+        return bool(self._header[4])
+
+    def set_active(self, active: bool):
+        """
+        设置是否有读取方在使用画面，主进程打开或关闭预览时调用.
+
+        Args:
+            active (bool): 是否有读取方。
+        """
+        self._header[4] = 1 if active else 0
+
+    def write(self, frame: np.ndarray) -> bool:
+        """
+        写入一帧画面.
+
+        Args:
+            frame (np.ndarray): BGR 图像。
+
+        Returns:
+            bool: 写入成功返回 True，画面超过缓冲区大小返回 False。
+        """
+        if frame.ndim == 2:
+            frame = frame[:, :, None]
+        h, w, c = frame.shape
+        if h * w * c > self.capacity:
+            return False
+        self._header[0] += 1 # 奇数：正在写入
+        self._header[1:4] = (h, w, c)
+        data = np.ndarray((h, w, c), dtype=np.uint8, buffer=self.shm.buf[self.HEADER_SIZE:self.HEADER_SIZE + h * w * c])
+        data[:] = frame
+        self._header[0] += 1 # 偶数：写入完成
+        return True
+
+    def read(self, retries: int = 3) -> Tuple[int, Optional[np.ndarray]]:
+        """
+        读取最新一帧画面的副本.
+
+        Args:
+            retries (int): 读到写了一半的画面时的重试次数。
+
+        Returns:
+            Tuple[int, Optional[np.ndarray]]: (序号, 画面)，还没有画面或多次重试失败时画面为 None。
+        """
+        for _ in range(retries):
+            seq = int(self._header[0])
+            if seq == 0:
+                return 0, None
+            if seq % 2:
+                continue
+            h, w, c = (int(v) for v in self._header[1:4])
+            frame = np.ndarray((h, w, c), dtype=np.uint8, buffer=self.shm.buf[self.HEADER_SIZE:self.HEADER_SIZE + h * w * c]).copy()
+            if int(self._header[0]) == seq:
+                return seq // 2, frame
+        return 0, None
+
+    def close(self):
+        """
+        断开共享内存，创建方同时释放共享内存.
+        """
+        # 先释放对共享内存的引用，否则 close 会因为缓冲区仍被导出而失败
+        self._header = None # type: ignore
+        try:
+            self.shm.close()
+            if self.owner:
+                self.shm.unlink()
+        except Exception as e:
+            print(f"释放共享内存失败: {e}")
+
+
+class SharedFrameCapture(FrameSource):
+    """
+    包装截图对象，主进程有读取方时每次截图后把画面写入共享内存，供主进程显示或调试.
+
+    没有读取方时不写入，截图不多一次整帧复制（2560x1440 的画面约 11MB）。
+    """
+
+    def __init__(self, inner: FrameSource, buffer: SharedFrameBuffer):
+        """
+        Args:
+            inner (FrameSource): 被包装的截图对象。
+            buffer (SharedFrameBuffer): 共享内存缓冲区。
+        """
+        self.inner = inner
+        self.buffer = buffer
+
+    @property
+    def hwnd(self):
+        return getattr(self.inner, "hwnd", None)
+
+    def set_hwnd(self, hwnd: int):
+        self.inner.set_hwnd(hwnd)
+
+    def is_window_valid(self) -> bool:
+        return self.inner.is_window_valid()
+
+    def get_window_size(self) -> Optional[Tuple[int, int]]:
+        return self.inner.get_window_size()
+
+    def capture(self) -> Optional[np.ndarray]:
+        frame = self.inner.capture()
+        if frame is not None and self.buffer.active:
+            self.buffer.write(frame)
+        return frame
+
+    def get_cache(self) -> Optional[np.ndarray]:
+        return self.inner.get_cache()
+
+    def clear_cache(self):
+        self.inner.clear_cache()
@@ -0,0 +1,223 @@
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Generator, Optional
+
+
+class Step:
+    """
+    协作式任务逻辑中 yield 出来的等待指令基类.
+
+    任务和状态的逻辑写成生成器，遇到需要等待的地方 yield 一个 Step，由驱动方决定怎么等：
+    线程模式下用 drive_steps() 阻塞等待，协作模式下由 CoopScheduler 放进定时堆，
+    等待结束后把结果 send 回生成器。
+    """
+
+    def run_blocking(self, sleeper: Callable[[float], bool]) -> Any:
+        """
+        在当前线程中阻塞完成等待.
+
+        Args:
+            sleeper (Callable[[float], bool]): 没有所属任务时使用的等待函数，被要求停止时返回 True。
+
+        Returns:
+            Any: send 回生成器的结果。
+        """
+        raise NotImplementedError
+
+
+class Sleep(Step):
+    """
+    等待指定时间，结果为是否被要求停止（与 _pause_aware_sleep 的返回值一致）.
+    """
+
+    def __init__(self, seconds: float, task=None):
+        """
+        Args:
+            seconds (float): 等待时间（秒），随机延迟应在创建前算好。
+            task (TemplateMatchingTask | None): 所属任务，用于检查停止和暂停。
+        """
+        self.seconds = max(0.0, float(seconds))
+        self.task = task
+
+    def run_blocking(self, sleeper: Callable[[float], bool]) -> bool:
+        if self.task is not None:
+            return self.task._pause_aware_sleep(self.seconds, is_random=False)
+        return sleeper(self.seconds)
+
+    def __repr__(self):
+        return f"Sleep({self.seconds:.2f})"
+
+
+class Await(Step):
+    """
+    等待提交到线程池（如 match_pool）的工作完成，结果为 future 的结果，工作抛出的异常会抛回生成器.
+
+    不受停止和暂停影响：匹配只需几毫秒，等它结束比丢掉结果更简单。
+    协作模式下调度器在 future 完成前不推进这个任务，调度线程可以先推进其它窗口。
+    """
+
+    def __init__(self, future: Future):
+        """
+        Args:
+            future (Future): 要等待的工作。
+        """
+        self.future = future
+
+    def run_blocking(self, sleeper: Callable[[float], bool]) -> Any:
+        return self.future.result()
+
+    def __repr__(self):
+        return f"Await({self.future!r})"
+
+
+class Throttle(Step):
+    """
+    CPU 调速器要求的排队等待，不受暂停影响，结果为 None.
+
+    异步执行器与 Sleep 一样按任务的时钟等待并在停止时提前结束，其它执行器按真实时间等待。
+    """
+
+    def __init__(self, seconds: float):
+        """
+        Args:
+            seconds (float): 等待时间（秒），由 CpuGovernor.reserve() 给出。
+        """
+        self.seconds = max(0.0, float(seconds))
+
+    def run_blocking(self, sleeper: Callable[[float], bool]) -> None:
+        time.sleep(self.seconds)
+
+    def __repr__(self):
+        return f"Throttle({self.seconds:.3f})"
+
+
+class WaitTemplate(Step):
+    """
+    等待模板出现，结果为匹配结果 (center, match_val, size)，超时或被停止时为 None.
+
+    由 steps() 中的 Sleep 和匹配步骤组成，协作模式下调度器直接推进 steps()。
+    """
+
+    def __init__(self, task, template: dict, timeout: float, interval: float = 0.5):
+        """
+        Args:
+            task (TemplateMatchingTask): 执行截图和匹配的任务。
+            template (dict): 模板信息。
+            timeout (float): 最长等待时间（秒）。
+            interval (float): 两次匹配之间的间隔（秒）。
+        """
+        self.task = task
+        self.template = template
+        self.timeout = timeout
+        self.interval = interval
+
+    def poll_steps(self) -> Generator:
+        """
+        截图并匹配一次（生成器）.
+
+        Returns:
+            tuple | None: 匹配结果，未匹配到返回 None。
+        """
+        result = yield from self.task.capture_and_match_template_steps(self.template)
+        if result and result[0] is not None:
+            return result
+        return None
+
+    def poll(self) -> Optional[tuple]:
+        """
+        在当前线程中截图并匹配一次.
+
+        Returns:
+            tuple | None: 匹配结果，未匹配到返回 None。
+        """
+        return drive_steps(self.poll_steps())
+
+    def steps(self) -> Generator:
+        """
+        反复截图匹配直到模板出现、超时或任务被停止（生成器）.
+
+        Returns:
+            tuple | None: 匹配结果，超时或被停止时返回 None。
+        """
+        deadline = self.task.clock.time() + self.timeout
+        while self.task.running:
+            result = yield from self.poll_steps()
+            if result is not None:
+                return result
+            if self.task.clock.time() >= deadline:
+                return None
+            if (yield Sleep(self.interval, task=self.task)):
+                return None
+        return None
+
+    def run_blocking(self, sleeper: Callable[[float], bool]) -> Optional[tuple]:
+        return drive_steps(self.steps(), sleeper)
+
+    def __repr__(self):
+        return f"WaitTemplate({self.template.get('path')}, timeout={self.timeout})"
+
+
+def drive_steps(steps: Generator, sleeper: Optional[Callable[[float], bool]] = None) -> Any:
+    """
+    在当前线程中阻塞执行一个步骤生成器.
+
+    Args:
+        steps (Generator): 任务或状态的步骤生成器。
+        sleeper (Callable[[float], bool] | None): 没有所属任务的 Sleep 使用的等待函数，默认直接 time.sleep。
+
+    Returns:
+        Any: 生成器的返回值。等待步骤抛出的异常（如匹配出错）会抛回生成器，与直接调用时一致。
+    """
+    if sleeper is None:
+        from .clock import real_clock
+
+        def sleeper(seconds: float) -> bool:
+            real_clock.sleep(seconds)
+            return False
+
+    value = None
+    error = None
+    try:
+        while True:
+            step = steps.send(value) if error is None else steps.throw(error)
+            try:
+                value, error = step.run_blocking(sleeper), None
+            except Exception as e:
+                value, error = None, e
+    except StopIteration as e:
+        return e.value
+
+
+def with_log_context(steps: Generator, context: dict) -> Generator:
+    """
+    包装步骤生成器，每次推进时把当前线程的日志上下文设为 context，推进完恢复.
+
+    步骤生成器可能在任务线程、协作调度线程或线程池中被推进，日志上下文跟着生成器走，
+    同一个线程轮流推进多个窗口的生成器时，日志仍然归到正确的窗口和任务。
+
+    Args:
+        steps (Generator): 步骤生成器。
+        context (dict): 日志上下文 {"hwnd": ..., "task": ...}，由调用方持有并随任务切换更新。
+
+    Returns:
+        Generator: 包装后的生成器，yield 的 Step 和返回值与 steps 相同。
+    """
+    from .logger import logger
+    value = None
+    error = None
+    while True:
+        previous = logger.set_context(context)
+        try:
+            step = steps.send(value) if error is None else steps.throw(error)
+        except StopIteration as e:
+            return e.value
+        finally:
+            logger.set_context(previous)
+        value, error = None, None
+        try:
+            value = yield step
+        except GeneratorExit:
+            steps.close()
+            raise
+        except BaseException as e:
+            error = e
@@ -0,0 +1,169 @@
+import threading
+import cv2
+import numpy as np
+from typing import Optional
+from .clock import Clock, real_clock
+
+
+class StuckWatchdog:
+    """
+    卡死看门狗.
+
+    记录画面指纹、当前状态类名和点击历史，当三者在设定的时间窗口内都没有变化时判定任务卡住，
+    并按 关闭弹窗 -> 重新打开活动 -> 重启任务 -> 放弃任务 的顺序逐级给出恢复动作。
+    """
+    ACTION_NONE = 0             # 无需处理
+    ACTION_CLOSE_POPUP = 1      # 关闭弹窗
+    ACTION_REOPEN_ACTIVITY = 2  # 重新打开活动
+    ACTION_RESTART_TASK = 3     # 重启任务
+    ACTION_ABORT = 4            # 放弃任务
+
+    ACTION_NAMES = {
+        ACTION_CLOSE_POPUP: "关闭弹窗",
+        ACTION_REOPEN_ACTIVITY: "重新打开活动",
+        ACTION_RESTART_TASK: "重启任务",
+        ACTION_ABORT: "放弃任务",
+    }
+
+    def __init__(self, stuck_timeout: float = 60, sample_interval: float = 0.5,
+                 diff_threshold: float = 4.0, fingerprint_size: tuple[int, int] = (32, 18), history_size: int = 3,
+                 clock: Clock = real_clock):
+        """
+        初始化看门狗.
+
+        Args:
+            stuck_timeout (float): 画面与决策均无变化多久后判定为卡住（秒），小于等于 0 表示关闭。
+            sample_interval (float): 画面指纹的最小采样间隔（秒），避免每次截图都计算。
+            diff_threshold (float): 画面指纹平均灰度差超过该值时视为画面发生变化。
+            fingerprint_size (tuple[int, int]): 画面指纹尺寸 (宽, 高)。
+            history_size (int): 点击历史长度，点击了不在历史中的模板才视为新的决策。
+            clock (Clock): 时钟对象。
+        """
+        self.stuck_timeout = stuck_timeout
+        self.sample_interval = sample_interval
+        self.diff_threshold = diff_threshold
+        self.fingerprint_size = fingerprint_size
+        self.history_size = history_size
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        重置所有记录，通常在任务开始时调用.
+        """
+        with self._lock:
+            self._fingerprint: Optional[np.ndarray] = None  # 上次画面变化时的指纹
+            self._last_sample_time = float("-inf")          # 上次采样时间
+            self._state_name: Optional[str] = None          # 当前状态类名
+            self._click_history: list[str] = []             # 最近点击的模板
+            self._last_change_time = self.clock.time()      # 最近一次检测到变化的时间
+            self._level = self.ACTION_NONE                  # 当前已升级到的恢复动作
+
+    def set_stuck_timeout(self, stuck_timeout: float):
+        """
+        设置卡住判定时间.
+
+        Args:
+            stuck_timeout (float): 判定时间（秒），小于等于 0 表示关闭。
+        """
+        self.stuck_timeout = stuck_timeout
+
+    def set_clock(self, clock: Clock):
+        """
+        设置时钟对象.
+
+        Args:
+            clock (Clock): 时钟对象。
+        """
+        self.clock = clock
+        self.reset()
+
+    def _touch(self):
+        """
+        记录一次变化，并把恢复等级清零.
+        """
+        self._last_change_time = self.clock.time()
+        self._level = self.ACTION_NONE
+
+    def feed_frame(self, frame: Optional[np.ndarray]):
+        """
+        输入一帧截图，计算画面指纹并与上次变化时的指纹比较.
+
+        Args:
+            frame (np.ndarray): 截图图像 (BGR)。
+        """
+        if frame is None or frame.size == 0:
+            return
+        now = self.clock.time()
+        if now - self._last_sample_time < self.sample_interval:
+            return
+        self._last_sample_time = now
+
+        small = cv2.resize(frame, self.fingerprint_size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        small = small.astype(np.int16)
+
+        with self._lock:
+            if self._fingerprint is None or self._fingerprint.shape != small.shape:
+                self._fingerprint = small
+                self._touch()
+                return
+            # 与上次变化时的指纹比较，缓慢的渐变最终也会被识别为变化
+            if float(np.mean(np.abs(small - self._fingerprint))) > self.diff_threshold:
+                self._fingerprint = small
+                self._touch()
+
+    def feed_state(self, state_name: Optional[str]):
+        """
+        输入当前状态类名，状态切换视为一次变化.
+
+        Args:
+            state_name (str | None): 状态类名。
+        """
+        with self._lock:
+            if state_name != self._state_name:
+                self._state_name = state_name
+                self._touch()
+
+    def feed_click(self, template_path: str):
+        """
+        输入一次点击，点击了最近没有点过的模板视为一次新的决策.
+
+        Args:
+            template_path (str): 被点击的模板路径。
+        """
+        with self._lock:
+            if template_path not in self._click_history:
+                self._touch()
+            self._click_history.append(template_path)
+            if len(self._click_history) > self.history_size:
+                self._click_history.pop(0)
+
+    def check(self) -> int:
+        """
+        检查是否卡住.
+
+        每次判定卡住后恢复等级升一级，并重新计时，给恢复动作留出生效的时间。
+
+        Returns:
+            int: 需要执行的恢复动作，未卡住返回 ACTION_NONE。
+        """
+        if not self.stuck_timeout or self.stuck_timeout <= 0:
+            return self.ACTION_NONE
+        with self._lock:
+            if self.clock.time() - self._last_change_time < self.stuck_timeout:
+                return self.ACTION_NONE
+            self._level = min(self._level + 1, self.ACTION_ABORT)
+            self._last_change_time = self.clock.time()
+            return self._level
+
+    def get_idle_time(self) -> float:
+        """
+        获取距离最近一次变化经过的时间.
+
+        Returns:
+            float: 秒数。
+        """
+        return self.clock.time() - self._last_change_time
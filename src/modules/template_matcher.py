@@ -1,8 +1,78 @@
 import cv2
 import numpy as np
+import threading
+from collections import OrderedDict
 from typing import Any, Dict, Optional, Tuple
 
 
+class ScaledTemplateCache:
+    """
+    缩放后模板的共享缓存。
+
+    同一模板在同一窗口尺寸下的缩放结果是固定的，所有窗口的 TemplateMatcher 共用这份缓存，
+    每个模板在每种缩放比例下只缩放一次。按最近使用淘汰，线程安全。
+    """
+    MAX_ENTRIES = 256 # 最多缓存的缩放模板数
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        """
+        Args:
+            max_entries (int): 最多缓存的缩放模板数。
+        """
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, template_path: str, template_gray: np.ndarray, template_mask: Optional[np.ndarray], scale_x: float, scale_y: float) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        获取缩放后的模板与掩模，未命中时缩放并缓存。
+
+        Args:
+            template_path (str): 模板路径，作为缓存键。
+            template_gray (np.ndarray): 模板灰度图。
+            template_mask (Optional[np.ndarray]): 模板掩模。
+            scale_x (float): 横向缩放比例。
+            scale_y (float): 纵向缩放比例。
+
+        Returns:
+            (Tuple[np.ndarray, Optional[np.ndarray]]): 缩放后的灰度模板与掩模。
+        """
+        key = (template_path, scale_x, scale_y)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        resized_template = cv2.resize(template_gray, None, fx=scale_x, fy=scale_y, interpolation=cv2.INTER_CUBIC)
+        resized_mask = None
+        if template_mask is not None:
+            resized_mask = cv2.resize(template_mask, None, fx=scale_x, fy=scale_y, interpolation=cv2.INTER_NEAREST)
+        entry = (resized_template, resized_mask)
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self):
+        """
+        清空缓存。
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+# 全局实例
+scaled_template_cache = ScaledTemplateCache()
+
+
 class TemplateMatcher:
     """
     模板匹配类。
@@ -120,6 +190,12 @@ class TemplateMatcher:
         h, w = self.template_gray.shape[:2]
         return {"path": self.template_path, "width": w, "height": h}
 
+    def _get_scaled(self, scale_x: float, scale_y: float) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        获取当前模板按给定比例缩放后的灰度图与掩模。
+        """
+        return scaled_template_cache.get(self.template_path, self.template_gray, self.template_mask, scale_x, scale_y)
+
     def match_scaled(self, screenshot: np.ndarray, threshold: float = 0.6, rect: Optional[Tuple[int, int, int, int]] = None, base_size: tuple = (2560, 1351), padding:int = 5) -> Tuple[Optional[Tuple[int, int]], float, Optional[Tuple[int, int]]]:
         """
         执行缩放模板匹配。
@@ -149,12 +225,8 @@ class TemplateMatcher:
         scale_y = h1 / base_size[1]
         # print(f"x缩放比例: {scale_x:.4f}, y缩放比例: {scale_y:.4f}, 截图尺寸: {w1}x{h1}")
 
-        # 缩放模板与掩模
-        resized_template = cv2.resize(self.template_gray, None, fx=scale_x, fy=scale_y, interpolation=cv2.INTER_CUBIC)
-        if hasattr(self, "template_mask") and self.template_mask is not None:
-            resized_mask = cv2.resize(self.template_mask, None, fx=scale_x, fy=scale_y, interpolation=cv2.INTER_NEAREST)
-        else:
-            resized_mask = None
+        # 缩放模板与掩模（共享缓存）
+        resized_template, resized_mask = self._get_scaled(scale_x, scale_y)
 
         th, tw = resized_template.shape[:2]
 
@@ -287,19 +359,74 @@ class TemplateMatcher:
             self.last_match = None
             return None, best_val, None
 
-    def visualize_match(self, screenshot: np.ndarray, last_match = None):
+    def verify_at(self, screenshot: np.ndarray, center: Tuple[int, int], threshold: float = 0.6, base_size: tuple = (2560, 1351), margin: int = 10) -> Tuple[Optional[Tuple[int, int]], float, Optional[Tuple[int, int]]]:
+        """
+        在预期位置校验模板。
+
+        只在以 center 为中心、模板大小加上 margin 的小区域内匹配，用于轨迹回放时快速确认界面是否符合预期。
+
+        Args:
+            screenshot (np.ndarray): 当前截图图像。
+            center (Tuple[int, int]): 预期的模板中心坐标（截图坐标系）。
+            threshold (float, optional): 匹配阈值，默认 0.6。
+            base_size (tuple, optional): 基准窗口尺寸 (宽度, 高度)。
+            margin (int, optional): 校验区域在模板四周额外扩展的像素，默认 10。
+
+        Returns:
+            匹配结果 (center, match_val, (tw, th))，格式与 match_scaled 相同。
+        """
+        if self.template_gray is None:
+            raise RuntimeError("未设置模板，请先调用 set_template()")
+
+        h1, w1 = screenshot.shape[:2]
+        scale_x = w1 / base_size[0]
+        scale_y = h1 / base_size[1]
+        resized_template, resized_mask = self._get_scaled(scale_x, scale_y)
+        th, tw = resized_template.shape[:2]
+
+        # 以预期中心为基准裁剪出模板大小的校验区域
+        x1 = max(0, center[0] - tw // 2 - margin)
+        y1 = max(0, center[1] - th // 2 - margin)
+        x2 = min(w1, center[0] + (tw - tw // 2) + margin)
+        y2 = min(h1, center[1] + (th - th // 2) + margin)
+        if x2 - x1 < tw or y2 - y1 < th:
+            self.last_match = None
+            return None, 0, None
+
+        region_gray = cv2.cvtColor(screenshot[y1:y2, x1:x2], cv2.COLOR_BGR2GRAY)
+        result = cv2.matchTemplate(region_gray, resized_template, self.method, mask=resized_mask)
+        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+        if self.method in [cv2.TM_SQDIFF, cv2.TM_SQDIFF_NORMED]:
+            match_val = 1 - min_val
+            match_loc = min_loc
+        else:
+            match_val = max_val
+            match_loc = max_loc
+
+        if match_val >= threshold and match_val != float('inf'):
+            found = (match_loc[0] + x1 + tw // 2, match_loc[1] + y1 + th // 2)
+            self.last_match = (found, match_val, (tw, th))
+            return found, match_val, (tw, th)
+        self.last_match = None
+        return None, match_val, None
+
+    def visualize_match(self, screenshot: np.ndarray, last_match = None) -> Optional[np.ndarray]:
         """
         可视化匹配结果。
 
-        在截图上绘制匹配区域的矩形框和相似度分数。
+        在截图副本上绘制匹配区域的矩形框和相似度分数并返回，不弹出窗口、不阻塞调用线程。
+        任务运行时实时查看匹配结果请使用多开页面的匹配预览（MatchOverlay）。
 
         Args:
             screenshot (np.ndarray): 截图图像。
             last_match (Tuple[Tuple[int, int], float, Tuple[int, int]], optional): 匹配结果 (center, match_val, (tw, th))，默认 None。
+
+        Returns:
+            Optional[np.ndarray]: 绘制后的图像，没有匹配结果时返回 None。
         """
         if not self.last_match and not last_match:
             print("尚未找到匹配结果，请先调用匹配方法。")
-            return
+            return None
         if last_match == None:
             center, score, (tw, th) = self.last_match  # type: ignore
         else:
@@ -312,6 +439,4 @@ class TemplateMatcher:
         cv2.rectangle(img_show, top_left, bottom_right, (0, 255, 0), 2)
         cv2.putText(img_show, f"{score:.2f}", (top_left[0], top_left[1] - 10),
                     cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
-        cv2.imshow("Template Match", img_show)
-        cv2.waitKey(0)
-        cv2.destroyAllWindows()
+        return img_show
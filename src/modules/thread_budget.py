@@ -0,0 +1,121 @@
+import os
+from .match_pool import match_pool
+
+
+class ThreadBudget:
+    """
+    全局线程预算.
+
+    OpenCV 内部线程池、ONNX Runtime（OCR）和共享匹配线程池默认都按 CPU 核数创建线程，
+    多开时叠加起来远超核数，线程互相抢占反而更慢。这里按一个总预算和当前实例数统一分配：
+    - 匹配线程数：实例多时多开线程并行匹配，实例少时少开线程；
+    - OpenCV 线程数：预算平分给各匹配线程，单次 matchTemplate 不再各自占满所有核；
+    - ONNX Runtime 线程数：预算平分给各实例。
+    """
+
+    def __init__(self, budget: int = 0, match_workers: int = 0):
+        """
+        Args:
+            budget (int): 总线程预算，小于等于 0 时使用 CPU 核数。
+            match_workers (int): 固定的匹配线程数，小于等于 0 时按预算自动分配。
+        """
+        self.instances = 1
+        self.configure(budget, match_workers)
+        self._plan = self.plan(self.instances)
+
+    def configure(self, budget: int = 0, match_workers: int = 0):
+        """
+        设置预算，下次 apply() 时生效.
+
+        Args:
+            budget (int): 总线程预算，小于等于 0 时使用 CPU 核数。
+            match_workers (int): 固定的匹配线程数，小于等于 0 时按预算自动分配。
+        """
+        self._budget = int(budget) if budget and budget > 0 else max(1, os.cpu_count() or 1)
+        self._match_workers = int(match_workers) if match_workers and match_workers > 0 else 0
+
+    @property
+    def budget(self) -> int:
+        """
+        总线程预算.
+        """
+        return self._budget
+
+    def plan(self, instances: int) -> dict:
+        """
+        计算给定实例数下的线程分配.
+
+        Args:
+            instances (int): 同时运行的实例数。
+
+        Returns:
+            dict: budget, instances, match_workers, cv2_threads, ort_intra_op, ort_inter_op。
+        """
+        instances = max(1, instances)
+        workers = self._match_workers or min(self._budget, instances)
+        return {
+            "budget": self._budget,
+            "instances": instances,
+            "match_workers": workers,
+            "cv2_threads": max(1, self._budget // workers),
+            "ort_intra_op": max(1, self._budget // instances),
+            "ort_inter_op": 1,
+        }
+
+    def apply(self, instances: int | None = None) -> dict:
+        """
+        按实例数重新分配并设置各运行时的线程数.
+
+        Args:
+            instances (int | None): 同时运行的实例数，为 None 时沿用上次的实例数。
+
+        Returns:
+            dict: 生效的线程分配，见 plan()。
+        """
+        if instances is not None:
+            self.instances = max(1, instances)
+        plan = self.plan(self.instances)
+        try:
+            import cv2
+            cv2.setNumThreads(plan["cv2_threads"])
+        except Exception as e:
+            print(f"设置 OpenCV 线程数失败: {e}")
+        match_pool.set_workers(plan["match_workers"])
+        # 只对之后创建的 ONNX Runtime 会话生效，OCRMatcher 创建引擎前会读取 ort_options()
+        os.environ["OMP_NUM_THREADS"] = str(plan["ort_intra_op"])
+        self._plan = plan
+        return plan
+
+    def get_plan(self) -> dict:
+        """
+        获取当前生效的线程分配.
+        """
+        return dict(self._plan)
+
+    def ort_options(self) -> dict:
+        """
+        创建 ONNX Runtime 会话时使用的线程参数.
+
+        Returns:
+            dict: intra_op_num_threads, inter_op_num_threads。
+        """
+        return {
+            "intra_op_num_threads": self._plan["ort_intra_op"],
+            "inter_op_num_threads": self._plan["ort_inter_op"],
+        }
+
+    def process_budget(self, processes: int) -> int:
+        """
+        进程模式下每个子进程分到的预算.
+
+        Args:
+            processes (int): 子进程数。
+
+        Returns:
+            int: 每个子进程的线程预算。
+        """
+        return max(1, self._budget // max(1, processes))
+
+
+# 全局实例
+thread_budget = ThreadBudget()
@@ -0,0 +1,153 @@
+import os
+import json
+import threading
+from typing import Optional
+
+
+class TrajectoryStore:
+    """
+    点击轨迹存储.
+
+    保存任务最近一次成功运行时的点击轨迹（模板、点击位置、点击间隔、窗口尺寸），
+    供下次运行时按轨迹回放。轨迹按 任务名 + 窗口尺寸 区分，窗口尺寸变化后轨迹自动失效。
+    回放连续失败的次数只记在内存中，达到上限时删除轨迹。
+    """
+
+    def __init__(self, file_path: str = "trajectories.json"):
+        """
+        初始化轨迹存储.
+
+        Args:
+            file_path (str): 轨迹文件路径。
+        """
+        self.file_path = os.path.abspath(file_path)
+        self._trajectories: dict[str, list[dict]] = {}
+        self._failures: dict[str, int] = {}     # 每条轨迹回放连续失败的次数
+        self._lock = threading.Lock()
+        self.load()
+
+    @staticmethod
+    def make_key(task_name: str, window_size: tuple[int, int]) -> str:
+        """
+        生成轨迹键.
+
+        Args:
+            task_name (str): 任务名称。
+            window_size (tuple[int, int]): 窗口尺寸 (宽, 高)。
+
+        Returns:
+            str: 轨迹键，如 "论剑@1600x900"。
+        """
+        return f"{task_name}@{window_size[0]}x{window_size[1]}"
+
+    def set_file_path(self, file_path: str):
+        """
+        切换轨迹文件并重新加载，模拟器压测时用于隔离真实的记录.
+
+        Args:
+            file_path (str): 轨迹文件路径。
+        """
+        self.file_path = os.path.abspath(file_path)
+        with self._lock:
+            self._trajectories = {}
+            self._failures = {}
+        self.load()
+
+    def load(self):
+        """
+        从文件加载轨迹.
+        """
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            with self._lock:
+                self._trajectories = data
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"加载点击轨迹失败: {e}")
+
+    def save(self):
+        """
+        保存轨迹到文件.
+        """
+        try:
+            with self._lock:
+                data = dict(self._trajectories)
+            with open(self.file_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=4, ensure_ascii=False)
+        except Exception as e:
+            print(f"保存点击轨迹失败: {e}")
+
+    def get(self, key: str) -> Optional[list[dict]]:
+        """
+        获取轨迹.
+
+        Args:
+            key (str): 轨迹键。
+
+        Returns:
+            list[dict] | None: 轨迹步骤列表，每一步包含 key, path, center, size, delay。
+        """
+        with self._lock:
+            steps = self._trajectories.get(key)
+            return list(steps) if steps else None
+
+    def put(self, key: str, steps: list[dict]):
+        """
+        保存一条成功的轨迹.
+
+        Args:
+            key (str): 轨迹键。
+            steps (list[dict]): 轨迹步骤列表。
+        """
+        with self._lock:
+            self._trajectories[key] = steps
+        self.save()
+
+    def invalidate(self, key: str):
+        """
+        删除一条轨迹.
+
+        Args:
+            key (str): 轨迹键。
+        """
+        with self._lock:
+            removed = self._trajectories.pop(key, None)
+        if removed is not None:
+            self.save()
+
+
+    def record_failure(self, key: str, limit: int) -> bool:
+        """
+        记录一次回放失败，连续失败达到 limit 次时删除轨迹.
+
+        Args:
+            key (str): 轨迹键。
+            limit (int): 连续失败多少次后删除轨迹。
+
+        Returns:
+            bool: 轨迹被删除时返回 True。
+        """
+        with self._lock:
+            failures = self._failures.get(key, 0) + 1
+            if failures < limit:
+                self._failures[key] = failures
+                return False
+            self._failures.pop(key, None)
+        self.invalidate(key)
+        return True
+
+    def record_success(self, key: str):
+        """
+        记录一次完整的回放，清零连续失败次数.
+
+        Args:
+            key (str): 轨迹键。
+        """
+        with self._lock:
+            self._failures.pop(key, None)
+
+
+# 全局实例
+trajectory_store = TrajectoryStore()
@@ -6,9 +6,10 @@ import numpy as np
 from cv2 import cvtColor, COLOR_BGRA2BGR, imwrite
 import os
 from typing import Optional, Tuple
+from .interfaces import FrameSource
 
 
-class WindowCapture:
+class WindowCapture(FrameSource):
     """
     捕获指定窗口画面.
     """
@@ -29,6 +30,17 @@ class WindowCapture:
         """
         self.hwnd = hwnd
 
+    def is_window_valid(self) -> bool:
+        """
+        检查目标窗口是否存在且可见.
+
+        Returns:
+            bool: 窗口有效返回 True，否则返回 False
+        """
+        if not self.hwnd:
+            return False
+        return bool(win32gui.IsWindow(self.hwnd) and win32gui.IsWindowVisible(self.hwnd))
+
     def get_window_size(self) -> Optional[Tuple[int, int]]:
         """
         获取窗口尺寸.
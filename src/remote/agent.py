@@ -0,0 +1,375 @@
+import json
+import hmac
+import secrets
+import ipaddress
+import signal
+import argparse
+import threading
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from PySide6.QtCore import QObject, Signal, QCoreApplication, QTimer
+from ..ui.core.mutiple_manager import MultipleProcessManager
+from ..ui.models.task_cfg_model import task_cfg_model
+from ..ui.core.logger import logger
+
+
+class AgentError(Exception):
+    """
+    请求无法处理，携带返回给调用方的 HTTP 状态码.
+    """
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Agent(QObject):
+    """
+    单机代理.
+
+    包装一个 MultipleProcessManager，通过 HTTP 接口对外提供添加/启动/停止/暂停/查询状态，
+    协调器（Coordinator）可以同时控制多台机器上的代理。
+    HTTP 请求在服务线程中接收，对管理器的调用统一转到 Qt 主线程执行，与界面操作的线程模型一致。
+
+    接口（请求和响应都是 JSON）：
+    - GET    /status                    所有实例的状态
+    - GET    /windows?title=xxx         查找标题匹配的窗口句柄，默认使用配置中的窗口标题
+    - POST   /items                     添加实例 {"hwnd", "name", "tasks"}
+    - DELETE /items/<hwnd>              移除实例
+    - POST   /items/<hwnd>/<action>     action 为 start / stop / pause / resume
+    - POST   /start_all                 错开启动全部实例，可选 {"stagger": 秒}
+    - POST   /stop_all, /pause_all, /resume_all
+    """
+    CALL_TIMEOUT = 10 # 等待主线程处理请求的时间（秒）
+    _invoke = Signal(object)
+
+    def __init__(self, manager: MultipleProcessManager, name: str = "", token: str = ""):
+        """
+        Args:
+            manager (MultipleProcessManager): 被代理的多开管理器。
+            name (str): 代理名称，在协调器中区分不同机器。
+            token (str): 访问令牌，非空时请求需带 "Authorization: Bearer <token>"。
+        """
+        super().__init__()
+        self.manager = manager
+        self.name = name
+        self.token = token
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+        # 从服务线程发出，在主线程中执行
+        self._invoke.connect(self._run_call)
+
+    # --- 服务 ---
+    def serve(self, host: str = "127.0.0.1", port: int = 8765) -> tuple[str, int]:
+        """
+        在后台线程中启动 HTTP 服务.
+
+        监听本机以外的地址时必须有访问令牌，没有设置时自动生成一个并打印到控制台。
+
+        Args:
+            host (str): 监听地址，默认只监听本机。
+            port (int): 监听端口，0 表示自动分配。
+
+        Returns:
+            tuple[str, int]: 实际监听的地址和端口。
+        """
+        if not self.token and not _is_loopback(host):
+            self.token = secrets.token_urlsafe(16)
+            # 没有界面时只有控制台能看到，直接打印出来
+            print(f"监听 {host} 时未设置访问令牌，已自动生成: {self.token}")
+            logger.warning(f"监听 {host} 时未设置访问令牌，已自动生成访问令牌", mode=1)
+        agent = self
+
+        class Handler(_AgentRequestHandler):
+            pass
+        Handler.agent = agent
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="AgentServer", daemon=True)
+        self._thread.start()
+        address = self._server.server_address[:2]
+        logger.info(f"代理 {self.name or ''} 已在 http://{address[0]}:{address[1]} 监听", mode=1)
+        return address # type: ignore
+
+    def shutdown(self):
+        """
+        停止 HTTP 服务.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def check_token(self, header: str | None) -> bool:
+        """
+        校验请求头中的访问令牌.
+        """
+        if not self.token:
+            return True
+        return hmac.compare_digest(header or "", f"Bearer {self.token}")
+
+    def call(self, fn, *args):
+        """
+        在主线程中执行 fn 并等待结果（在服务线程中调用）.
+
+        Raises:
+            AgentError: 主线程处理超时。
+        """
+        future = Future()
+        self._invoke.emit((future, fn, args))
+        try:
+            return future.result(self.CALL_TIMEOUT)
+        except TimeoutError:
+            raise AgentError(503, "代理主线程无响应")
+
+    def _run_call(self, call):
+        """
+        主线程中执行服务线程提交的调用.
+        """
+        future, fn, args = call
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    # --- 请求处理（主线程） ---
+    def handle(self, method: str, path: str, query: dict, body: dict) -> dict:
+        """
+        分发一个请求.
+
+        Args:
+            method (str): HTTP 方法。
+            path (str): 请求路径。
+            query (dict): 查询参数。
+            body (dict): 请求体。
+
+        Returns:
+            dict: 响应内容。
+
+        Raises:
+            AgentError: 路径不存在或参数错误。
+        """
+        parts = [p for p in path.split("/") if p]
+        if method == "GET" and parts == ["status"]:
+            return self.get_status()
+        if method == "GET" and parts == ["windows"]:
+            title = query.get("title", [task_cfg_model.task_cfg.get("window_title", "")])[0]
+            return {"windows": self.manager.get_target_window_handles(title)}
+        if method == "POST" and parts == ["items"]:
+            return self.add_item(body)
+        if len(parts) >= 2 and parts[0] == "items":
+            item = self._get_item(parts[1])
+            if method == "DELETE" and len(parts) == 2:
+                self.manager.remove_item(item.handle)
+                return {"removed": item.handle}
+            if method == "POST" and len(parts) == 3:
+                return self.item_action(item, parts[2])
+        if method == "POST" and len(parts) == 1 and parts[0] in ("start_all", "stop_all", "pause_all", "resume_all"):
+            return self.all_action(parts[0], body)
+        raise AgentError(404, f"未知接口: {method} {path}")
+
+    def _get_item(self, hwnd_text: str):
+        """
+        按句柄查找实例.
+
+        Raises:
+            AgentError: 句柄格式错误或实例不存在。
+        """
+        try:
+            hwnd = int(hwnd_text, 0)
+        except ValueError:
+            raise AgentError(400, f"无效的窗口句柄: {hwnd_text}")
+        item = self.manager.get_item(hwnd)
+        if item is None:
+            raise AgentError(404, f"实例不存在: {hwnd}")
+        return item
+
+    def describe_item(self, item) -> dict:
+        """
+        实例状态.
+        """
+        status = item._status_cache
+        return {
+            "hwnd": item.handle,
+            "name": item.name,
+            "tasks": self.manager.get_process_task_list(item.handle),
+            "status": status["overall_status"],
+            "current_task": status["current_task"],
+            "progress": status["progress"],
+            "paused": status["is_paused"],
+            "running": item.runner.is_running(),
+            "pending_start": self.manager.has_pending_start(item.handle),
+        }
+
+    def get_status(self) -> dict:
+        """
+        所有实例的状态.
+        """
+        return {
+            "agent": self.name,
+            "items": [self.describe_item(item) for item in self.manager.get_all_items().values()],
+            "governor": self.manager.governor.get_stats(),
+        }
+
+    def add_item(self, body: dict) -> dict:
+        """
+        添加实例.
+
+        Raises:
+            AgentError: 参数错误或创建失败。
+        """
+        try:
+            hwnd = int(body["hwnd"])
+        except (KeyError, TypeError, ValueError):
+            raise AgentError(400, "缺少有效的 hwnd")
+        tasks = body.get("tasks") or []
+        if not isinstance(tasks, list):
+            raise AgentError(400, "tasks 必须是任务名称列表")
+        item = self.manager.add_item(hwnd, body.get("name", "") or str(hwnd), tasks=tasks)
+        if item is None:
+            raise AgentError(500, f"创建实例失败: {hwnd}")
+        return self.describe_item(item)
+
+    def item_action(self, item, action: str) -> dict:
+        """
+        对单个实例执行操作.
+
+        Raises:
+            AgentError: 操作不存在。
+        """
+        if action == "start":
+            self.manager.start_item(item)
+        elif action == "stop":
+            self.manager.stop_item(item)
+        elif action == "pause":
+            item.pause_process()
+        elif action == "resume":
+            item.resume_process()
+        else:
+            raise AgentError(404, f"未知操作: {action}")
+        return self.describe_item(item)
+
+    def all_action(self, action: str, body: dict) -> dict:
+        """
+        对全部实例执行操作.
+        """
+        items = list(self.manager.get_all_items().values())
+        if action == "start_all":
+            self.manager.start_all([item for item in items if not item.runner.is_running()], stagger=body.get("stagger"))
+        elif action == "stop_all":
+            self.manager.cancel_pending_starts()
+            for item in items:
+                self.manager.stop_item(item)
+        elif action == "pause_all":
+            for item in items:
+                item.pause_process()
+        elif action == "resume_all":
+            for item in items:
+                item.resume_process()
+        return self.get_status()
+
+
+class _AgentRequestHandler(BaseHTTPRequestHandler):
+    """
+    代理的 HTTP 请求处理，agent 由 Agent.serve() 设置.
+    """
+    agent: Agent
+    server_version = "YmjhAgent/1.0"
+
+    def _dispatch(self, method: str):
+        url = urlparse(self.path)
+        try:
+            if not self.agent.check_token(self.headers.get("Authorization")):
+                raise AgentError(401, "访问令牌错误")
+            body = {}
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                try:
+                    body = json.loads(self.rfile.read(length).decode("utf-8"))
+                except ValueError:
+                    raise AgentError(400, "请求体不是有效的 JSON")
+                if not isinstance(body, dict):
+                    raise AgentError(400, "请求体必须是 JSON 对象")
+            result = self.agent.call(self.agent.handle, method, url.path, parse_qs(url.query), body)
+            self._reply(200, result)
+        except AgentError as e:
+            self._reply(e.status, {"error": str(e)})
+        except Exception as e:
+            logger.error(f"代理处理请求出错: {method} {self.path}: {e}", mode=1)
+            self._reply(500, {"error": str(e)})
+
+    def _reply(self, status: int, data: dict):
+        payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def log_message(self, format, *args):
+        # 访问日志不写入脚本日志
+        pass
+
+
+def _is_loopback(host: str) -> bool:
+    """
+    监听地址是否只能从本机访问.
+    """
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def main():
+    """
+    命令行入口: python -m src.remote.agent --port 8765 [--sim 4]
+    """
+    parser = argparse.ArgumentParser(description="多开代理，通过 HTTP 接口控制本机的多开实例")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址，允许其它机器访问时设为 0.0.0.0")
+    parser.add_argument("--port", type=int, default=8765, help="监听端口")
+    parser.add_argument("--name", default="", help="代理名称")
+    parser.add_argument("--token", default="", help="访问令牌，只监听本机时为空则不校验，监听其它地址时为空则自动生成")
+    parser.add_argument("--sim", type=int, default=0, help="创建指定数量的模拟窗口代替游戏客户端，用于本机测试")
+    parser.add_argument("--scenario", default="一梦江湖", help="模拟窗口的场景名称")
+    args = parser.parse_args()
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    desktop = None
+    if args.sim > 0:
+        from ..simulator.desktop import SimDesktop, isolate_records
+        isolate_records("ymjh_agent_")
+        desktop = SimDesktop(execution_mode=task_cfg_model.task_cfg.get("execution_mode", "thread"))
+        for _ in range(args.sim):
+            desktop.create_window(args.scenario)
+    manager = MultipleProcessManager(desktop=desktop)
+    agent = Agent(manager, name=args.name, token=args.token)
+    agent.serve(args.host, args.port)
+    # Qt 事件循环中 Python 收不到 Ctrl+C，定时让出控制权处理信号
+    signal.signal(signal.SIGINT, lambda *_: app.quit())
+    timer = QTimer()
+    timer.timeout.connect(lambda: None)
+    timer.start(500)
+    try:
+        app.exec()
+    finally:
+        agent.shutdown()
+
+
+if __name__ == "__main__":
+    main()
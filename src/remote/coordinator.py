@@ -0,0 +1,233 @@
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from urllib import request as urlrequest
+from urllib.error import HTTPError, URLError
+
+
+class AgentClient:
+    """
+    单个代理的 HTTP 客户端.
+    """
+
+    def __init__(self, url: str, token: str = "", timeout: float = 10):
+        """
+        Args:
+            url (str): 代理地址，如 http://192.168.1.10:8765。
+            token (str): 访问令牌。
+            timeout (float): 请求超时时间（秒）。
+        """
+        self.url = url.rstrip("/")
+        self.token = token
+        self.timeout = timeout
+
+    def request(self, method: str, path: str, body: dict | None = None) -> dict:
+        """
+        发送请求.
+
+        Args:
+            method (str): HTTP 方法。
+            path (str): 接口路径。
+            body (dict | None): 请求体。
+
+        Returns:
+            dict: 响应内容。
+
+        Raises:
+            RuntimeError: 代理不可达或返回错误。
+        """
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8") if body is not None else None
+        req = urlrequest.Request(self.url + path, data=data, method=method)
+        req.add_header("Content-Type", "application/json; charset=utf-8")
+        if self.token:
+            req.add_header("Authorization", f"Bearer {self.token}")
+        try:
+            with urlrequest.urlopen(req, timeout=self.timeout) as resp:
+                return json.loads(resp.read().decode("utf-8"))
+        except HTTPError as e:
+            try:
+                message = json.loads(e.read().decode("utf-8")).get("error", e.reason)
+            except ValueError:
+                message = e.reason
+            raise RuntimeError(f"{self.url}: {e.code} {message}")
+        except URLError as e:
+            raise RuntimeError(f"{self.url}: 无法连接 ({e.reason})")
+
+    def status(self) -> dict:
+        """
+        获取代理上所有实例的状态.
+        """
+        return self.request("GET", "/status")
+
+    def windows(self, title: str | None = None) -> list[int]:
+        """
+        查找代理所在机器上标题匹配的窗口句柄.
+        """
+        path = "/windows" if title is None else f"/windows?title={urlrequest.quote(title)}"
+        return self.request("GET", path)["windows"]
+
+    def add(self, hwnd: int, tasks: list[str], name: str = "") -> dict:
+        """
+        添加实例.
+        """
+        return self.request("POST", "/items", {"hwnd": hwnd, "name": name, "tasks": tasks})
+
+    def remove(self, hwnd: int) -> dict:
+        """
+        移除实例.
+        """
+        return self.request("DELETE", f"/items/{hwnd}")
+
+    def action(self, hwnd: int, action: str) -> dict:
+        """
+        对单个实例执行 start / stop / pause / resume.
+        """
+        return self.request("POST", f"/items/{hwnd}/{action}", {})
+
+    def action_all(self, action: str, body: dict | None = None) -> dict:
+        """
+        对全部实例执行 start_all / stop_all / pause_all / resume_all.
+        """
+        return self.request("POST", f"/{action}", body or {})
+
+
+class Coordinator:
+    """
+    多机协调器.
+
+    同时向多个代理发送请求并汇总结果，某台机器不可达时只在它的结果中记录错误，不影响其它机器。
+    """
+
+    def __init__(self, agents: dict[str, AgentClient]):
+        """
+        Args:
+            agents (dict[str, AgentClient]): 代理名称 -> 客户端。
+        """
+        self.agents = agents
+
+    @classmethod
+    def from_urls(cls, urls: list[str], token: str = "", timeout: float = 10) -> "Coordinator":
+        """
+        按地址列表创建协调器，代理名称即地址.
+        """
+        return cls({url: AgentClient(url, token, timeout) for url in urls})
+
+    def _each(self, fn) -> dict:
+        """
+        并发地对每个代理调用 fn(client).
+
+        Returns:
+            dict: 代理名称 -> 结果，出错时为 {"error": 错误信息}。
+        """
+        def run(item):
+            name, client = item
+            try:
+                return name, fn(client)
+            except Exception as e:
+                return name, {"error": str(e)}
+        if not self.agents:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(32, len(self.agents))) as executor:
+            return dict(executor.map(run, self.agents.items()))
+
+    def status(self) -> dict:
+        """
+        所有代理的状态.
+        """
+        return self._each(lambda client: client.status())
+
+    def summary(self) -> dict:
+        """
+        汇总所有代理的实例数和各状态的数量.
+
+        Returns:
+            dict: agents(代理数), unreachable(不可达的代理), instances(实例总数), status(状态 -> 数量)。
+        """
+        result = {"agents": len(self.agents), "unreachable": [], "instances": 0, "status": {}}
+        for name, status in self.status().items():
+            if "error" in status:
+                result["unreachable"].append(name)
+                continue
+            for item in status["items"]:
+                result["instances"] += 1
+                result["status"][item["status"]] = result["status"].get(item["status"], 0) + 1
+        return result
+
+    def add_windows(self, tasks: list[str], title: str | None = None) -> dict:
+        """
+        让每个代理把本机找到的所有游戏窗口添加为实例.
+
+        Args:
+            tasks (list[str]): 任务名称列表。
+            title (str | None): 窗口标题，默认使用各代理配置中的窗口标题。
+
+        Returns:
+            dict: 代理名称 -> {"added": 新添加的句柄列表}。
+        """
+        def add(client: AgentClient):
+            existing = {item["hwnd"] for item in client.status()["items"]}
+            added = []
+            for hwnd in client.windows(title):
+                if hwnd not in existing:
+                    client.add(hwnd, tasks)
+                    added.append(hwnd)
+            return {"added": added}
+        return self._each(add)
+
+    def start_all(self, stagger: float | None = None) -> dict:
+        """
+        错开启动所有代理上未运行的实例.
+        """
+        body = {} if stagger is None else {"stagger": stagger}
+        return self._each(lambda client: client.action_all("start_all", body))
+
+    def stop_all(self) -> dict:
+        """
+        停止所有代理上的实例.
+        """
+        return self._each(lambda client: client.action_all("stop_all"))
+
+    def pause_all(self) -> dict:
+        """
+        暂停所有代理上的实例.
+        """
+        return self._each(lambda client: client.action_all("pause_all"))
+
+    def resume_all(self) -> dict:
+        """
+        恢复所有代理上的实例.
+        """
+        return self._each(lambda client: client.action_all("resume_all"))
+
+
+def main():
+    """
+    命令行入口: python -m src.remote.coordinator --agent http://127.0.0.1:8765 status
+    """
+    parser = argparse.ArgumentParser(description="同时控制多台机器上的多开代理")
+    parser.add_argument("--agent", action="append", required=True, help="代理地址，可重复指定")
+    parser.add_argument("--token", default="", help="访问令牌")
+    parser.add_argument("--timeout", type=float, default=10, help="请求超时时间（秒）")
+    parser.add_argument("command", choices=["status", "summary", "add", "start", "stop", "pause", "resume"],
+                        help="add 为添加各机器上的所有游戏窗口")
+    parser.add_argument("--tasks", nargs="+", default=["日常副本"], help="add 时使用的任务名称列表")
+    parser.add_argument("--title", default=None, help="add 时查找的窗口标题，默认使用代理的配置")
+    parser.add_argument("--stagger", type=float, default=None, help="start 时相邻两个窗口的启动间隔（秒）")
+    args = parser.parse_args()
+
+    coordinator = Coordinator.from_urls(args.agent, args.token, args.timeout)
+    if args.command == "status":
+        result = coordinator.status()
+    elif args.command == "summary":
+        result = coordinator.summary()
+    elif args.command == "add":
+        result = coordinator.add_windows(args.tasks, args.title)
+    elif args.command == "start":
+        result = coordinator.start_all(args.stagger)
+    else:
+        result = getattr(coordinator, f"{args.command}_all")()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+import os
+import re
+import tempfile
+import threading
+from typing import Optional
+from PySide6.QtCore import QObject, Signal
+from ..modules.clock import VirtualClock, real_clock
+from ..modules.dwell_model import dwell_model
+from ..modules.trajectory import trajectory_store
+from ..modules.replay_capture import RecordingCapture
+from ..ui.core.task_runner import TaskRunner
+from .scenarios import SCENARIOS
+from .sim_window import SimWindow
+from .sim_devices import SimCapture, SimClicker
+
+
+def isolate_records(prefix: str = "ymjh_sim_") -> str:
+    """
+    把停留时间和点击轨迹的记录切换到新建的临时目录.
+
+    模拟和回放时任务看到的不是真实窗口，学到的停留时间和轨迹不能写进真实窗口使用的记录。
+
+    Args:
+        prefix (str): 临时目录名前缀。
+
+    Returns:
+        str: 临时目录路径。
+    """
+    record_dir = tempfile.mkdtemp(prefix=prefix)
+    dwell_model.set_file_path(os.path.join(record_dir, "dwell_times.json"))
+    trajectory_store.set_file_path(os.path.join(record_dir, "trajectories.json"))
+    return record_dir
+
+
+class SimDesktop:
+    """
+    模拟桌面.
+
+    管理多个模拟窗口并为它们分配句柄，同时提供与真实环境相同的 WindowManager / TaskRunner，
+    传给 MultipleProcessManager 或 ProcessItem 后即可在没有游戏客户端的环境中运行和压测任务。
+    """
+    FIRST_HWND = 0x10000 # 第一个模拟窗口的句柄
+
+    def __init__(self, window_size: tuple[int, int] = (1280, 720), virtual_time: bool = True, seed: int = 0,
+                 execution_mode: str = "thread", record_dir: Optional[str] = None):
+        """
+        初始化模拟桌面.
+
+        Args:
+            window_size (tuple[int, int]): 默认窗口尺寸 (宽, 高)。
+            virtual_time (bool): 是否为每个窗口使用独立的虚拟时钟，为 False 时使用真实时间。
+            seed (int): 随机种子，每个窗口在此基础上加上序号。
+            execution_mode (str): 执行器类型，"thread" 为每个窗口一个线程，"coop" 为共用协作式调度线程，"async" 为共用 asyncio 事件循环。
+            record_dir (str | None): 录制目录，设置后每个执行器把任务看到的画面录制到其中以窗口句柄命名的子目录，
+                供 ReplayCapture 回放。
+        """
+        self.window_size = window_size
+        self.virtual_time = virtual_time
+        self.seed = seed
+        self.execution_mode = execution_mode
+        self.record_dir = record_dir
+        self._windows: dict[int, SimWindow] = {}
+        self._next_hwnd = self.FIRST_HWND
+        self._lock = threading.Lock()
+
+    def create_window(self, scenario: str = "一梦江湖", title: Optional[str] = None,
+                      window_size: Optional[tuple[int, int]] = None) -> int:
+        """
+        创建一个模拟窗口.
+
+        Args:
+            scenario (str): 场景名称，见 scenarios.SCENARIOS。
+            title (str | None): 窗口标题，默认为 "一梦江湖 #序号"。
+            window_size (tuple[int, int] | None): 窗口尺寸，默认使用桌面的默认尺寸。
+
+        Returns:
+            int: 模拟窗口句柄。
+
+        Raises:
+            ValueError: 场景不存在。
+        """
+        if scenario not in SCENARIOS:
+            raise ValueError(f"未知的模拟场景: {scenario}")
+        with self._lock:
+            hwnd = self._next_hwnd
+            self._next_hwnd += 1
+            index = hwnd - self.FIRST_HWND
+            clock = VirtualClock() if self.virtual_time else real_clock
+            window = SimWindow(hwnd, title or f"一梦江湖 #{index + 1}", SCENARIOS[scenario](),
+                               window_size or self.window_size, clock, self.seed + index)
+            self._windows[hwnd] = window
+        return hwnd
+
+    def get_window(self, hwnd: Optional[int]) -> Optional[SimWindow]:
+        """
+        获取模拟窗口.
+
+        Args:
+            hwnd (int | None): 窗口句柄。
+
+        Returns:
+            SimWindow | None: 模拟窗口，不存在返回 None。
+        """
+        if hwnd is None:
+            return None
+        with self._lock:
+            return self._windows.get(hwnd)
+
+    def get_all_windows(self) -> list[SimWindow]:
+        """
+        获取所有模拟窗口.
+        """
+        with self._lock:
+            return list(self._windows.values())
+
+    def close_window(self, hwnd: int):
+        """
+        关闭模拟窗口.
+
+        Args:
+            hwnd (int): 窗口句柄。
+        """
+        window = self.get_window(hwnd)
+        if window is not None:
+            window.close()
+
+    def get_windows_by_filter(self, title_pattern: str) -> list[int]:
+        """
+        查找所有标题符合规则的模拟窗口，与 WindowManager.get_windows_by_filter 对应.
+
+        Args:
+            title_pattern (str): 标题关键词或正则表达式。
+
+        Returns:
+            list[int]: 窗口句柄列表。
+        """
+        return [window.hwnd for window in self.get_all_windows()
+                if window.alive and re.search(title_pattern, window.title, re.IGNORECASE)]
+
+    def create_window_manager(self, log_mode: int = 0) -> "SimWindowManager":
+        """
+        创建连接模拟窗口的窗口管理器.
+        """
+        return SimWindowManager(self, log_mode)
+
+    def create_runner(self, hwnd: int, log_mode: int = 0, record_dir: Optional[str] = None) -> TaskRunner:
+        """
+        创建运行在模拟窗口上的任务执行器，时钟与窗口一致.
+
+        Args:
+            hwnd (int): 窗口句柄。
+            log_mode (int): 日志模式。
+            record_dir (str | None): 画面录制目录，默认为桌面录制目录下以窗口句柄命名的子目录，都没有设置时不录制。
+
+        Returns:
+            TaskRunner: 任务执行器。
+        """
+        window = self.get_window(hwnd)
+        clock = window.clock if window is not None else real_clock
+        if record_dir is None and self.record_dir is not None:
+            record_dir = os.path.join(self.record_dir, str(hwnd))
+        wincap = SimCapture(self)
+        if record_dir is not None:
+            wincap = RecordingCapture(wincap, record_dir, clock=clock)
+        if self.execution_mode == "coop":
+            from ..ui.core.coop_runner import CoopRunner
+            return CoopRunner(log_mode, wincap=wincap, clicker=SimClicker(self), clock=clock)
+        if self.execution_mode == "async":
+            from ..ui.core.async_runner import AsyncTaskRunner
+            return AsyncTaskRunner(log_mode, wincap=wincap, clicker=SimClicker(self), clock=clock)
+        return TaskRunner(log_mode, wincap=wincap, clicker=SimClicker(self), clock=clock)
+
+
+class SimWindowManager(QObject):
+    """
+    模拟窗口管理器，接口与 WindowManager 相同.
+    """
+    connected = Signal(int, str)  # 成功连接 (hwnd, title)
+    disconnected = Signal()       # 连接断开/未找到
+
+    def __init__(self, desktop: SimDesktop, log_mode: int = 0):
+        super().__init__()
+        self.desktop = desktop
+        self.hwnd = None
+        self.window_title = ""
+        self.log_mode = log_mode
+
+    def connect_by_title(self, title_pattern: str) -> bool:
+        handles = self.desktop.get_windows_by_filter(title_pattern)
+        if not handles:
+            self.hwnd = None
+            self.disconnected.emit()
+            return False
+        return self.connect_by_hwnd(handles[0])
+
+    def get_windows_by_filter(self, title_pattern: str) -> list[int]:
+        return self.desktop.get_windows_by_filter(title_pattern)
+
+    def connect_by_hwnd(self, hwnd: int) -> bool:
+        window = self.desktop.get_window(hwnd)
+        if window is None or not window.alive:
+            self.hwnd = None
+            self.disconnected.emit()
+            return False
+        self.hwnd = hwnd
+        self.window_title = window.title
+        self.connected.emit(self.hwnd, self.window_title)
+        return True
+
+    def is_active(self) -> bool:
+        window = self.desktop.get_window(self.hwnd)
+        return window is not None and window.alive
+
+    def get_hwnd(self) -> int | None:
+        return self.hwnd
+
+    def get_title(self) -> str:
+        return self.window_title
@@ -0,0 +1,113 @@
+import time
+import argparse
+from PySide6.QtCore import QCoreApplication
+from ..modules.match_server import match_server
+from ..modules.logger import logger
+from ..ui.core.mutiple_manager import MultipleProcessManager
+from .desktop import SimDesktop, isolate_records
+
+
+def run_load_test(window_count: int = 4, tasks: list[str] | None = None, scenario: str = "一梦江湖",
+                  virtual_time: bool = True, window_size: tuple[int, int] = (1280, 720), wall_timeout: float = 600,
+                  execution_mode: str = "thread", stagger: float = 0, use_match_server: bool = False,
+                  frames_dir: str | None = None) -> list[dict]:
+    """
+    在模拟桌面上多开运行任务.
+
+    停留时间、点击轨迹和日志会写入临时目录，不影响真实窗口学到的记录和日志。
+
+    Args:
+        window_count (int): 模拟窗口数量。
+        tasks (list[str] | None): 任务名称列表，默认运行日常副本和论剑。
+        scenario (str): 模拟场景名称。
+        virtual_time (bool): 是否使用虚拟时间。
+        window_size (tuple[int, int]): 模拟窗口尺寸。
+        wall_timeout (float): 最长等待的真实时间（秒），超时后停止所有任务。
+        execution_mode (str): 执行器类型，"thread"、"coop" 或 "async"。
+        stagger (float): 相邻两个窗口的启动间隔（真实时间，秒），各窗口的轮询相位总是错开。
+        use_match_server (bool): 是否在独立的匹配服务进程中匹配。
+        frames_dir (str | None): 画面录制目录，设置后每个窗口的画面录制到其中以窗口句柄命名的子目录，
+            可用 python -m src.cli run --replay 回放。
+
+    Returns:
+        list[dict]: 每个窗口的运行结果，包含 hwnd, title, status, screens, clicks, sim_time。
+    """
+    tasks = tasks or ["日常副本", "论剑"]
+    # 执行器的状态信号从工作线程发出，需要事件循环才能送达 ProcessItem
+    app = QCoreApplication.instance() or QCoreApplication([])
+    record_dir = isolate_records()
+    logger.init(record_dir)
+
+    if use_match_server:
+        match_server.start()
+    desktop = SimDesktop(window_size=window_size, virtual_time=virtual_time, execution_mode=execution_mode,
+                         record_dir=frames_dir)
+    manager = MultipleProcessManager(desktop=desktop)
+    for _ in range(window_count):
+        hwnd = desktop.create_window(scenario)
+        window = desktop.get_window(hwnd)
+        manager.add_item(hwnd, window.title, tasks=tasks) # type: ignore
+
+    start_time = time.time()
+    manager.start_all(stagger=stagger)
+
+    items = list(manager.get_all_items().values())
+    while any(item.runner.is_running() or manager.has_pending_start(item.handle) for item in items):
+        if time.time() - start_time > wall_timeout:
+            for item in items:
+                manager.stop_item(item)
+            break
+        app.processEvents()
+        time.sleep(0.1)
+    wall_time = time.time() - start_time
+    if use_match_server:
+        client = match_server.connect()
+        stats = client.get_stats()
+        client.close()
+        match_server.stop()
+        print(f"匹配服务: 处理 {stats['requests']} 次匹配, 模板 {stats['templates']} 个, 缩放模板 {stats['scaled_templates']} 个")
+    app.processEvents()
+
+    results = []
+    for item in items:
+        window = desktop.get_window(item.handle)
+        results.append({
+            "hwnd": item.handle,
+            "title": item.name,
+            "status": item._status_cache["overall_status"],
+            "screens": window.get_screen_history(), # type: ignore
+            "clicks": len(window.clicks), # type: ignore
+            "sim_time": round(window.clock.time(), 1), # type: ignore
+            "wall_time": round(wall_time, 1),
+        })
+    return results
+
+
+def main():
+    """
+    命令行入口: python -m src.simulator.load_test --windows 8
+    """
+    parser = argparse.ArgumentParser(description="在模拟窗口上压测任务流程")
+    parser.add_argument("--windows", type=int, default=4, help="模拟窗口数量")
+    parser.add_argument("--tasks", nargs="+", default=["日常副本", "论剑"], help="任务名称列表")
+    parser.add_argument("--scenario", default="一梦江湖", help="模拟场景名称")
+    parser.add_argument("--real-time", action="store_true", help="使用真实时间而不是虚拟时间")
+    parser.add_argument("--size", default="1280x720", help="模拟窗口尺寸，如 1920x1080")
+    parser.add_argument("--stagger", type=float, default=0, help="相邻两个窗口的启动间隔（秒）")
+    parser.add_argument("--mode", choices=["thread", "coop", "async"], default="thread",
+                        help="执行器类型: 每个窗口一个线程、共用协作式调度线程或共用 asyncio 事件循环")
+    parser.add_argument("--match-server", action="store_true", help="在独立的匹配服务进程中匹配")
+    parser.add_argument("--record", default=None, metavar="DIR", help="把每个窗口的画面录制到 DIR/<窗口句柄>，供回放")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    results = run_load_test(args.windows, args.tasks, args.scenario, not args.real_time, (width, height),
+                            execution_mode=args.mode, stagger=args.stagger, use_match_server=args.match_server,
+                            frames_dir=args.record)
+    for result in results:
+        print(f"{result['title']}: {result['status']}, 点击 {result['clicks']} 次, "
+              f"模拟耗时 {result['sim_time']}秒, 实际耗时 {result['wall_time']}秒, 界面: {' -> '.join(result['screens'])}")
+
+
+if __name__ == "__main__":
+    main()
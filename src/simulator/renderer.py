@@ -0,0 +1,135 @@
+import zlib
+import cv2
+import numpy as np
+from typing import Optional
+import template_img
+from .screen_graph import Screen
+
+
+class FrameRenderer:
+    """
+    合成模拟画面.
+
+    按 template_img.TEMPLAET 中的 rect 和 base_size，把模板图片缩放到当前窗口尺寸后，
+    居中贴到每个界面固定的随机纹理背景上。同一界面的画面不变，不同界面的背景不同，
+    这样看门狗的画面指纹也能感知界面切换。
+    """
+
+    def __init__(self, window_size: tuple[int, int] = (1280, 720), seed: int = 0, templates: Optional[dict] = None):
+        """
+        初始化渲染器.
+
+        Args:
+            window_size (tuple[int, int]): 模拟窗口尺寸 (宽, 高)。
+            seed (int): 背景纹理的随机种子。
+            templates (dict | None): 模板字典，默认使用 template_img.TEMPLAET。
+        """
+        self.window_size = window_size
+        self.seed = seed
+        self.templates = templates if templates is not None else template_img.TEMPLAET
+        self._sprites: dict[str, np.ndarray] = {}                          # 缩放后的模板图片
+        self._boxes: dict[str, tuple[int, int, int, int]] = {}              # 模板在窗口中的位置
+        self._frames: dict[str, np.ndarray] = {}                            # 界面名称 -> 合成后的画面
+
+    def _scale(self, key: str) -> tuple[float, float]:
+        """
+        计算模板从截取时的窗口尺寸到当前窗口尺寸的缩放比例.
+        """
+        base_w, base_h = self.templates[key]["base_size"]
+        return self.window_size[0] / base_w, self.window_size[1] / base_h
+
+    def get_sprite(self, key: str) -> np.ndarray:
+        """
+        获取缩放到当前窗口尺寸的模板图片.
+
+        Args:
+            key (str): 模板键名。
+
+        Returns:
+            np.ndarray: BGR 图像。
+
+        Raises:
+            FileNotFoundError: 模板图片不存在。
+        """
+        if key not in self._sprites:
+            path = self.templates[key]["path"]
+            image = cv2.imread(path, cv2.IMREAD_COLOR)
+            if image is None:
+                raise FileNotFoundError(f"无法加载模板: {path}")
+            scale_x, scale_y = self._scale(key)
+            w = max(1, round(image.shape[1] * scale_x))
+            h = max(1, round(image.shape[0] * scale_y))
+            self._sprites[key] = cv2.resize(image, (w, h), interpolation=cv2.INTER_AREA)
+        return self._sprites[key]
+
+    def element_box(self, key: str) -> tuple[int, int, int, int]:
+        """
+        获取模板在窗口中的绘制区域，居中放在缩放后的 rect 内.
+
+        Args:
+            key (str): 模板键名。
+
+        Returns:
+            tuple[int, int, int, int]: (x1, y1, x2, y2)。
+        """
+        if key not in self._boxes:
+            sprite = self.get_sprite(key)
+            h, w = sprite.shape[:2]
+            scale_x, scale_y = self._scale(key)
+            rx1, ry1, rx2, ry2 = self.templates[key]["rect"]
+            cx = int((rx1 + rx2) / 2 * scale_x)
+            cy = int((ry1 + ry2) / 2 * scale_y)
+            win_w, win_h = self.window_size
+            x1 = min(max(0, cx - w // 2), win_w - w)
+            y1 = min(max(0, cy - h // 2), win_h - h)
+            self._boxes[key] = (x1, y1, x1 + w, y1 + h)
+        return self._boxes[key]
+
+    def _background(self, name: str) -> np.ndarray:
+        """
+        生成界面背景：低频随机纹理加少量噪声，种子由界面名称决定.
+        """
+        rng = np.random.default_rng(zlib.crc32(name.encode("utf-8")) ^ self.seed)
+        win_w, win_h = self.window_size
+        coarse = rng.integers(30, 180, size=(9, 16, 3), dtype=np.uint8)
+        background = cv2.resize(coarse, (win_w, win_h), interpolation=cv2.INTER_CUBIC).astype(np.int16)
+        background += rng.normal(0, 6, size=background.shape).astype(np.int16)
+        return np.clip(background, 0, 255).astype(np.uint8)
+
+    def render(self, screen: Screen) -> np.ndarray:
+        """
+        合成界面画面，结果按界面缓存.
+
+        Args:
+            screen (Screen): 界面。
+
+        Returns:
+            np.ndarray: BGR 图像（只读）。
+        """
+        frame = self._frames.get(screen.name)
+        if frame is None:
+            frame = self._background(screen.name)
+            for key in screen.elements:
+                x1, y1, x2, y2 = self.element_box(key)
+                frame[y1:y2, x1:x2] = self.get_sprite(key)
+            frame.setflags(write=False)
+            self._frames[screen.name] = frame
+        return frame
+
+    def hit_test(self, screen: Screen, x: int, y: int) -> Optional[str]:
+        """
+        获取点击位置上的元素，后绘制的元素优先.
+
+        Args:
+            screen (Screen): 界面。
+            x (int): 点击位置 x 坐标。
+            y (int): 点击位置 y 坐标。
+
+        Returns:
+            str | None: 被点击的模板键名，没有点到元素返回 None。
+        """
+        for key in reversed(screen.elements):
+            x1, y1, x2, y2 = self.element_box(key)
+            if x1 <= x < x2 and y1 <= y < y2:
+                return key
+        return None
@@ -0,0 +1,53 @@
+from .screen_graph import Screen, ScreenGraph
+
+
+def build_game_graph(combat_duration: float = 90.0, combat_jitter: float = 15.0, loading_duration: float = 3.0,
+                     combat_ends: bool = True) -> ScreenGraph:
+    """
+    构建覆盖日常副本和论剑流程的界面状态图.
+
+    日常副本: 主界面 -> 活动 -> 江湖 -> 江湖纪事 -> 挑战 -> 单人挑战 -> 加载 -> 剧情 -> 副本 -> 副本结束 -> 退本确认 -> 主界面
+    论剑: 主界面 -> 活动 -> 纷争 -> 1v1 -> 加载 -> 论剑场景 -> 退出确认 -> 主界面
+
+    Args:
+        combat_duration (float): 副本战斗时长（秒）。
+        combat_jitter (float): 副本战斗时长的随机波动（秒）。
+        loading_duration (float): 加载界面停留时间（秒）。
+        combat_ends (bool): 副本是否会结束，为 False 时副本永远不结束，用于测试卡死检测。
+
+    Returns:
+        ScreenGraph: 界面状态图。
+    """
+    tabs = ["huo_dong_close", "jiang_hu", "fen_zheng"]
+    screens = [
+        Screen("main", ["huo_dong_hong_dian"], {"huo_dong_hong_dian": "activity"}),
+        Screen("activity", tabs, {"huo_dong_close": "main", "jiang_hu": "jiang_hu", "fen_zheng": "fen_zheng"}),
+
+        # 日常副本
+        Screen("jiang_hu", tabs + ["jiang_hu_ji_shi"],
+               {"huo_dong_close": "main", "fen_zheng": "fen_zheng", "jiang_hu_ji_shi": "ji_shi"}),
+        Screen("ji_shi", ["huo_dong_close", "tiao_zhan"], {"huo_dong_close": "main", "tiao_zhan": "team_select"}),
+        Screen("team_select", ["huo_dong_close", "dan_ren_tiao_zhan"],
+               {"huo_dong_close": "main", "dan_ren_tiao_zhan": "loading"}),
+        Screen("loading", [], auto_next="story", duration=loading_duration),
+        Screen("story", ["tiao_guo_ju_qing"], {"tiao_guo_ju_qing": "dungeon"}, auto_next="dungeon", duration=30.0),
+        Screen("dungeon", ["gua_ji"], {"gua_ji": "dungeon"},
+               auto_next="dungeon_end" if combat_ends else None, duration=combat_duration, jitter=combat_jitter),
+        Screen("dungeon_end", ["gua_ji", "ri_chang_fu_ben_jie_shu", "ri_chang_fu_ben_tui_chu"],
+               {"ri_chang_fu_ben_tui_chu": "exit_confirm"}),
+        Screen("exit_confirm", ["tui_ben_tui_dui"], {"tui_ben_tui_dui": "main"}),
+
+        # 论剑
+        Screen("fen_zheng", ["huo_dong_close", "1_v_1"], {"huo_dong_close": "main", "1_v_1": "lun_jian_loading"}),
+        Screen("lun_jian_loading", [], auto_next="lun_jian", duration=loading_duration),
+        Screen("lun_jian", ["tui_chu_lun_jian"], {"tui_chu_lun_jian": "lun_jian_confirm"}),
+        Screen("lun_jian_confirm", ["que_ding"], {"que_ding": "main"}),
+    ]
+    return ScreenGraph(screens, start="main")
+
+
+# 场景名称 -> 构建函数
+SCENARIOS = {
+    "一梦江湖": build_game_graph,
+    "副本卡住": lambda: build_game_graph(combat_ends=False),
+}
@@ -0,0 +1,87 @@
+from typing import Optional
+
+
+class Screen:
+    """
+    模拟器中的一个游戏界面.
+
+    界面由若干模板元素组成（键名对应 template_img.TEMPLAET），点击元素时按 transitions 切换到下一个界面；
+    设置了 auto_next 的界面在停留 duration 秒后自动切换（如加载界面、副本战斗）。
+    """
+
+    def __init__(self, name: str, elements: list[str], transitions: Optional[dict[str, str]] = None,
+                 auto_next: Optional[str] = None, duration: float = 0.0, jitter: float = 0.0):
+        """
+        初始化界面.
+
+        Args:
+            name (str): 界面名称，在同一个界面图中唯一。
+            elements (list[str]): 界面上显示的模板键名，按绘制顺序排列。
+            transitions (dict[str, str] | None): 点击元素后切换到的界面，键为模板键名，值为界面名称。
+            auto_next (str | None): 停留一段时间后自动切换到的界面。
+            duration (float): 自动切换前的停留时间（秒）。
+            jitter (float): 停留时间的随机波动范围（秒）。
+        """
+        self.name = name
+        self.elements = elements
+        self.transitions = transitions or {}
+        self.auto_next = auto_next
+        self.duration = duration
+        self.jitter = jitter
+
+    def __repr__(self):
+        return f"Screen(name={self.name!r}, elements={self.elements})"
+
+
+class ScreenGraph:
+    """
+    界面状态图.
+    """
+
+    def __init__(self, screens: list[Screen], start: str):
+        """
+        初始化界面状态图.
+
+        Args:
+            screens (list[Screen]): 所有界面。
+            start (str): 初始界面名称。
+
+        Raises:
+            ValueError: 界面名称重复，或切换目标不存在。
+        """
+        self.screens: dict[str, Screen] = {}
+        for screen in screens:
+            if screen.name in self.screens:
+                raise ValueError(f"界面名称重复: {screen.name}")
+            self.screens[screen.name] = screen
+        self.start = start
+        self._validate()
+
+    def _validate(self):
+        """
+        检查所有切换目标都存在，且可点击的元素都显示在界面上.
+        """
+        if self.start not in self.screens:
+            raise ValueError(f"初始界面不存在: {self.start}")
+        for screen in self.screens.values():
+            targets = list(screen.transitions.values())
+            if screen.auto_next is not None:
+                targets.append(screen.auto_next)
+            for target in targets:
+                if target not in self.screens:
+                    raise ValueError(f"界面 {screen.name} 的切换目标不存在: {target}")
+            for key in screen.transitions:
+                if key not in screen.elements:
+                    raise ValueError(f"界面 {screen.name} 中没有可点击的元素: {key}")
+
+    def get(self, name: str) -> Screen:
+        """
+        获取界面.
+
+        Args:
+            name (str): 界面名称。
+
+        Returns:
+            Screen: 界面对象。
+        """
+        return self.screens[name]
@@ -0,0 +1,91 @@
+import random
+import numpy as np
+from typing import Optional, Tuple
+from ..modules.interfaces import FrameSource, InputDevice
+
+
+class SimCapture(FrameSource):
+    """
+    模拟截图，接口与 WindowCapture 相同，按句柄从模拟桌面中找到对应窗口.
+    """
+
+    def __init__(self, desktop):
+        """
+        初始化模拟截图.
+
+        Args:
+            desktop (SimDesktop): 模拟桌面。
+        """
+        self.desktop = desktop
+        self.hwnd = None
+        self.cache = None
+
+    def set_hwnd(self, hwnd: int):
+        self.hwnd = hwnd
+
+    def is_window_valid(self) -> bool:
+        window = self.desktop.get_window(self.hwnd)
+        return window is not None and window.alive
+
+    def get_window_size(self) -> Optional[Tuple[int, int]]:
+        window = self.desktop.get_window(self.hwnd)
+        if window is None or not window.alive:
+            return None
+        return window.window_size
+
+    def capture(self) -> Optional[np.ndarray]:
+        window = self.desktop.get_window(self.hwnd)
+        if window is None:
+            return None
+        frame = window.capture()
+        if frame is not None:
+            self.cache = frame
+        return frame
+
+    def get_cache(self) -> Optional[np.ndarray]:
+        return self.cache
+
+    def clear_cache(self):
+        self.cache = None
+
+
+class SimClicker(InputDevice):
+    """
+    模拟点击器，接口与 AutoClicker 相同，随机偏移规则也与 AutoClicker 一致.
+    """
+
+    def __init__(self, desktop):
+        """
+        初始化模拟点击器.
+
+        Args:
+            desktop (SimDesktop): 模拟桌面。
+        """
+        self.desktop = desktop
+        self.hwnd = None
+
+    def set_hwnd(self, hwnd: int):
+        self.hwnd = hwnd
+
+    def connect_window(self):
+        if self.hwnd and not self.is_window_ready():
+            raise Exception(f"无效的句柄: {self.hwnd}")
+
+    def click(self, x: int, y: int, random_range: int | tuple = 0) -> bool:
+        window = self.desktop.get_window(self.hwnd)
+        if window is None or not window.alive:
+            print("窗口未连接，无法点击")
+            return False
+
+        if isinstance(random_range, tuple):
+            rx, ry = random_range
+        else:
+            rx = ry = random_range
+        cx = x + random.randint(int(-rx / 2), int(rx / 2))
+        cy = y + random.randint(int(-ry / 2), int(ry / 2))
+        window.click(cx, cy)
+        return True
+
+    def is_window_ready(self) -> bool:
+        window = self.desktop.get_window(self.hwnd)
+        return window is not None and window.alive
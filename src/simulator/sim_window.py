@@ -0,0 +1,136 @@
+import random
+import threading
+import numpy as np
+from typing import Optional
+from ..modules.clock import Clock, real_clock
+from .screen_graph import Screen, ScreenGraph
+from .renderer import FrameRenderer
+
+
+class SimWindow:
+    """
+    模拟游戏窗口.
+
+    持有一个界面状态图和当前界面，截图时返回当前界面的合成画面，
+    点击时根据点中的元素切换界面。所有时间都从时钟读取，配合 VirtualClock 可以瞬间跑完整个流程。
+    """
+
+    def __init__(self, hwnd: int, title: str, graph: ScreenGraph, window_size: tuple[int, int] = (1280, 720),
+                 clock: Clock = real_clock, seed: int = 0):
+        """
+        初始化模拟窗口.
+
+        Args:
+            hwnd (int): 模拟的窗口句柄。
+            title (str): 窗口标题。
+            graph (ScreenGraph): 界面状态图。
+            window_size (tuple[int, int]): 窗口尺寸 (宽, 高)。
+            clock (Clock): 时钟对象，决定自动切换界面的时间。
+            seed (int): 随机种子，影响背景纹理和停留时间波动。
+        """
+        self.hwnd = hwnd
+        self.title = title
+        self.graph = graph
+        self.window_size = window_size
+        self.clock = clock
+        self.renderer = FrameRenderer(window_size, seed)
+        self.alive = True
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.history: list[tuple[float, str]] = []                          # (时间, 界面名称)
+        self.clicks: list[tuple[float, int, int, Optional[str]]] = []        # (时间, x, y, 点中的元素)
+        self._enter(graph.start)
+
+    def _enter(self, name: str):
+        """
+        切换到指定界面，并计算自动切换的时间.
+        """
+        screen = self.graph.get(name)
+        now = self.clock.time()
+        self.screen_name = name
+        self._entered_at = now
+        self._deadline: Optional[float] = None
+        if screen.auto_next is not None:
+            self._deadline = now + max(0.0, screen.duration + self._rng.uniform(-screen.jitter, screen.jitter))
+        self.history.append((now, name))
+
+    def _update(self):
+        """
+        处理到期的自动切换，连续的自动切换会一次处理完.
+        """
+        while self._deadline is not None and self.clock.time() >= self._deadline:
+            self._enter(self.graph.get(self.screen_name).auto_next) # type: ignore
+
+    @property
+    def screen(self) -> Screen:
+        """
+        当前界面.
+        """
+        with self._lock:
+            self._update()
+            return self.graph.get(self.screen_name)
+
+    def goto(self, name: str):
+        """
+        直接切换到指定界面，用于测试中模拟意外弹窗等情况.
+
+        Args:
+            name (str): 界面名称。
+        """
+        with self._lock:
+            self._enter(name)
+
+    def capture(self) -> Optional[np.ndarray]:
+        """
+        获取当前界面的画面.
+
+        Returns:
+            Optional[np.ndarray]: BGR 图像，窗口已关闭返回 None。
+        """
+        if not self.alive:
+            return None
+        with self._lock:
+            self._update()
+            screen = self.graph.get(self.screen_name)
+        return self.renderer.render(screen)
+
+    def click(self, x: int, y: int) -> Optional[str]:
+        """
+        在窗口内点击，点中可点击的元素时切换界面.
+
+        Args:
+            x (int): 点击位置 x 坐标。
+            y (int): 点击位置 y 坐标。
+
+        Returns:
+            str | None: 点中的模板键名，没有点到元素返回 None。
+        """
+        if not self.alive:
+            return None
+        with self._lock:
+            self._update()
+            screen = self.graph.get(self.screen_name)
+            key = self.renderer.hit_test(screen, x, y)
+            self.clicks.append((self.clock.time(), x, y, key))
+            if key is not None and key in screen.transitions:
+                target = screen.transitions[key]
+                # 切换到同一界面（如挂机按钮）不重新计时
+                if target != screen.name:
+                    self._enter(target)
+            return key
+
+    def close(self):
+        """
+        关闭窗口，之后截图和点击都会失败.
+        """
+        self.alive = False
+
+    def get_screen_history(self) -> list[str]:
+        """
+        获取经过的界面名称列表.
+
+        Returns:
+            list[str]: 界面名称，按进入顺序排列。
+        """
+        with self._lock:
+            return [name for _, name in self.history]
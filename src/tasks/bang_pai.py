@@ -1,5 +1,5 @@
 from .template_maching_task import TemplateMatchingTask
-from ..ui.core.logger import logger
+from ..modules.logger import logger
 from .states.bang_pai_states import 
 
 
@@ -1,5 +1,6 @@
 from .template_maching_task import TemplateMatchingTask
-from ..ui.core.logger import logger
+from ..modules.trajectory import TrajectoryStore, trajectory_store
+from ..modules.logger import logger
 import template_img
 import random
 
@@ -8,9 +9,15 @@ class LunJian(TemplateMatchingTask):
     论剑任务类.
 
     自动执行论剑相关操作，进入论剑场景后立刻退出。
+    每次成功运行后记录点击轨迹，下次运行时优先按轨迹回放，只在记录的位置做小范围校验，
+    校验失败时回退到常规的模板搜索流程，连续失败多次后删除轨迹。
     """
     
     TASK_NAME = "论剑"  # 论剑任务
+    REPLAY_VERIFY_ATTEMPTS = 3 # 轨迹回放时每一步最少的校验次数（等待界面淡入）
+    REPLAY_MAX_DELAY = 30.0 # 轨迹回放时每一步最多按记录的间隔等待多久（秒）
+    REPLAY_VERIFY_MARGIN = 3.0 # 超过记录的间隔后继续校验的时间（秒）
+    REPLAY_MAX_FAILURES = 3 # 轨迹回放连续失败多少次后删除轨迹
 
     # 模板图片路径列表
     TEMPLATE_PATH_LIST = {
@@ -27,6 +34,9 @@ class LunJian(TemplateMatchingTask):
         """
         # 调用父类初始化
         super().__init__(config, log_mode)
+        self._trajectory: list[dict] = []                       # 本次运行的点击轨迹
+        self._trajectory_window_size: tuple[int, int] | None = None # 本次运行的窗口尺寸
+        self._last_click_time = 0.0                             # 上次点击的时间
 
     def get_template_path_list(self) -> list:
         """
@@ -46,7 +56,7 @@ class LunJian(TemplateMatchingTask):
         """
         return self.TASK_NAME
 
-    def execute_task_logic(self):
+    def task_steps(self):
         """
         执行具体的任务逻辑.
         """
@@ -56,13 +66,20 @@ class LunJian(TemplateMatchingTask):
             logger.error(f"[{self.get_task_name()}]模板文件验证失败，任务无法启动", mode=self.log_mode)
             return
         
-        self._pause_aware_sleep(2) # 任务开始前暂停两秒，防止ui无反应
+        yield self.sleep_step(2) # 任务开始前暂停两秒，防止ui无反应
+        self._trajectory = []
+        self._trajectory_window_size = None
+        self._last_click_time = self.clock.time()
         
         try:
+            # 优先按上次成功的轨迹回放，失败时从当前进度继续常规流程
+            if (yield from self.replay_trajectory()) or not self.running:
+                return
+
             while self.running:
                 
                 # 每次循环开始时检查是否超时
-                if self.check_timeout():
+                if (yield from self.check_timeout_steps()):
                     logger.warning(f"[{self.get_task_name()}]任务超时，已退出.", mode=self.log_mode)
                     return # 超时，退出任务逻辑
                 
@@ -73,7 +90,7 @@ class LunJian(TemplateMatchingTask):
                     template = self.TEMPLATE_PATH_LIST[key]
                     
                     # 每次迭代前再次检查是否超时或被外部停止
-                    if self.check_timeout() or not self.running:
+                    if (yield from self.check_timeout_steps()) or not self.running:
                         return # 超时或被停止，退出任务逻辑
                     
                     # 跳过已点击的模板
@@ -81,10 +98,10 @@ class LunJian(TemplateMatchingTask):
                         continue
                     
                     # 捕获截图并匹配模板
-                    match_result = self.capture_and_match_template(template, None)
+                    match_result = yield from self.capture_and_match_template_steps(template, None)
                     if match_result is None:
                         # 如果捕获失败，等待重试时检查停止/超时
-                        if self._pause_aware_sleep(self.template_retry_delay):
+                        if (yield self.sleep_step(self.template_retry_delay)):
                             return 
                         continue
                     
@@ -93,21 +110,24 @@ class LunJian(TemplateMatchingTask):
                         # 点击匹配到的模板
                         if self.click_template(template["path"], center, size):
                             matched = True
-                            logger.info(f"[{self.get_task_name()}]模板 {template["path"]} 已处理完成, 相似度{match_val:.3f}", mode=self.log_mode)
+                            self._record_step(key, center, size)
+                            logger.event("template_done", "[{task}]模板 {template} 已处理完成, 相似度{score:.3f}", mode=self.log_mode,
+                                         hwnd=self._hwnd(), task=self.get_task_name(), template=template["path"], score=match_val)
                             
                             # 特殊处理
                             # 如果点击确认，记录点击并退出循环
                             if key == "que_ding" and "template_img/tui_chu_lun_jian.png" in self.clicked_templates:
                                 logger.info(f"[{self.get_task_name()}]已执行退出副本操作，结束任务。", mode=self.log_mode)
+                                self._save_trajectory()
                                 self.stop() # 停止任务，退出 while 循环
                                 return 
                             
                             click_delay = random.uniform(max(self.click_delay - self.rand_delay, self.click_delay * 0.7), self.click_delay + self.rand_delay)
-                            self._pause_aware_sleep(click_delay)
+                            yield self.sleep_step(click_delay)
                             break  # 找到一个匹配后跳出 for 循环
                     else:
                         # 模板匹配失败，等待重试时检查停止/超时
-                        if self._pause_aware_sleep(self.template_retry_delay):
+                        if (yield self.sleep_step(self.template_retry_delay)):
                             return
 
 
@@ -121,7 +141,7 @@ class LunJian(TemplateMatchingTask):
                 # 每次等待时检查是否停止或超时
                 # 计算随机延迟
                 loop_delay = random.uniform(max(self.click_delay - self.rand_delay, self.click_delay), self.click_delay + self.rand_delay)
-                if self._pause_aware_sleep(loop_delay):
+                if (yield self.sleep_step(loop_delay)):
                     return # 被停止，退出任务逻辑
                 
             logger.info(f"[{self.get_task_name()}]任务逻辑自然退出。", mode=self.log_mode)
@@ -130,6 +150,122 @@ class LunJian(TemplateMatchingTask):
             logger.info(f"[{self.get_task_name()}]任务被手动停止。", mode=self.log_mode)
         return # 任务逻辑结束
 
+    def replay_trajectory(self):
+        """
+        按上次成功的点击轨迹回放（生成器）.
+
+        每一步只在记录的位置做模板大小的校验，校验通过直接点击；界面出现得比平时慢时（如论剑匹配），
+        一直校验到记录的间隔（不超过 REPLAY_MAX_DELAY）再加 REPLAY_VERIFY_MARGIN 为止。
+        校验失败时回退到常规流程，已完成的步骤会保留在点击记录中；连续失败 REPLAY_MAX_FAILURES 次后删除这条轨迹。
+
+        Returns:
+            bool: 回放完整走完或任务被停止时返回 True，需要回退到常规流程时返回 False。
+        """
+        screenshot = yield from self.capture_screenshot_steps()
+        if screenshot is None:
+            return False
+        self._trajectory_window_size = self.get_screenshot_size(screenshot)
+        key = TrajectoryStore.make_key(self.get_task_name(), self._trajectory_window_size)
+        steps = trajectory_store.get(key)
+        if not steps:
+            return False
+
+        logger.info(f"[{self.get_task_name()}]按记录的轨迹回放 ({len(steps)} 步)", mode=1)
+        for index, step in enumerate(steps):
+            # 校验的截止时间：记录的间隔（有上限）再留一些余量
+            deadline = self.clock.time() + min(step["delay"], self.REPLAY_MAX_DELAY) + self.REPLAY_VERIFY_MARGIN
+            # 先按记录的间隔等待，但不超过正常的点击等待时间，更慢的界面由校验轮询等待
+            if index > 0 and (yield self.sleep_step(min(step["delay"], self.click_delay + self.rand_delay))):
+                return True
+            if (yield from self.check_timeout_steps()) or not self.running:
+                return True
+
+            match_result = yield from self._verify_step(step, deadline)
+            if match_result is None:
+                if self.running:
+                    # 偶尔失败（如界面卡顿）不删除轨迹，连续失败说明轨迹已过时，删除后常规流程走完时会记录新的轨迹
+                    if trajectory_store.record_failure(key, self.REPLAY_MAX_FAILURES):
+                        logger.info(f"[{self.get_task_name()}]轨迹第 {index + 1} 步 {step['key']} 校验失败，轨迹连续失败 {self.REPLAY_MAX_FAILURES} 次，删除轨迹并回退到常规流程", mode=1)
+                    else:
+                        logger.info(f"[{self.get_task_name()}]轨迹第 {index + 1} 步 {step['key']} 校验失败，回退到常规流程", mode=1)
+                return not self.running
+            center, match_val, size = match_result
+            if not self.click_template(step["path"], center, size):
+                return False
+            self._record_step(step["key"], center, size)
+
+        logger.info(f"[{self.get_task_name()}]轨迹回放完成，结束任务。", mode=self.log_mode)
+        trajectory_store.record_success(key)
+        self._save_trajectory()
+        self.stop()
+        return True
+
+    def _verify_step(self, step: dict, deadline: float):
+        """
+        在轨迹记录的位置校验模板（生成器）.
+
+        至少校验 REPLAY_VERIFY_ATTEMPTS 次，之后一直校验到 deadline 为止。
+
+        Args:
+            step (dict): 轨迹步骤。
+            deadline (float): 校验的截止时间（self.clock.time() 的时间）。
+
+        Returns:
+            tuple | None: 校验通过返回 (center, match_val, size)，否则返回 None。
+        """
+        template = self.TEMPLATE_PATH_LIST.get(step["key"])
+        if template is None or template["path"] != step["path"]:
+            return None
+        attempts = 0
+        while attempts < self.REPLAY_VERIFY_ATTEMPTS or self.clock.time() < deadline:
+            attempts += 1
+            if (yield from self.check_timeout_steps()) or not self.running:
+                return None
+            screenshot = yield from self.capture_screenshot_steps()
+            if screenshot is not None:
+                center, match_val, size = yield from self.run_match_steps(self._verify_step_sync, screenshot, template, tuple(step["center"]))
+                if center is not None:
+                    return center, match_val, size
+            if (yield self.sleep_step(self.template_retry_delay)):
+                return None
+        return None
+
+    def _verify_step_sync(self, screenshot, template: dict, center: tuple[int, int]) -> tuple:
+        """
+        设置模板并在指定位置校验，在匹配线程池（或任务线程）中执行.
+        """
+        self.template_matcher.set_template(template["path"])
+        return self.template_matcher.verify_at(screenshot, center, threshold=self.match_threshold, base_size=template["base_size"])
+
+    def _record_step(self, key: str, center: tuple[int, int], size: tuple[int, int] | None):
+        """
+        记录一次点击到本次轨迹.
+
+        Args:
+            key (str): 模板键名。
+            center (tuple[int, int]): 匹配到的中心坐标。
+            size (tuple[int, int] | None): 模板尺寸。
+        """
+        now = self.clock.time()
+        self._trajectory.append({
+            "key": key,
+            "path": self.TEMPLATE_PATH_LIST[key]["path"],
+            "center": [int(center[0]), int(center[1])],
+            "size": [int(size[0]), int(size[1])] if size else None,
+            "delay": round(now - self._last_click_time, 2),
+        })
+        self._last_click_time = now
+
+    def _save_trajectory(self):
+        """
+        本次按完整顺序点击了所有模板时保存轨迹.
+        """
+        if self._trajectory_window_size is None:
+            return
+        if [step["key"] for step in self._trajectory] != list(self.TEMPLATE_PATH_LIST.keys()):
+            return
+        trajectory_store.put(TrajectoryStore.make_key(self.get_task_name(), self._trajectory_window_size), self._trajectory)
+
     def __str__(self):
         """
         返回任务的字符串表示.
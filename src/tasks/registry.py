@@ -0,0 +1,8 @@
+from .ri_chang_fu_ben import RiChangFuBen
+from .lun_jian import LunJian
+
+# 任务名称到类的映射，不依赖 Qt，界面、命令行和任务子进程共用
+TASK_MAP = {
+    "日常副本": RiChangFuBen,
+    "论剑": LunJian
+}
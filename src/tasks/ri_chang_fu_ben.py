@@ -1,5 +1,5 @@
 from .template_maching_task import TemplateMatchingTask
-from ..ui.core.logger import logger
+from ..modules.logger import logger
 from .states.ri_chang_states import IdleState
 import template_img
 
@@ -34,6 +34,7 @@ class RiChangFuBen(TemplateMatchingTask):
         # 调用父类初始化
         super().__init__(config, log_mode)
         self.current_state = None # 当前状态
+        self.combat_start_time = None # 进入副本的时间，用于记录副本耗时
 
     def get_template_path_list(self) -> list:
         """
@@ -44,7 +45,7 @@ class RiChangFuBen(TemplateMatchingTask):
         """
         return [template.get("path") for template in self.TEMPLATE_LIST.values()]
 
-    def execute_task_logic(self):
+    def task_steps(self):
         """
         执行具体的任务逻辑.
         """
@@ -54,18 +55,19 @@ class RiChangFuBen(TemplateMatchingTask):
             return
         
         # 初始化状态机：进入 Idle 状态
+        self.combat_start_time = None
         self.current_state = IdleState(self)
         self.current_state.on_enter()
         
         try:
             while self.running:
                 # 超时检查
-                if self.check_timeout():
+                if (yield from self.check_timeout_steps()):
                     return
                 
                 # 状态机流转
-                # execute() 返回下一个状态实例，或者 None
-                next_state = self.current_state.execute()
+                # steps() 返回下一个状态实例，或者 None
+                next_state = yield from self.current_state.steps()
                 
                 if next_state is not None:
                     # 切换状态流程：退出旧状态 -> 更新引用 -> 进入新状态
@@ -82,6 +84,16 @@ class RiChangFuBen(TemplateMatchingTask):
         
         return
     
+    def reset_progress(self):
+        """
+        重置任务进度，并让状态机回到 Idle 状态重新打开活动.
+        """
+        super().reset_progress()
+        if self.current_state is not None:
+            self.current_state.on_exit()
+        self.current_state = IdleState(self)
+        self.current_state.on_enter()
+
     def add_clicked_template(self, template_path: str):
         """
         添加已点击的模板记录.
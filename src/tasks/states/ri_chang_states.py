@@ -1,17 +1,18 @@
 from .state_base import State
-from ...ui.core.logger import logger
+from ...modules.dwell_model import dwell_model
+from ...modules.logger import logger
 
 class IdleState(State):
     """
     空闲状态，主要负责检测高频/突发事件，以及常规任务流程循环。
     """
-    def execute(self):
+    def steps(self):
         # 优先检测高频/突发事件：剧情
-        if self.task.capture_and_match_template(self.task.TEMPLATE_LIST.get("tiao_guo_ju_qing")):
+        if (yield from self.task.capture_and_match_template_steps(self.task.TEMPLATE_LIST.get("tiao_guo_ju_qing"))):
             return DialogState(self.task)
 
         # 检测是否已进入副本
-        if match_result := self.task.capture_and_match_template(self.task.TEMPLATE_LIST.get("gua_ji")) and self.task.TEMPLATE_LIST.get("huo_dong").get("path") in self.task.clicked_templates:
+        if match_result := (yield from self.task.capture_and_match_template_steps(self.task.TEMPLATE_LIST.get("gua_ji"))) and self.task.TEMPLATE_LIST.get("huo_dong").get("path") in self.task.clicked_templates:
             return CombatState(self.task)
 
         # 常规任务流程循环
@@ -30,15 +31,15 @@ class IdleState(State):
         for key in targets.keys():
             tmpl = targets[key]
             # print(f"检查模板 {key}: {tmpl.get('path')}, {tmpl.get('rect')}, {tmpl.get('base_size')}")
-            if self.task.check_timeout() or not self.task.running:
+            if (yield from self.task.check_timeout_steps()) or not self.task.running:
                 return # 超时或被停止，退出任务逻辑
             # 跳过已点击的（防止重复点活动图标）
             if tmpl.get("path") in self.task.clicked_templates:
                 continue
             
             if tmpl == targets["huo_dong"] and tmpl.get("path") not in self.task.clicked_templates:
-                        huo_dong_result = self.task.capture_and_match_template(tmpl)
-                        hong_dian_result = self.task.capture_and_match_template(targets["huo_dong_hong_dian"])
+                        huo_dong_result = yield from self.task.capture_and_match_template_steps(tmpl)
+                        hong_dian_result = yield from self.task.capture_and_match_template_steps(targets["huo_dong_hong_dian"])
                         if huo_dong_result and hong_dian_result:
                             if huo_dong_result[1] > hong_dian_result[1]:
                                 match_result = huo_dong_result
@@ -47,7 +48,7 @@ class IdleState(State):
                         else:
                             match_result = None
             else:
-                match_result = self.task.capture_and_match_template(tmpl)
+                match_result = yield from self.task.capture_and_match_template_steps(tmpl)
 
             if match_result:
                 center, val, size = match_result 
@@ -55,16 +56,16 @@ class IdleState(State):
                     self.task.click_template(tmpl.get("path"), center, size)
                     # logger.info(f"[{self.task.get_task_name()}]模板 {key} 已处理完成, 相似度{val:.3f}", mode=self.task.log_mode)
                     matched = True
-                    self.sleep(self.task.click_delay)
+                    yield self.sleep_step(self.task.click_delay)
             else:
-                self.sleep(self.task.template_retry_delay)
+                yield self.sleep_step(self.task.template_retry_delay)
         
         # 检查任务是否全部完成
         if not matched and self.task.is_task_completed():
             logger.info("日常副本任务流程已完成，退出任务", mode=self.task.log_mode)
             self.task.stop()
         
-        self.sleep(self.task.match_loop_delay, is_random=False)
+        yield self.sleep_step(self.task.match_loop_delay, is_random=False)
         return None # 保持当前状态
 
 class DialogState(State):
@@ -75,16 +76,16 @@ class DialogState(State):
         super().__init__(task)
         self.miss_count = 0 # 连续未检测到次数
 
-    def execute(self):
+    def steps(self):
         # 在剧情状态下，只检测“跳过”按钮
-        match_result = self.task.capture_and_match_template(self.task.TEMPLATE_LIST.get("tiao_guo_ju_qing"))
+        match_result = yield from self.task.capture_and_match_template_steps(self.task.TEMPLATE_LIST.get("tiao_guo_ju_qing"))
         
         if match_result:
             center, val, size = match_result
             if center:
                 self.task.click_template(self.task.TEMPLATE_LIST.get("tiao_guo_ju_qing").get("path"), center, size)
                 self.miss_count = 0 # 重置计数
-                self.sleep(0.5, is_random=False) # 点击后快速重试
+                yield self.sleep_step(0.5, is_random=False) # 点击后快速重试
                 return None # 继续留在剧情状态
         
         # 如果连续几次没找到跳过，说明剧情可能结束了
@@ -92,44 +93,86 @@ class DialogState(State):
         if self.miss_count > 3:
             return IdleState(self.task) # 切回空闲状态重新扫描环境
             
-        self.sleep(0.5, is_random=False)
+        yield self.sleep_step(0.5, is_random=False)
         return None
 
 class CombatState(State):
     """
     战斗/副本状态，主要负责处理战斗流程，直到副本结束。
+
+    轮询间隔由停留时间模型决定：刚进副本时稀疏轮询，接近历史通关时间时密集轮询。
     """
+    DEFAULT_POLL_INTERVAL = 3.0 # 没有历史记录时的轮询间隔（秒）
+
+    def __init__(self, task):
+        super().__init__(task)
+        self.gua_ji_checked = False # 本次进入状态后是否已检查过挂机按钮
+
     def on_enter(self):
         super().on_enter()
+        # 记录首次进入副本的时间，中途切到剧情状态再回来不重新计时
+        if getattr(self.task, "combat_start_time", None) is None:
+            self.task.combat_start_time = self.task.clock.time()
+
+    def steps(self):
         # 刚进副本，确保点击一次挂机
-        if not "template_img/gua_ji.png" in self.task.clicked_templates:
-            match_result = self.task.capture_and_match_template(self.task.TEMPLATE_LIST.get("gua_ji"))
-            if match_result:
-                center, val, size = match_result
-                self.task.click_template(self.task.TEMPLATE_LIST.get("gua_ji").get("path"), center, size)
-                self.sleep(self.task.click_delay)
+        if not self.gua_ji_checked:
+            self.gua_ji_checked = True
+            if not "template_img/gua_ji.png" in self.task.clicked_templates:
+                match_result = yield from self.task.capture_and_match_template_steps(self.task.TEMPLATE_LIST.get("gua_ji"))
+                if match_result:
+                    center, val, size = match_result
+                    self.task.click_template(self.task.TEMPLATE_LIST.get("gua_ji").get("path"), center, size)
+                    yield self.sleep_step(self.task.click_delay)
 
-    def execute(self):
-        
         # 战斗中主要关注：是否结束战斗，跳过剧情
-        if self.task.capture_and_match_template(self.task.TEMPLATE_LIST.get("tiao_guo_ju_qing")):
+        if (yield from self.task.capture_and_match_template_steps(self.task.TEMPLATE_LIST.get("tiao_guo_ju_qing"))):
             return DialogState(self.task)
         
         # 检测退出副本（结束标志）
-        if match_result := self.task.match_multiple_templates([self.task.TEMPLATE_LIST.get("ri_chang_fu_ben_jie_shu"), self.task.TEMPLATE_LIST.get("ri_chang_fu_ben_tui_chu")],
-                                                                      self.task.TEMPLATE_LIST.get("ri_chang_fu_ben_tui_chu"), match_val_threshold=0.68):
+        if match_result := (yield from self.task.match_multiple_templates_steps([self.task.TEMPLATE_LIST.get("ri_chang_fu_ben_jie_shu"), self.task.TEMPLATE_LIST.get("ri_chang_fu_ben_tui_chu")],
+                                                                      self.task.TEMPLATE_LIST.get("ri_chang_fu_ben_tui_chu"), match_val_threshold=0.68)):
             center, val, size = match_result
             if center:
+                self._record_dwell_time()
                 self.task.click_template(self.task.TEMPLATE_LIST.get("ri_chang_fu_ben_tui_chu").get("path"), center, size)
-                self.sleep(2.0)
+                yield self.sleep_step(2.0)
                 self.task.auto_clicker.click(center[0], center[1])
-                self.sleep(2.0)
+                yield self.sleep_step(2.0)
         if self.task.TEMPLATE_LIST.get("ri_chang_fu_ben_tui_chu").get("path") in self.task.clicked_templates:
-            match_result = self.task.capture_and_match_template(self.task.TEMPLATE_LIST.get("tui_ben_tui_dui"))
+            match_result = yield from self.task.capture_and_match_template_steps(self.task.TEMPLATE_LIST.get("tui_ben_tui_dui"))
             center, val, size = match_result
             if center:
                 self.task.click_template(self.task.TEMPLATE_LIST.get("tui_ben_tui_dui").get("path"), center, size)
                 logger.info(f"[{self.task.get_task_name()}]已执行退出副本操作，结束任务。", mode=self.task.log_mode)
                 self.task.stop()
-        self.sleep(3.0)
-        return None
\ No newline at end of file
+        yield self.sleep_step(self._next_poll_interval())
+        return None
+
+    def _dwell_key(self) -> str:
+        """
+        停留时间模型中该状态的标识.
+        """
+        return f"{self.task.get_task_name()}.{self.__class__.__name__}"
+
+    def _next_poll_interval(self) -> float:
+        """
+        根据已在副本中停留的时间计算下一次轮询间隔.
+        """
+        start_time = getattr(self.task, "combat_start_time", None)
+        if start_time is None:
+            return self.DEFAULT_POLL_INTERVAL
+        return dwell_model.next_interval(self._dwell_key(), self.task.clock.time() - start_time, self.DEFAULT_POLL_INTERVAL)
+
+    def _record_dwell_time(self):
+        """
+        检测到副本结束时记录本次停留时长，每次进副本只记录一次.
+        """
+        start_time = getattr(self.task, "combat_start_time", None)
+        if start_time is None:
+            return
+        duration = self.task.clock.time() - start_time
+        dwell_model.record(self._dwell_key(), duration)
+        self.task.combat_start_time = None
+        logger.event("dungeon_done", "[{task}]副本耗时 {duration:.1f} 秒", mode=1,
+                     hwnd=self.task._hwnd(), task=self.task.get_task_name(), duration=round(duration, 2))
\ No newline at end of file
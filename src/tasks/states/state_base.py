@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from ...ui.core.logger import logger
+from ...modules.steps import Sleep, drive_steps
+from ...modules.logger import logger
 import time
 
 class State(ABC):
@@ -24,16 +25,35 @@ class State(ABC):
         pass
 
     @abstractmethod
-    def execute(self):
+    def steps(self):
         """
-        核心逻辑循环。
-        
+        核心逻辑循环（生成器）。
+
+        需要等待时 yield self.sleep_step(...) 等步骤，不直接阻塞线程。
+
         Returns:
             State: 如果需要切换状态，返回下一个状态的实例。
             None:  如果保持当前状态，返回 None。
         """
         pass
 
+    def execute(self):
+        """
+        在当前线程中阻塞执行一次 steps()。
+
+        Returns:
+            State | None: 下一个状态的实例，保持当前状态时为 None。
+        """
+        return drive_steps(self.steps())
+
+    def sleep_step(self, seconds, is_random=True) -> Sleep:
+        """
+        创建任务的随机等待步骤，在 steps() 中 yield
+        """
+        if hasattr(self.task, 'sleep_step'):
+            return self.task.sleep_step(seconds, is_random)
+        return Sleep(seconds)
+
     def sleep(self, seconds, is_random=True):
         """
         封装任务的随机等待
@@ -1,15 +1,23 @@
 from .task import Task
-from ..modules.auto_clicker import AutoClicker
-from ..modules.window_capture import WindowCapture
+from ..modules.interfaces import FrameSource, InputDevice
 from ..modules.template_matcher import TemplateMatcher
+from ..modules.stuck_watchdog import StuckWatchdog
+from ..modules.clock import Clock, real_clock
+from ..modules.match_pool import MatchPool
+from ..modules.match_server import MatchClient
+from ..modules.cpu_governor import CpuGovernor
+from ..modules.phase import PhaseOffset
+from ..modules.match_overlay import MatchOverlay, make_match_record
+from ..modules.steps import Await, Sleep, Throttle, drive_steps
 from abc import abstractmethod
-from typing import Optional, Tuple, Callable
+from typing import Optional, Tuple, Callable, Generator
 import os
 import numpy as np
 import threading
 import time
 import random
-from ..ui.core.logger import logger
+import template_img
+from ..modules.logger import logger
 
 class TemplateMatchingTask(Task):
     """
@@ -58,10 +66,19 @@ class TemplateMatchingTask(Task):
         self._pause_condition: Optional[threading.Condition] = None         # 暂停任务的条件变量
         self._is_paused_check: Optional[Callable[[], bool]] = None          # 检查 Model 暂停状态的函数
 
+        self.watchdog: Optional[StuckWatchdog] = None                       # 卡死看门狗，由 TaskRunner 注入
+        self.clock: Clock = real_clock                                      # 时钟，回放/模拟时由 TaskRunner 注入虚拟时钟
+        self.match_pool: Optional[MatchPool] = None                         # 共享匹配线程池，由 TaskRunner 注入，为 None 时在当前线程匹配
+        self.governor: Optional[CpuGovernor] = None                         # 全局 CPU 调速器，由 TaskRunner 注入
+        self.phase: Optional[PhaseOffset] = None                            # 轮询相位，多开时由 TaskRunner 注入
+        self.match_client: Optional[MatchClient] = None                     # 匹配服务客户端，由 TaskRunner 注入，为 None 时在本进程匹配
+        self.overlay: Optional[MatchOverlay] = None                         # 匹配预览记录，由 TaskRunner 注入
+        self.restart_requested = False                                      # 看门狗是否请求重启任务
+
         self._load_templates()
 
     # --- 初始化/更新配置方法 ---
-    def configure_window_access(self, wincap: WindowCapture, clicker: AutoClicker, pause_condition: threading.Condition, is_paused_check: Callable[[], bool]):
+    def configure_window_access(self, wincap: FrameSource, clicker: InputDevice, pause_condition: threading.Condition, is_paused_check: Callable[[], bool]):
         """
         接收并配置已连接的窗口访问对象。
         """
@@ -71,6 +88,120 @@ class TemplateMatchingTask(Task):
         self._pause_condition = pause_condition
         self._is_paused_check = is_paused_check
 
+    def set_watchdog(self, watchdog: Optional[StuckWatchdog]):
+        """
+        设置卡死看门狗.
+
+        Args:
+            watchdog (StuckWatchdog | None): 看门狗实例，为 None 时关闭卡死检测。
+        """
+        self.watchdog = watchdog
+
+    def set_clock(self, clock: Clock):
+        """
+        设置时钟对象，所有等待和超时判断都通过它进行.
+
+        Args:
+            clock (Clock): 时钟对象。
+        """
+        self.clock = clock
+
+    def set_match_pool(self, match_pool: Optional[MatchPool]):
+        """
+        设置共享匹配线程池.
+
+        Args:
+            match_pool (MatchPool | None): 线程池，为 None 时在任务线程中直接匹配。
+        """
+        self.match_pool = match_pool
+
+    def set_governor(self, governor: Optional[CpuGovernor]):
+        """
+        设置全局 CPU 调速器.
+
+        Args:
+            governor (CpuGovernor | None): 调速器，为 None 时不限速。
+        """
+        self.governor = governor
+
+    def set_match_client(self, match_client: Optional[MatchClient]):
+        """
+        设置匹配服务客户端，设置后缩放模板匹配交给独立的匹配服务进程执行.
+
+        Args:
+            match_client (MatchClient | None): 客户端，为 None 时在本进程匹配。
+        """
+        self.match_client = match_client
+
+    def set_phase(self, phase: Optional[PhaseOffset]):
+        """
+        设置轮询相位，多开时各实例的轮询互相错开.
+
+        Args:
+            phase (PhaseOffset | None): 轮询相位，为 None 时不对齐。
+        """
+        self.phase = phase
+
+    def set_overlay(self, overlay: Optional[MatchOverlay]):
+        """
+        设置匹配预览记录，预览打开时每轮的截图和匹配结果会交给它.
+
+        Args:
+            overlay (MatchOverlay | None): 预览记录，为 None 时不记录。
+        """
+        self.overlay = overlay
+
+    def _throttle_steps(self) -> Generator:
+        """
+        从调速器取一个匹配令牌，机器忙时 yield Throttle 排队（生成器）.
+        """
+        if self.governor is not None:
+            wait = self.governor.reserve()
+            if wait > 0:
+                yield Throttle(wait)
+
+    def run_match_steps(self, fn: Callable, *args, **kwargs) -> Generator:
+        """
+        执行一次匹配计算（生成器），设置了线程池时提交到线程池，yield Await 等待结果.
+
+        协作模式下等待期间调度线程可以推进其它窗口，各窗口的匹配在线程池中并行执行。
+
+        Args:
+            fn (Callable): 匹配函数。
+
+        Returns:
+            匹配函数的返回值。
+        """
+        # 先从调速器取令牌，机器忙时在这里排队
+        yield from self._throttle_steps()
+        return (yield from self._submit_match_steps(fn, *args, **kwargs))
+
+    def _submit_match_steps(self, fn: Callable, *args, **kwargs) -> Generator:
+        """
+        不取调速器令牌直接执行匹配（生成器），调用方已经取过令牌时使用，参数和返回值同 run_match_steps().
+        """
+        if self.match_pool is None:
+            return fn(*args, **kwargs)
+        return (yield Await(self.match_pool.submit(self._match_owner(), fn, *args, **kwargs)))
+
+    def run_match(self, fn: Callable, *args, **kwargs):
+        """
+        在当前线程中阻塞执行 run_match_steps()，参数和返回值相同.
+        """
+        return drive_steps(self.run_match_steps(fn, *args, **kwargs))
+
+    def _hwnd(self) -> int | None:
+        """
+        当前窗口句柄，尚未设置窗口时返回 None.
+        """
+        return getattr(getattr(self, "window_capture", None), "hwnd", None)
+
+    def _match_owner(self):
+        """
+        匹配线程池中区分队列的键，以窗口句柄区分，保证各窗口公平.
+        """
+        return self._hwnd() or id(self)
+
     def update_config(self, new_cfg: dict):
         """
         更新任务配置.
@@ -123,11 +254,11 @@ class TemplateMatchingTask(Task):
         return True
 
     # --- 截图/模板匹配/点击方法 ---
-    def capture_screenshot(self) -> Optional[np.ndarray]:
+    def capture_screenshot_steps(self) -> Generator:
         """
-        捕获窗口截图。
+        捕获窗口截图（生成器）。
 
-        调用窗口捕获对象的接口来获取当前截图。
+        调用窗口捕获对象的接口来获取当前截图，失败时 yield 一个等待步骤后返回 None。
 
         Returns:
             Optional[np.ndarray]: 窗口截图图像（numpy.ndarray）。
@@ -135,15 +266,25 @@ class TemplateMatchingTask(Task):
         """
         screenshot = self.window_capture.capture()
         if screenshot is None:
-            logger.error("无法捕获窗口图像，稍后重试...")
-            self._sleep(self.capture_retry_delay)
+            logger.event("capture_failed", "无法捕获窗口图像，稍后重试...", level="ERROR", hwnd=self._hwnd(), task=self.get_task_name())
+            yield Sleep(self.capture_retry_delay, task=self)
             return None
+        if self.watchdog is not None:
+            self.watchdog.feed_frame(screenshot)
+        if self.overlay is not None:
+            self.overlay.begin(screenshot)
         return screenshot
 
-    def match_template(self, screenshot: np.ndarray, template: dict, 
-                    screenshot_size: tuple[int, int] | None = None) -> tuple[tuple[int, int], float, tuple[int, int] | None] | None:
+    def capture_screenshot(self) -> Optional[np.ndarray]:
+        """
+        在当前线程中阻塞执行 capture_screenshot_steps()，返回值相同.
         """
-        使用模板匹配方法匹配指定模板。
+        return drive_steps(self.capture_screenshot_steps())
+
+    def match_template_steps(self, screenshot: np.ndarray, template: dict,
+                             screenshot_size: tuple[int, int] | None = None) -> Generator:
+        """
+        使用模板匹配方法匹配指定模板（生成器）。
 
         调用内部模板匹配器，根据输入截图与模板路径进行匹配，
         并返回匹配中心坐标及相似度。若匹配失败，返回 None。
@@ -171,27 +312,70 @@ class TemplateMatchingTask(Task):
             logger.error(f"模板{template_path}缺少 path 或 base_size 参数, rect={template_rect}, base_size={template_base_size}, rect={template_rect}", mode=self.log_mode)
             return None
         
-        # 设置模板并进行匹配
+        if self.match_client is not None and "tiao_guo_ju_qing.png" not in template_path:
+            center, match_val, size = yield from self._match_remote_steps(screenshot, template_path, template_rect, template_base_size)
+        else:
+            center, match_val, size = yield from self.run_match_steps(self._match_template_sync, screenshot, template_path, template_rect, template_base_size)
+        if self.overlay is not None and self.overlay.enabled:
+            threshold = 0.5 if "tiao_guo_ju_qing.png" in template_path else self.match_threshold
+            self.overlay.add(make_match_record(template_path, template_rect, template_base_size, center, match_val, size, threshold))
+        if center is None:
+            return None
+        return (center, match_val, size)
+
+    def match_template(self, screenshot: np.ndarray, template: dict,
+                       screenshot_size: tuple[int, int] | None = None) -> tuple[tuple[int, int], float, tuple[int, int] | None] | None:
+        """
+        在当前线程中阻塞执行 match_template_steps()，参数和返回值相同.
+        """
+        return drive_steps(self.match_template_steps(screenshot, template, screenshot_size))
+    
+    def _match_template_sync(self, screenshot: np.ndarray, template_path: str,
+                             template_rect: tuple[int, int, int, int] | None, template_base_size: tuple[int, int]) -> tuple:
+        """
+        设置模板并进行匹配，在匹配线程池（或任务线程）中执行.
+
+        Returns:
+            tuple: 模板匹配器的匹配结果 (center, match_val, size)。
+        """
         self.template_matcher.set_template(template_path)
         if not "tiao_guo_ju_qing.png" in template_path:
-            match_result = self.template_matcher.match_scaled(
+            return self.template_matcher.match_scaled(
                 screenshot=screenshot, 
                 threshold=self.match_threshold,
                 rect=template_rect,
                 base_size=template_base_size
             )
-        else:
-            match_result = self.template_matcher.pyramid_template_match(screenshot=screenshot, threshold=0.5, base_size=template_base_size)
-
-        center, match_val, size = match_result
-        if center is None:
-            return None
-        return (center, match_val, size)
+        return self.template_matcher.pyramid_template_match(screenshot=screenshot, threshold=0.5, base_size=template_base_size)
     
-    def capture_and_match_template(self, template: dict, 
-                                screenshot_size: tuple[int, int] | None = None) -> tuple[tuple[int, int], float, tuple[int, int]] | None:
+    def _match_remote_steps(self, screenshot: np.ndarray, template_path: str,
+                            template_rect: tuple[int, int, int, int] | None, template_base_size: tuple[int, int]) -> Generator:
         """
-        捕获截图并匹配指定模板。
+        在匹配服务进程中匹配（生成器），服务不可用时改回本进程匹配.
+
+        等待服务返回的请求也放到匹配线程池中执行，协作模式下不阻塞调度线程。
+
+        Returns:
+            tuple: 模板匹配器的匹配结果 (center, match_val, size)。
+        """
+        yield from self._throttle_steps()
+        client = self.match_client
+        args = (screenshot, template_path, self.match_threshold, template_rect, template_base_size)
+        try:
+            if self.match_pool is None:
+                return client.match(*args) # type: ignore
+            return (yield Await(self.match_pool.submit(self._match_owner(), client.match, *args))) # type: ignore
+        except Exception as e:
+            logger.error(f"匹配服务不可用，改为本地匹配: {e}", mode=self.log_mode)
+            self.match_client = None
+            # 这次匹配已经取过令牌，改为本地匹配时不再重复排队
+            return (yield from self._submit_match_steps(self._match_template_sync, screenshot, template_path, template_rect, template_base_size))
+
+    def capture_and_match_template_steps(self, template: dict,
+                                         screenshot_size: tuple[int, int] | None = None) -> Generator:
+        """
+        捕获截图并匹配指定模板（生成器），在 task_steps() 等生成器中使用:
+        `match_result = yield from self.capture_and_match_template_steps(template)`。
 
         先捕获当前窗口图像，再执行模板匹配。
         若匹配成功，可由子类对坐标进行进一步处理。
@@ -206,7 +390,7 @@ class TemplateMatchingTask(Task):
                 匹配结果 (中心坐标, 相似度, 模板尺寸)。未匹配到返回 None。
         """
         # 捕获当前窗口图像
-        screenshot = self.capture_screenshot()
+        screenshot = yield from self.capture_screenshot_steps()
         if screenshot is None:
             return None
         
@@ -215,7 +399,7 @@ class TemplateMatchingTask(Task):
             screenshot_size = self.get_screenshot_size(screenshot)
         
         # 模板匹配
-        match_result = self.match_template(screenshot, template, screenshot_size)
+        match_result = yield from self.match_template_steps(screenshot, template, screenshot_size)
         
         # 特殊处理：子类可以重写此方法来调整模板坐标
         if match_result is not None:
@@ -226,6 +410,13 @@ class TemplateMatchingTask(Task):
         
         return None
 
+    def capture_and_match_template(self, template: dict,
+                                   screenshot_size: tuple[int, int] | None = None) -> tuple[tuple[int, int], float, tuple[int, int]] | None:
+        """
+        在当前线程中阻塞执行 capture_and_match_template_steps()，参数和返回值相同.
+        """
+        return drive_steps(self.capture_and_match_template_steps(template, screenshot_size))
+
     def process_special_templates_point(self, template_path: str, match_result: Optional[tuple], 
                                 screenshot_w: int, screenshot_h: int) -> Optional[tuple]:
         """
@@ -244,9 +435,9 @@ class TemplateMatchingTask(Task):
         # 默认实现：不修改任何坐标
         return match_result
     
-    def match_multiple_templates(self, template_list: list, target_template: dict, match_val_threshold: float = 0.6) -> tuple[tuple[int, int], float, tuple[int, int] | None] | None:
+    def match_multiple_templates_steps(self, template_list: list, target_template: dict, match_val_threshold: float = 0.6) -> Generator:
         """
-        匹配多个模板图片, 若所有图片都匹配成功, 则返回指定图片的坐标以及相似度
+        匹配多个模板图片（生成器）, 若所有图片都匹配成功, 则返回指定图片的坐标以及相似度
 
         Args:
             template_path_list(list): 模板图片路径列表
@@ -256,7 +447,7 @@ class TemplateMatchingTask(Task):
             Optional[Tuple[Tuple[int, int], float, tuple[int, int]]]: 
                 匹配结果 (中心坐标, 相似度, 模板尺寸)。未匹配到返回 None。
         """
-        screenshot = self.capture_screenshot()
+        screenshot = yield from self.capture_screenshot_steps()
         if screenshot is None:
             return None
         
@@ -265,7 +456,7 @@ class TemplateMatchingTask(Task):
         
         target_match_result = None
         for template in template_list:
-            match_result = self.match_template(screenshot, template)
+            match_result = yield from self.match_template_steps(screenshot, template)
             if match_result is None or match_result[1] < match_val_threshold:
                 return None
         if target_template in template_list:
@@ -277,6 +468,12 @@ class TemplateMatchingTask(Task):
                 
         return target_match_result
 
+    def match_multiple_templates(self, template_list: list, target_template: dict, match_val_threshold: float = 0.6) -> tuple[tuple[int, int], float, tuple[int, int] | None] | None:
+        """
+        在当前线程中阻塞执行 match_multiple_templates_steps()，参数和返回值相同.
+        """
+        return drive_steps(self.match_multiple_templates_steps(template_list, target_template, match_val_threshold))
+
     def click_template(self, template_path: str, center: tuple[int, int], size: tuple[int, int] | None = None) -> bool:
         """
         点击匹配到的模板。
@@ -306,11 +503,15 @@ class TemplateMatchingTask(Task):
 
         if self.auto_clicker.click(x, y, random_range=r_range):
             self.add_clicked_template(template_path)
-            logger.info(f"成功点击模板 {template_path}, 坐标: ({x}, {y})", mode=self.log_mode)
+            if self.watchdog is not None:
+                self.watchdog.feed_click(template_path)
+            logger.event("click", "成功点击模板 {template}, 坐标: ({x}, {y})", mode=self.log_mode,
+                         hwnd=self._hwnd(), task=self.get_task_name(), template=template_path, x=x, y=y)
             # print(f"已点击的模板: {self.clicked_templates}")
             return True
         else:
-            logger.error(f"点击模板 {template_path} 失败, 坐标: ({x}, {y})", mode=self.log_mode)
+            logger.event("click_failed", "点击模板 {template} 失败, 坐标: ({x}, {y})", level="ERROR", mode=self.log_mode,
+                         hwnd=self._hwnd(), task=self.get_task_name(), template=template_path, x=x, y=y)
             return False
 
 
@@ -327,7 +528,7 @@ class TemplateMatchingTask(Task):
 
     def _sleep(self, delay: float) -> bool:
             """
-            使用 Event.wait 代替 time.sleep 实现非阻塞延迟。
+            使用时钟的 wait 代替 time.sleep 实现可中断的延迟。
             
             Args:
                 delay: 延迟时间。
@@ -336,7 +537,7 @@ class TemplateMatchingTask(Task):
                 bool: 如果在延迟时间内 stop 事件被设置（任务被要求停止），返回 True。
             """
             # wait 方法会在 event 被 set 时立即返回 True
-            return self._stop_event.wait(delay)
+            return self.clock.wait(self._stop_event, delay)
     
     def _pause_aware_sleep(self, delay: float, is_random: bool = True) -> bool:
         """
@@ -364,11 +565,42 @@ class TemplateMatchingTask(Task):
         if not self._running:
             return True
 
-        # 随机延迟
+        # 执行非阻塞延迟（在延迟期间仍然可以被 stop() 中断）
+        return self._sleep(self.get_sleep_delay(delay, is_random))
+
+    def get_sleep_delay(self, delay: float, is_random: bool = True) -> float:
+        """
+        计算实际等待时间.
+
+        Args:
+            delay: 延迟时间。
+            is_random: 是否使用随机延迟。
+
+        Returns:
+            float: 实际等待时间（秒）。
+        """
         if is_random:
             delay = random.uniform(max(delay - self.rand_delay, delay * 0.8), delay + self.rand_delay)
-        # 执行非阻塞延迟（在延迟期间仍然可以被 stop() 中断）
-        return self._sleep(delay)
+        # 机器忙时按调速器的倍数拉长轮询间隔
+        if self.governor is not None:
+            delay = self.governor.stretch(delay)
+        # 多开时把唤醒时间对齐到本实例的相位，与其它实例错开
+        if self.phase is not None:
+            delay = self.phase.align(self.clock.time(), delay)
+        return delay
+
+    def sleep_step(self, delay: float, is_random: bool = True) -> Sleep:
+        """
+        创建一个等待步骤，在 task_steps() 等生成器中使用: `if (yield self.sleep_step(1)): return`。
+
+        Args:
+            delay: 延迟时间。
+            is_random: 是否使用随机延迟(默认为True)。
+
+        Returns:
+            Sleep: 等待步骤，等待结果为任务是否被要求停止。
+        """
+        return Sleep(self.get_sleep_delay(delay, is_random), task=self)
     
     def reset_clicked_templates(self):
         """
@@ -386,7 +618,7 @@ class TemplateMatchingTask(Task):
             self._running = True
             self._stop_event.clear()  # 确保事件未被设置
             self.clicked_templates.clear()  # 启动时清空点击记录
-            logger.info(f"[{self.get_task_name()}]任务已启动", mode=self.log_mode)
+            logger.event("task_start", "[{task}]任务已启动", mode=self.log_mode, hwnd=self._hwnd(), task=self.get_task_name())
 
     def stop(self):
         """
@@ -396,20 +628,30 @@ class TemplateMatchingTask(Task):
             self._running = False
             self.clicked_templates.clear()  # 停止时清空点击记录
             self._stop_event.set()  # 设置事件，通知任务停止
-            logger.info(f"[{self.get_task_name()}]任务已停止", mode=self.log_mode)
+            duration = round(self.clock.time() - self.start_time, 2) if self.start_time is not None else None
+            logger.event("task_stop", "[{task}]任务已停止", mode=self.log_mode, hwnd=self._hwnd(), task=self.get_task_name(), duration=duration)
 
     @abstractmethod
-    def execute_task_logic(self):
+    def task_steps(self) -> Generator:
         """
-        执行具体的任务逻辑。
+        以生成器形式定义的任务逻辑。
 
-        子类必须实现此方法来定义任务执行流程。
+        子类必须实现此方法来定义任务执行流程，需要等待时 yield 一个 Step
+        （如 self.sleep_step()），而不是直接阻塞当前线程，
+        这样同一份逻辑既能在独立线程中运行，也能交给协作式调度器与其它窗口共用一个线程。
         """
         pass
 
-    def check_timeout(self) -> bool:
+    def execute_task_logic(self):
         """
-        检查任务是否已超时。
+        在当前线程中阻塞执行任务逻辑。
+        """
+        return drive_steps(self.task_steps())
+
+    def check_timeout_steps(self) -> Generator:
+        """
+        检查任务是否已超时（生成器），卡住时执行的恢复动作需要截图、匹配和等待:
+        `if (yield from self.check_timeout_steps()): return`。
 
         Returns:
             bool: 如果超时或未设置 timeout，返回 True；否则返回 False。
@@ -417,20 +659,125 @@ class TemplateMatchingTask(Task):
         if self.task_timeout is None or self.start_time is None:
             return False # 如果没有设置超时，则不中断
             
-        if (time.time() - self.start_time) > self.task_timeout:
+        if (self.clock.time() - self.start_time) > self.task_timeout:
             logger.warning(f"任务 {self.get_task_name()} 已超时 ({self.task_timeout} 秒)，正在停止。")
             self.stop()
             return True
+
+        # 卡死检测：画面和决策长时间无变化时逐级恢复
+        if self.watchdog is not None:
+            self.watchdog.feed_state(self.get_state_name())
+            action = self.watchdog.check()
+            if action != StuckWatchdog.ACTION_NONE:
+                return (yield from self.recover_from_stuck_steps(action))
         return False
 
+    def check_timeout(self) -> bool:
+        """
+        在当前线程中阻塞执行 check_timeout_steps()，返回值相同.
+        """
+        return drive_steps(self.check_timeout_steps())
+
+    def recover_from_stuck_steps(self, action: int) -> Generator:
+        """
+        执行看门狗给出的恢复动作（生成器）.
+
+        Args:
+            action (int): StuckWatchdog.ACTION_* 中的一个。
+
+        Returns:
+            bool: 需要结束当前任务时返回 True，否则返回 False。
+        """
+        action_name = StuckWatchdog.ACTION_NAMES.get(action, str(action))
+        logger.warning(f"[{self.get_task_name()}]画面和操作已 {self.watchdog.stuck_timeout} 秒无变化，尝试恢复: {action_name}", mode=self.log_mode) # type: ignore
+
+        if action == StuckWatchdog.ACTION_CLOSE_POPUP:
+            yield from self.close_popup_steps()
+            return False
+        if action == StuckWatchdog.ACTION_REOPEN_ACTIVITY:
+            yield from self.close_popup_steps()
+            self.reset_progress()
+            return False
+        if action == StuckWatchdog.ACTION_RESTART_TASK:
+            self.restart_requested = True
+            self.stop()
+            return True
+
+        logger.error(f"[{self.get_task_name()}]多次恢复无效，放弃当前任务", mode=self.log_mode)
+        self.stop()
+        return True
+
+    def recover_from_stuck(self, action: int) -> bool:
+        """
+        在当前线程中阻塞执行 recover_from_stuck_steps()，参数和返回值相同.
+        """
+        return drive_steps(self.recover_from_stuck_steps(action))
+
+    def close_popup_steps(self) -> Generator:
+        """
+        尝试点击关闭按钮关闭当前弹窗（活动界面）（生成器）.
+
+        Returns:
+            bool: 找到并点击了关闭按钮返回 True。
+        """
+        close_template = template_img.TEMPLAET.get("huo_dong_close")
+        if not close_template:
+            return False
+        screenshot = yield from self.capture_screenshot_steps()
+        if screenshot is None:
+            return False
+        match_result = yield from self.match_template_steps(screenshot, close_template)
+        if match_result is None:
+            return False
+        center, _, size = match_result
+        # 关闭按钮不计入点击记录，直接点击
+        if self.auto_clicker.click(center[0], center[1], random_range=size or 5):
+            yield Sleep(self.click_delay, task=self)
+            return True
+        return False
+
+    def close_popup(self) -> bool:
+        """
+        在当前线程中阻塞执行 close_popup_steps()，返回值相同.
+        """
+        return drive_steps(self.close_popup_steps())
+
+    def reset_progress(self):
+        """
+        重置任务进度，使任务从打开活动开始重新执行.
+        子类可重写此方法以重置自身的状态机。
+        """
+        self.clicked_templates.clear()
+
+    def get_state_name(self) -> str | None:
+        """
+        获取当前状态类名，供卡死检测使用.
+
+        Returns:
+            str | None: 当前状态类名，没有状态机的任务返回 None。
+        """
+        current_state = getattr(self, "current_state", None)
+        if current_state is None:
+            return None
+        return current_state.__class__.__name__
+
     def run(self):
             """
             任务主入口，在执行具体逻辑前记录开始时间。
             """
+            drive_steps(self.run_steps())
+
+    def run_steps(self) -> Generator:
+            """
+            生成器形式的任务主入口，供协作式调度器使用，流程与 run() 相同。
+            """
             self.start() # 调用 start() 设置 _running = True
-            self.start_time = time.time() # 记录任务开始时间
+            self.start_time = self.clock.time() # 记录任务开始时间
+            self.restart_requested = False
+            if self.watchdog is not None:
+                self.watchdog.reset()
             try:
-                self.execute_task_logic()
+                yield from self.task_steps()
             except Exception as e:
                 logger.error(f"任务 {self.get_task_name()} 执行逻辑出错: {e}")
             finally:
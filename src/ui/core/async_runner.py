@@ -0,0 +1,259 @@
+import asyncio
+import threading
+from concurrent.futures import Executor
+from ...modules.clock import Clock
+from ...modules.interfaces import FrameSource, InputDevice
+from ...modules.match_pool import MatchPool
+from ...modules.steps import Await, Sleep, Throttle, WaitTemplate
+from .task_runner import TaskRunner
+from ..core.logger import logger
+
+_shared_loop: asyncio.AbstractEventLoop | None = None
+_shared_loop_lock = threading.Lock()
+
+
+def get_shared_loop() -> asyncio.AbstractEventLoop:
+    """
+    获取在后台线程中运行的共享事件循环，首次调用时启动.
+
+    Returns:
+        asyncio.AbstractEventLoop: 事件循环。
+    """
+    global _shared_loop
+    with _shared_loop_lock:
+        if _shared_loop is None or _shared_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="AsyncTaskRunner", daemon=True).start()
+            _shared_loop = loop
+        return _shared_loop
+
+
+class AsyncTaskRunner(TaskRunner):
+    """
+    基于 asyncio 的任务执行器，接口和信号与 TaskRunner 相同.
+
+    任务队列的步骤生成器由事件循环驱动：等待映射为 asyncio.sleep / asyncio.Event，
+    两次等待之间的截图、匹配和点击通过 run_in_executor 放到线程池执行，不阻塞事件循环；
+    提交到匹配线程池的匹配（Await）通过 asyncio.wrap_future 等待，不占用事件循环的线程池。
+    MultipleProcessManager 中通过 start() 交给后台的共享事件循环运行；
+    无界面的命令行可以在自己的事件循环中直接 `await runner.run(...)`。
+    取消运行中的协程（cancel()）会关闭步骤生成器，任务和执行器的收尾逻辑照常执行。
+    """
+    PAUSE_POLL_INTERVAL = 0.2 # 暂停时检查停止的间隔（秒）
+
+    def __init__(self, log_mode: int = 0, wincap: FrameSource | None = None, clicker: InputDevice | None = None,
+                 clock: Clock | None = None, pool: MatchPool | None = None,
+                 loop: asyncio.AbstractEventLoop | None = None, executor: Executor | None = None):
+        """
+        Args:
+            loop(asyncio.AbstractEventLoop | None): 运行任务的事件循环，默认使用后台共享事件循环
+            executor(Executor | None): 执行截图和匹配的线程池，默认使用事件循环的默认线程池，其余参数同 TaskRunner
+        """
+        super().__init__(log_mode, wincap=wincap, clicker=clicker, clock=clock, pool=pool)
+        self._loop = loop
+        self.executor = executor
+        self._future = None
+        self._stop_async: asyncio.Event | None = None   # 停止事件，在事件循环线程中设置
+        self._resume_async: asyncio.Event | None = None # 未暂停时处于设置状态
+
+    async def run(self, tasks: list, hwnd: int, loop_count: int = 1, timeout: int = 600, stuck_timeout: float = 60):
+        """
+        在当前事件循环中运行任务队列，直到运行结束
+        Args:
+            tasks(list): 任务实例列表
+            hwnd(int): 目标窗口句柄
+            loop_count(int): 循环次数
+            timeout(int): 单个任务超时时间
+            stuck_timeout(float): 卡死检测时间（秒）
+        """
+        self._loop = asyncio.get_running_loop()
+        self.start(tasks, hwnd, loop_count=loop_count, timeout=timeout, stuck_timeout=stuck_timeout)
+        if self._future is not None:
+            await self._future
+
+    def _launch(self, tasks, loop_count, timeout):
+        """
+        把任务队列交给事件循环运行
+        """
+        if self._loop is None:
+            self._loop = get_shared_loop()
+        coro = self._drive(self._loop_steps(tasks, loop_count, timeout))
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._future = self._loop.create_task(coro)
+        else:
+            self._future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    @staticmethod
+    def _advance(steps, value, error=None):
+        """
+        推进步骤生成器一步（在线程池中执行），error 不为 None 时把异常抛回生成器。
+        StopIteration 不能放进 Future，转换为 (是否结束, 值)
+        """
+        try:
+            if error is not None:
+                return False, steps.throw(error)
+            return False, steps.send(value)
+        except StopIteration as e:
+            return True, e.value
+
+    async def _drive(self, steps):
+        """
+        在事件循环中驱动步骤生成器
+        """
+        loop = asyncio.get_running_loop()
+        self._stop_async = asyncio.Event()
+        self._resume_async = asyncio.Event()
+        if self._stop_event.is_set():
+            self._stop_async.set()
+        if not self._is_paused:
+            self._resume_async.set()
+
+        pending = None
+        value = None
+        error = None
+        try:
+            while True:
+                pending = loop.run_in_executor(self.executor, self._advance, steps, value, error)
+                # shield: 取消时线程池中的这一步仍在执行，需要等它结束才能关闭生成器
+                done, step = await asyncio.shield(pending)
+                pending = None
+                if done:
+                    return
+                value, error = None, None
+                try:
+                    value = await self._await_step(step)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # 匹配等步骤中的异常抛回生成器，由任务自己处理
+                    error = e
+        except asyncio.CancelledError:
+            logger.info("任务队列协程被取消", mode=1)
+            self._stop_event.set()
+            if self._current_task is not None:
+                self._current_task.stop()
+            if pending is not None:
+                await asyncio.wait({pending})
+            steps.close()
+            self.status_msg_changed.emit("已停止")
+            self.stopped.emit()
+            raise
+        except Exception as e:
+            logger.error(f"任务队列发生未捕获异常: {e}", mode=self.log_mode)
+            self.status_msg_changed.emit("异常终止")
+            steps.close()
+        finally:
+            self._future = None
+
+    def _stopped(self, step) -> bool:
+        """
+        执行器或步骤所属的任务是否已被要求停止
+        """
+        task = getattr(step, "task", None)
+        return self._stop_event.is_set() or (task is not None and not task.running)
+
+    async def _wait_resumed(self, step) -> bool:
+        """
+        暂停时等待恢复
+        Returns:
+            bool: 可以继续执行返回 True，被要求停止返回 False
+        """
+        while self._is_paused and not self._stopped(step):
+            try:
+                await asyncio.wait_for(self._resume_async.wait(), self.PAUSE_POLL_INTERVAL) # type: ignore
+            except asyncio.TimeoutError:
+                pass
+        return not self._stopped(step)
+
+    async def _sleep(self, seconds: float, step) -> bool:
+        """
+        可被停止打断的等待，虚拟时钟下不占用真实时间
+        Returns:
+            bool: 被要求停止返回 True
+        """
+        delay = self.clock.real_delay(seconds)
+        if delay > 0:
+            try:
+                await asyncio.wait_for(self._stop_async.wait(), delay) # type: ignore
+            except asyncio.TimeoutError:
+                pass
+        else:
+            await asyncio.sleep(0)
+        return self._stopped(step)
+
+    async def _await_step(self, step):
+        """
+        完成一个等待步骤，返回 send 回生成器的结果（与阻塞执行时一致）
+        """
+        if isinstance(step, Sleep):
+            if not await self._wait_resumed(step):
+                return True
+            if await self._sleep(step.seconds, step):
+                return True
+            # 等待期间被暂停时，等恢复后再继续
+            return not await self._wait_resumed(step)
+
+        if isinstance(step, Await):
+            # 匹配线程池中的计算，不受停止和暂停影响
+            return await asyncio.wrap_future(step.future)
+        if isinstance(step, Throttle):
+            # 与 Sleep 一样按任务的时钟等待，停止时提前结束；结果总是 None
+            await self._sleep(step.seconds, step)
+            return None
+
+        loop = asyncio.get_running_loop()
+        if isinstance(step, WaitTemplate):
+            deadline = self.clock.time() + step.timeout
+            while True:
+                if not await self._wait_resumed(step):
+                    return None
+                result = await loop.run_in_executor(self.executor, step.poll)
+                if result is not None or self.clock.time() >= deadline:
+                    return result
+                if await self._sleep(step.interval, step):
+                    return None
+
+        # 未知步骤：在线程池中阻塞执行
+        return await loop.run_in_executor(self.executor, step.run_blocking, self._wait)
+
+    def _notify(self, event: asyncio.Event | None, value: bool):
+        """
+        从其它线程设置或清除事件循环中的事件
+        """
+        if self._loop is None or event is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(event.set if value else event.clear)
+
+    def stop(self):
+        """
+        停止执行
+        """
+        super().stop()
+        self._notify(self._stop_async, True)
+        self._notify(self._resume_async, True)
+
+    def pause(self):
+        """
+        暂停执行
+        """
+        super().pause()
+        if self._is_paused:
+            self._notify(self._resume_async, False)
+
+    def resume(self):
+        """
+        恢复执行
+        """
+        super().resume()
+        self._notify(self._resume_async, True)
+
+    def cancel(self):
+        """
+        取消运行中的协程，生成器被关闭后执行器回到未运行状态
+        """
+        if self._future is not None:
+            self._future.cancel()
@@ -0,0 +1,67 @@
+from ...modules.coop_scheduler import CoopScheduler, coop_scheduler
+from ...modules.clock import Clock
+from ...modules.interfaces import FrameSource, InputDevice
+from ...modules.match_pool import MatchPool
+from .task_runner import TaskRunner
+from ..core.logger import logger
+
+
+class CoopRunner(TaskRunner):
+    """
+    协作式任务执行器，接口和信号与 TaskRunner 相同.
+
+    不为每个窗口创建线程，而是把任务队列的步骤生成器交给共享的 CoopScheduler，
+    所有窗口的等待都放在同一个定时堆里，由一个调度线程轮流推进。
+    """
+
+    def __init__(self, log_mode: int = 0, wincap: FrameSource | None = None, clicker: InputDevice | None = None,
+                 clock: Clock | None = None, pool: MatchPool | None = None, scheduler: CoopScheduler | None = None):
+        """
+        Args:
+            scheduler(CoopScheduler | None): 协作式调度器，默认使用全局的 coop_scheduler，其余参数同 TaskRunner
+        """
+        super().__init__(log_mode, wincap=wincap, clicker=clicker, clock=clock, pool=pool)
+        self.scheduler = scheduler if scheduler is not None else coop_scheduler
+        self._job = None
+
+    def _launch(self, tasks, loop_count, timeout):
+        """
+        把任务队列交给调度器运行
+        """
+        self._job = self.scheduler.spawn(
+            self._loop_steps(tasks, loop_count, timeout),
+            clock=self.clock,
+            should_stop=self._stop_event.is_set,
+            is_paused=lambda: self._is_paused,
+            on_done=self._on_done
+        )
+
+    def _on_done(self, result, error):
+        """
+        任务队列结束（在调度线程中调用）
+        """
+        if error is not None:
+            logger.error(f"协作任务队列异常退出: {error}", mode=self.log_mode)
+            self._is_running = False
+        self._job = None
+
+    def _wake(self):
+        """
+        让调度器立即重新检查本执行器
+        """
+        if self._job is not None:
+            self.scheduler.wake(self._job)
+
+    def stop(self):
+        """
+        停止执行
+        """
+        super().stop()
+        self._wake()
+
+    def resume(self):
+        """
+        恢复执行
+        """
+        super().resume()
+        self._wake()
@@ -1,8 +1,13 @@
-import win32gui
 import re
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import QObject, Signal, QTimer
 from .process_item import ProcessItem
 from ..core.logger import logger
+from ..models.task_cfg_model import task_cfg_model
+from ...modules.thread_budget import thread_budget
+from ...modules.cpu_governor import cpu_governor
+from ...modules.match_server import match_server, parse_cpu_list
+from ...modules.phase import PhaseOffset
+from ...modules.frame_cache import frame_cache
 
 class MultipleProcessManager(QObject):
     """
@@ -10,11 +15,134 @@ class MultipleProcessManager(QObject):
     """
     process_item_changed = Signal(object)  # 进程项变化信号
     task_status_changed = Signal(int, object) # 任务状态变化信号
+    task_status_batch_changed = Signal(object) # 一个刷新周期内的状态变化，参数为 {hwnd: 状态}
+    governor_stats_changed = Signal(object) # CPU 调速状态信号，参数为 CpuGovernor.get_stats() 的结果
+    GOVERNOR_REPORT_INTERVAL = 2000         # 调速状态上报间隔（毫秒）
+    STATUS_REFRESH_INTERVAL = 200           # 实例状态刷新到界面的间隔（毫秒）
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, desktop=None):
+        """
+        Args:
+            parent: 父对象
+            desktop(SimDesktop | None): 模拟桌面，传入后所有窗口都由模拟器提供，用于无游戏客户端时的压测
+        """
         super().__init__(parent)
         self.items: dict[int, ProcessItem] = {} # hwnd -> ProcessItem
         self.log_mode: int = 3
+        self.desktop = desktop
+        self._pending_starts: dict[int, QTimer] = {} # hwnd -> 等待错开启动的定时器
+
+        # 匹配线程池、OpenCV 和 ONNX Runtime 的线程数按配置的预算和实例数统一分配
+        self._apply_thread_budget_cfg(task_cfg_model.task_cfg)
+        task_cfg_model.task_cfg_updated.connect(self._apply_thread_budget_cfg)
+
+        # 全局 CPU 调速器，限制所有窗口的总匹配速率
+        self.governor = cpu_governor
+        self._throttling = False
+        self._apply_governor_cfg(task_cfg_model.task_cfg)
+        task_cfg_model.task_cfg_updated.connect(self._apply_governor_cfg)
+        self._governor_timer = QTimer(self)
+        self._governor_timer.setInterval(self.GOVERNOR_REPORT_INTERVAL)
+        self._governor_timer.timeout.connect(self._report_governor)
+        self._governor_timer.start()
+
+        # 实例状态按固定频率合并刷新，界面开销与状态变化频率无关
+        self._status_timer = QTimer(self)
+        self._status_timer.setInterval(self.STATUS_REFRESH_INTERVAL)
+        self._status_timer.timeout.connect(self._flush_status)
+        self._status_timer.start()
+
+        # 独立的匹配服务进程，按配置启动或停止
+        self._match_server_cpus = None
+        self._apply_match_server_cfg(task_cfg_model.task_cfg)
+        task_cfg_model.task_cfg_updated.connect(self._apply_match_server_cfg)
+
+    def _apply_thread_budget_cfg(self, cfg: dict):
+        """
+        按配置设置线程预算.
+
+        Args:
+            cfg (dict): 任务配置。
+        """
+        thread_budget.configure(cfg.get("thread_budget", 0), cfg.get("match_workers", 0))
+        self._apply_thread_budget()
+
+    def _apply_thread_budget(self):
+        """
+        实例数变化后重新分配线程.
+        """
+        plan = thread_budget.apply(len(self.items))
+        logger.info(f"线程预算 {plan['budget']}: {plan['instances']} 个实例, 匹配线程 {plan['match_workers']}, "
+                    f"OpenCV 线程 {plan['cv2_threads']}, ONNX 线程 {plan['ort_intra_op']}", mode=1)
+
+    def _apply_governor_cfg(self, cfg: dict):
+        """
+        按配置设置 CPU 调速器.
+
+        Args:
+            cfg (dict): 任务配置。
+        """
+        self.governor.configure(cfg.get("max_match_rate", 0), cfg.get("max_cpu_percent", 0))
+
+    def _apply_match_server_cfg(self, cfg: dict):
+        """
+        按配置启动或停止匹配服务进程，绑定的 CPU 变化时重启服务；不会停止由其它地方启动的服务.
+
+        Args:
+            cfg (dict): 任务配置。
+        """
+        owned = self._match_server_cpus is not None
+        if not cfg.get("match_server", False):
+            if owned and match_server.is_running():
+                match_server.stop()
+                logger.info("匹配服务已停止，新启动的任务将在本进程匹配", mode=self.log_mode)
+            self._match_server_cpus = None
+            return
+        try:
+            cpus = parse_cpu_list(cfg.get("match_server_cpus", ""))
+        except ValueError:
+            logger.warning(f"匹配服务绑定 CPU 格式错误: {cfg.get('match_server_cpus')}，不限制 CPU", mode=self.log_mode)
+            cpus = []
+        if match_server.is_running():
+            if not owned or cpus == self._match_server_cpus:
+                return
+            # 运行中的任务连接断开后会自动改回本地匹配
+            match_server.stop()
+        try:
+            match_server.start(affinity=cpus)
+        except Exception as e:
+            logger.error(f"匹配服务启动失败，将在本进程匹配: {e}", mode=self.log_mode)
+            return
+        self._match_server_cpus = cpus
+        logger.info(f"匹配服务已启动 (PID: {match_server.pid}, CPU: {cpus or '不限'})", mode=self.log_mode)
+
+    def _report_governor(self):
+        """
+        定时上报调速状态，开始或停止限速时写日志.
+        """
+        if not self.governor.enabled and not self._throttling:
+            return
+        stats = self.governor.get_stats()
+        throttling = stats["enabled"] and stats["stretch"] > 1.05
+        if throttling and not self._throttling:
+            logger.warning(f"CPU 负载过高，已限速: 匹配 {stats['rate']} 次/秒 (需求 {stats['demand']} 次/秒)，"
+                           f"轮询间隔拉长 {stats['stretch']:.2f} 倍", mode=self.log_mode)
+        elif not throttling and self._throttling:
+            logger.info(f"CPU 负载恢复，已解除限速 (累计排队 {stats['throttled']} 次, {stats['wait_total']} 秒)", mode=self.log_mode)
+        self._throttling = throttling
+        self.governor_stats_changed.emit(stats)
+
+    def _flush_status(self):
+        """
+        定时收集各实例自上次刷新以来的状态变化，合并为一次信号发出.
+        """
+        batch = {}
+        for hwnd, item in list(self.items.items()):
+            status = item.flush_status()
+            if status is not None:
+                batch[hwnd] = status
+        if batch:
+            self.task_status_batch_changed.emit(batch)
 
     def add_item(self, hwnd, name="", tasks: list=[]):
         """
@@ -26,7 +154,7 @@ class MultipleProcessManager(QObject):
         
         try:
             # 创建 ProcessItem
-            item = ProcessItem(hwnd, name, multi_run=True, tasks=tasks)
+            item = ProcessItem(hwnd, name, multi_run=True, tasks=tasks, desktop=self.desktop)
             # 连接任务状态变化信号
             item.task_model_status_signal.connect(self._emit_task_status_changed)
             logger.info(f"添加任务线程成功: {item.handle} - {item.name}", mode=4)
@@ -35,14 +163,18 @@ class MultipleProcessManager(QObject):
             return None
             
         self.items[hwnd] = item
+        self._apply_thread_budget()
         self.process_item_changed.emit(self.get_all_items())
         return item
 
     def remove_item(self, hwnd: int):
+        self.cancel_pending_starts(hwnd)
         if hwnd in self.items:
             name = self.items[hwnd].name
             self.items[hwnd].kill_process() # 停止并销毁线程
             del self.items[hwnd]
+            frame_cache.remove(hwnd)
+            self._apply_thread_budget()
             self.process_item_changed.emit(self.get_all_items())
             logger.info(f"移除成功: {hwnd} - {name}", mode=self.log_mode)
         else:
@@ -54,9 +186,13 @@ class MultipleProcessManager(QObject):
         """
         if not self.items:
             return
+        self.cancel_pending_starts()
         for item in self.items.values():
             item.kill_process()
+        for hwnd in self.items:
+            frame_cache.remove(hwnd)
         self.items.clear()
+        self._apply_thread_budget()
         self.process_item_changed.emit(self.get_all_items())
         logger.info(f"已清空所有任务", mode=self.log_mode)
 
@@ -91,7 +227,10 @@ class MultipleProcessManager(QObject):
         Returns:
             list: 所有匹配的窗口句柄列表.
         """
-        # 这个方法保持不变，因为它只是查找窗口句柄
+        if self.desktop is not None:
+            return self.desktop.get_windows_by_filter(target_title_part)
+
+        import win32gui
         target_handles = []
         def callback(hwnd, extra):
             window_title = win32gui.GetWindowText(hwnd)
@@ -140,7 +279,9 @@ class MultipleProcessManager(QObject):
         Args:
             item (ProcessItem): 要启动的 ProcessItem 实例.
         """
-        if item: item.start_process()
+        if item:
+            self.cancel_pending_starts(item.handle)
+            item.start_process()
         
     def stop_item(self, item: ProcessItem):
         """
@@ -149,4 +290,66 @@ class MultipleProcessManager(QObject):
         Args:
             item (ProcessItem): 要停止的 ProcessItem 实例.
         """
-        if item: item.stop_process()
+        if item:
+            self.cancel_pending_starts(item.handle)
+            item.stop_process()
+
+    def start_all(self, items: list[ProcessItem] | None = None, stagger: float | None = None):
+        """
+        错开启动多个 ProcessItem 实例，并为它们分配互相错开的轮询相位.
+
+        同时启动的实例会在同一时刻截图匹配，CPU 占用呈周期性尖峰，点击节奏也完全一致；
+        依次间隔启动并错开轮询相位后负载更平滑，每个实例需要的峰值 CPU 更低。
+
+        Args:
+            items (list[ProcessItem] | None): 要启动的实例，默认启动全部。
+            stagger (float | None): 相邻两个实例启动的间隔（秒），默认使用配置中的 start_stagger。
+        """
+        items = list(self.items.values()) if items is None else [item for item in items if item]
+        if stagger is None:
+            stagger = task_cfg_model.task_cfg.get("start_stagger", 0)
+        count = len(items)
+        for index, item in enumerate(items):
+            self.cancel_pending_starts(item.handle)
+            item.set_phase(PhaseOffset(index, count))
+            delay = int(index * stagger * 1000)
+            if delay <= 0:
+                item.start_process()
+                continue
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(lambda item=item: self._start_pending(item))
+            self._pending_starts[item.handle] = timer
+            timer.start(delay)
+        if count > 1 and stagger > 0:
+            logger.info(f"{count} 个窗口将每隔 {stagger} 秒依次启动", mode=self.log_mode)
+
+    def _start_pending(self, item: ProcessItem):
+        """
+        错开启动的定时器到点，启动对应实例.
+        """
+        timer = self._pending_starts.pop(item.handle, None)
+        if timer is not None:
+            timer.deleteLater()
+        if self.items.get(item.handle) is item:
+            item.start_process()
+
+    def cancel_pending_starts(self, hwnd: int | None = None):
+        """
+        取消尚未到点的错开启动.
+
+        Args:
+            hwnd (int | None): 窗口句柄，为 None 时取消全部。
+        """
+        handles = list(self._pending_starts) if hwnd is None else [hwnd]
+        for handle in handles:
+            timer = self._pending_starts.pop(handle, None)
+            if timer is not None:
+                timer.stop()
+                timer.deleteLater()
+
+    def has_pending_start(self, hwnd: int) -> bool:
+        """
+        指定窗口是否正在等待错开启动.
+        """
+        return hwnd in self._pending_starts
@@ -1,7 +1,7 @@
 from PySide6.QtCore import QObject, Signal
 from ..core.task_runner import TaskRunner
-from ..core.window_manager import WindowManager
 from ..models.task_data_model import TaskDataModel
+from ..models.task_cfg_model import task_cfg_model
 from ..core.logger import logger
 
 class ProcessItem(QObject):
@@ -20,15 +20,29 @@ class ProcessItem(QObject):
     # 定义任务状态信号，用于通知 UI 更新任务状态
     task_model_status_signal = Signal(int, object) 
 
-    def __init__(self, handle: int, name: str = "", tasks: list[str] = [], multi_run: bool = False):
+    def __init__(self, handle: int, name: str = "", tasks: list[str] = [], multi_run: bool = False, desktop=None):
+        """
+        Args:
+            handle(int): 窗口句柄
+            name(str): 显示名称
+            tasks(list[str]): 任务名称列表
+            multi_run(bool): 是否为多开模式
+            desktop(SimDesktop | None): 模拟桌面，为 None 时连接真实窗口
+        """
         super().__init__()
         self.handle = handle
         self.name = name
         self.multi_run = multi_run
         
-        self.window_manager = WindowManager()
+        if desktop is None:
+            # 延迟导入，模拟器模式下不依赖 win32
+            from ..core.window_manager import WindowManager
+            self.window_manager = WindowManager()
+            self.runner = self._create_runner()
+        else:
+            self.window_manager = desktop.create_window_manager()
+            self.runner = desktop.create_runner(handle)
         self.data_model = TaskDataModel()
-        self.runner = TaskRunner()
 
         # 初始配置
         self.data_model.add_tasks_by_names(tasks)
@@ -39,12 +53,33 @@ class ProcessItem(QObject):
             "progress": 0,
             "is_paused": False
         }
+        self._status_dirty = False # 状态有变化但还没有通知 UI
 
         self._bind_signals()
 
         # 自动连接窗口
         self.window_manager.connect_by_hwnd(handle)
 
+    def _create_runner(self):
+        """
+        根据配置的运行方式创建任务执行器.
+
+        Returns:
+            TaskRunner | ProcessRunner | CoopRunner | AsyncTaskRunner: "process" 模式下在子进程中运行，
+            "coop" 模式下交给共享的协作式调度线程，"async" 模式下交给共享的 asyncio 事件循环，否则在本进程的独立线程中运行
+        """
+        execution_mode = task_cfg_model.task_cfg.get("execution_mode", "thread")
+        if execution_mode == "process":
+            from .process_runner import ProcessRunner
+            return ProcessRunner()
+        if execution_mode == "coop":
+            from .coop_runner import CoopRunner
+            return CoopRunner()
+        if execution_mode == "async":
+            from .async_runner import AsyncTaskRunner
+            return AsyncTaskRunner()
+        return TaskRunner()
+
     def _bind_signals(self):
         """
         连接各组件的信号到内部处理函数
@@ -65,7 +100,7 @@ class ProcessItem(QObject):
 
     def _update_status(self, overall=None, task=None, progress=None, paused=None):
         """
-        统一更新状态缓存并发送信号给 UI
+        统一更新状态缓存，标记为待通知，由管理器定时调用 flush_status() 合并发送给 UI
         """
         if overall is not None:
             self._status_cache["overall_status"] = overall
@@ -88,8 +123,22 @@ class ProcessItem(QObject):
                 self._status_cache["overall_status"] = "运行中"
                 self.status_signal.emit("运行中")
 
-        # 发送完整的状态对象给 PageMultiple
-        self.task_model_status_signal.emit(self.handle, self._status_cache)
+        self._status_dirty = True
+
+    def flush_status(self) -> dict | None:
+        """
+        状态有变化时发送一次最新状态，两次调用之间的多次变化合并为一次.
+
+        Returns:
+            dict | None: 发送的状态快照，没有变化时返回 None。
+        """
+        if not self._status_dirty:
+            return None
+        # 先清标记再取快照，取快照时发生的变化留到下一次发送
+        self._status_dirty = False
+        status = dict(self._status_cache)
+        self.task_model_status_signal.emit(self.handle, status)
+        return status
 
     def start_process(self):
         """
@@ -108,7 +157,17 @@ class ProcessItem(QObject):
             return
 
         # 启动 Runner (传入任务列表和句柄)
-        self.runner.start(tasks, self.handle)
+        self.runner.start(tasks, self.handle, stuck_timeout=task_cfg_model.task_cfg.get("stuck_timeout", 60))
+
+    def set_phase(self, phase):
+        """
+        设置轮询相位，多开时由 MultipleProcessManager 分配.
+
+        Args:
+            phase (PhaseOffset | None): 轮询相位。
+        """
+        if hasattr(self.runner, "set_phase"):
+            self.runner.set_phase(phase)
 
     def stop_process(self):
         """
@@ -0,0 +1,255 @@
+import queue
+import threading
+import multiprocessing
+from PySide6.QtCore import QObject, Signal
+from ...modules.shared_frame import SharedFrameBuffer
+from ...modules.thread_budget import thread_budget
+from ...modules.match_server import match_server
+from ...modules.frame_cache import FrameCache
+from ...modules.match_overlay import MatchOverlay
+from ...modules.process_worker import child_main
+from ..models.task_cfg_model import task_cfg_model
+from ..core.logger import logger
+
+class ProcessRunner(QObject):
+    """
+    在子进程中运行任务队列，接口和信号与 TaskRunner 相同.
+
+    子进程中运行一个完整的 TaskRunner（入口见 src/modules/process_worker.py，不导入界面模块），
+    状态信号和日志通过队列传回主进程后重新发出，
+    打开匹配预览时截图画面写入共享内存，主进程可以通过 get_latest_frame() 读取。
+    状态逻辑、日志和 NumPy 处理都在子进程中执行，不再与界面和其它窗口争抢同一个 GIL。
+    """
+    started = Signal()
+    finished = Signal()
+    stopped = Signal()
+    paused = Signal()
+    resumed = Signal()
+    status_msg_changed = Signal(str)
+    progress_changed = Signal(int)
+    current_task_changed = Signal(str, int)
+
+    def __init__(self, log_mode: int = 0):
+        super().__init__()
+        self.log_mode = log_mode
+        self._ctx = multiprocessing.get_context("spawn") # 主进程中有 Qt 和多个线程，只能用 spawn 启动
+        self._process = None
+        self._cmd_queue = None
+        self._event_queue = None
+        self._listener = None
+        self._frame_buffer: SharedFrameBuffer | None = None
+        self._thumbnail_buffer: SharedFrameBuffer | None = None # 子进程写入的缩略图
+        self._thumbnail = (0, None)             # 最近读到的 (序号, 缩略图)，子进程退出后继续显示
+        self._thumbnail_seq = 0                 # 本次运行的缩略图共享内存中最近读到的序号
+        self._frame_lock = threading.Lock()     # 防止读取画面时共享内存被释放
+        self.overlay = MatchOverlay()           # 子进程转发的匹配预览记录，没有截图引用
+        self._preview = (False, None)           # 匹配预览 (是否打开, 帧率)，启动时传给子进程
+        self._overlay_frame = (0, None)         # 预览使用的 (轮次序号, 截图)
+        self._log_context = {"hwnd": None, "task": None} # 子进程日志所属的窗口和任务，在监听线程中用于日志索引
+        self._is_running = False
+        self._is_paused = False
+        self.phase = None                       # 轮询相位，启动时传给子进程
+
+    def set_phase(self, phase):
+        """
+        设置轮询相位，下次启动时传给子进程
+        Args:
+            phase(PhaseOffset | None): 轮询相位
+        """
+        self.phase = phase
+
+    def is_running(self) -> bool:
+        """
+        获取当前任务队列是否正在运行
+        Returns:
+            bool: 是否正在运行
+        """
+        return self._is_running
+
+    def start(self, tasks: list, hwnd: int, loop_count: int = 1, timeout: int = 600, stuck_timeout: float = 60):
+        """
+        启动子进程运行任务队列
+        Args:
+            tasks(list): 任务实例列表，只会把任务名称传给子进程，由子进程重新创建任务
+            hwnd(int): 目标窗口句柄
+            loop_count(int): 循环次数
+            timeout(int): 单个任务超时时间
+            stuck_timeout(float): 卡死检测时间（秒）
+        """
+        if self._is_running:
+            logger.warning("任务队列已在运行中", mode=self.log_mode)
+            return
+
+        if not tasks:
+            logger.warning("任务列表为空，无法启动", mode=self.log_mode)
+            return
+
+        task_names = [task.get_task_name() for task in tasks]
+        self._cmd_queue = self._ctx.Queue()
+        self._event_queue = self._ctx.Queue()
+        self._frame_buffer = SharedFrameBuffer()
+        self._frame_buffer.set_active(self._preview[0]) # 只有匹配预览读取整帧画面
+        self._thumbnail_buffer = SharedFrameBuffer(max_size=(FrameCache.THUMBNAIL_WIDTH, FrameCache.THUMBNAIL_WIDTH))
+        self._thumbnail_seq = 0
+        self._log_context = {"hwnd": hwnd, "task": None}
+        self._process = self._ctx.Process(
+            target=child_main,
+            args=(self._cmd_queue, self._event_queue, task_names, dict(task_cfg_model.task_cfg), hwnd,
+                  loop_count, timeout, stuck_timeout, self.log_mode, self._frame_buffer.name, self.phase,
+                  thread_budget.process_budget(thread_budget.instances), match_server.client_args(),
+                  self._thumbnail_buffer.name, self._preview),
+            daemon=True
+        )
+        self._is_running = True
+        self._is_paused = False
+        self._process.start()
+
+        self._listener = threading.Thread(target=self._listen, daemon=True)
+        self._listener.start()
+        logger.info(f"任务子进程已启动 (PID: {self._process.pid})", mode=1, hwnd=self._log_context["hwnd"])
+
+    def _listen(self):
+        """
+        读取子进程的事件并转换为本对象的信号，子进程退出后清理资源.
+        """
+        exited = False
+        # 子进程转发的日志在本线程中写入，归到这个实例的窗口和当前任务
+        logger.set_context(self._log_context)
+        try:
+            while True:
+                try:
+                    event = self._event_queue.get(timeout=0.5) # type: ignore
+                except queue.Empty:
+                    if not self._process.is_alive(): # type: ignore
+                        break
+                    continue
+
+                kind = event[0]
+                if kind == "signal":
+                    name, args = event[1], event[2]
+                    if name == "current_task_changed":
+                        self._log_context["task"] = args[0] if args[1] >= 0 else None
+                    elif name == "paused":
+                        self._is_paused = True
+                    elif name in ("resumed", "stopped", "finished"):
+                        self._is_paused = False
+                    getattr(self, name).emit(*args)
+                elif kind == "log":
+                    _, message, type, mode = event
+                    logger.log(message, type, mode)
+                elif kind == "event":
+                    logger.write_event(event[1])
+                elif kind == "overlay":
+                    self.overlay.apply(event[1])
+                elif kind == "exit":
+                    exited = True
+                    break
+        finally:
+            self._process.join(timeout=5) # type: ignore
+            if not exited:
+                logger.error(f"任务子进程异常退出 (退出码: {self._process.exitcode})", mode=self.log_mode) # type: ignore
+                self.status_msg_changed.emit("异常终止")
+            with self._frame_lock:
+                if self._frame_buffer is not None:
+                    self._frame_buffer.close()
+                    self._frame_buffer = None
+                if self._thumbnail_buffer is not None:
+                    self._thumbnail_buffer.close()
+                    self._thumbnail_buffer = None
+            self._is_running = False
+            self._is_paused = False
+
+    def _send(self, cmd):
+        """
+        向子进程发送命令.
+        """
+        if self._is_running and self._cmd_queue is not None:
+            self._cmd_queue.put(cmd)
+
+    def stop(self):
+        """
+        停止执行
+        """
+        if not self._is_running:
+            return
+        logger.info("正在停止任务子进程...", mode=1, hwnd=self._log_context["hwnd"])
+        self._send("stop")
+
+    def pause(self):
+        """
+        暂停执行
+        """
+        if self._is_running and not self._is_paused:
+            self._send("pause")
+
+    def resume(self):
+        """
+        恢复执行
+        """
+        if self._is_running and self._is_paused:
+            self._send("resume")
+
+    def get_latest_frame(self):
+        """
+        读取子进程最近一次截图，只有打开匹配预览时子进程才把截图写入共享内存.
+
+        Returns:
+            np.ndarray | None: 画面副本，子进程未运行或还没有截图时返回 None。
+        """
+        with self._frame_lock:
+            if self._frame_buffer is None:
+                return None
+            _, frame = self._frame_buffer.read()
+        return frame
+
+    def get_thumbnail(self):
+        """
+        读取子进程最近一次写入的缩略图，只复制缩略图大小的数据.
+
+        Returns:
+            tuple[int, np.ndarray | None]: (序号, 缩略图)，序号不变说明没有新画面。
+        """
+        with self._frame_lock:
+            if self._thumbnail_buffer is not None:
+                seq, thumbnail = self._thumbnail_buffer.read()
+                if thumbnail is not None and seq != self._thumbnail_seq:
+                    # 序号跨多次运行递增，界面据此判断是否需要重绘
+                    self._thumbnail_seq = seq
+                    self._thumbnail = (self._thumbnail[0] + 1, thumbnail)
+        return self._thumbnail
+
+    def set_preview(self, enabled: bool, fps: float | None = None):
+        """
+        打开或关闭匹配预览的记录，子进程运行中时立即通知子进程
+        Args:
+            enabled(bool): 是否记录每轮的匹配结果
+            fps(float | None): 每秒最多记录的轮数，为 None 时不修改
+        """
+        self._preview = (enabled, fps if fps is not None else self._preview[1])
+        if not enabled:
+            self.overlay.clear()
+        with self._frame_lock:
+            if self._frame_buffer is not None:
+                self._frame_buffer.set_active(enabled)
+        self._send(("preview",) + self._preview)
+
+    def get_overlay(self):
+        """
+        获取最近一轮的匹配结果，截图取共享内存中的最新画面，每轮只读取一次.
+
+        Returns:
+            tuple[int, np.ndarray | None, list]: (序号, 截图, 匹配记录)，见 MatchOverlay.snapshot()。
+        """
+        seq, _, matches = self.overlay.snapshot()
+        if seq and seq != self._overlay_frame[0]:
+            frame = self.get_latest_frame()
+            if frame is not None:
+                self._overlay_frame = (seq, frame)
+        return seq, self._overlay_frame[1], matches
+
+    def wait_for_stop(self, timeout: float = 1.0):
+        """
+        等待子进程退出，最多等待 timeout 秒。
+        """
+        if self._listener is not None:
+            self._listener.join(timeout)
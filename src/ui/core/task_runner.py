@@ -1,10 +1,15 @@
 import threading
-import time
-import win32gui
 from PySide6.QtCore import QObject, Signal
-from ...modules.window_capture import WindowCapture
-from ...modules.auto_clicker import AutoClicker
-from ...ui.core.logger import logger
+from ...modules.stuck_watchdog import StuckWatchdog
+from ...modules.clock import Clock, real_clock
+from ...modules.interfaces import FrameSource, InputDevice
+from ...modules.match_pool import MatchPool, match_pool
+from ...modules.cpu_governor import cpu_governor
+from ...modules.match_server import MatchServer, match_server
+from ...modules.steps import Sleep, drive_steps, with_log_context
+from ...modules.frame_cache import FrameCache, ThumbnailCapture, frame_cache
+from ...modules.match_overlay import MatchOverlay
+from ...modules.logger import logger
 
 class TaskRunner(QObject):
     """
@@ -22,7 +27,18 @@ class TaskRunner(QObject):
     progress_changed = Signal(int)          # 总进度 (0-100)
     current_task_changed = Signal(str, int) # 当前任务名, 索引
     
-    def __init__(self, log_mode: int = 0):
+    def __init__(self, log_mode: int = 0, wincap: FrameSource | None = None, clicker: InputDevice | None = None, clock: Clock | None = None,
+                 pool: MatchPool | None = None, thumbnails: FrameCache | None = None, overlay: MatchOverlay | None = None):
+        """
+        Args:
+            log_mode(int): 日志模式
+            wincap(FrameSource | None): 截图对象，默认使用 WindowCapture，回放/模拟时可替换
+            clicker(InputDevice | None): 点击对象，默认使用 AutoClicker，回放/模拟时可替换
+            clock(Clock | None): 时钟对象，默认使用真实时钟，回放/模拟时可传入 VirtualClock
+            pool(MatchPool | None): 模板匹配线程池，默认使用进程内共享的 match_pool
+            thumbnails(FrameCache | None): 截图时顺带生成缩略图的缓存，默认使用进程内共享的 frame_cache
+            overlay(MatchOverlay | None): 匹配预览记录，默认每个执行器一个，预览打开时才记录
+        """
         super().__init__()
         # 线程控制
         self._thread = None
@@ -33,10 +49,87 @@ class TaskRunner(QObject):
         self.log_mode = log_mode
         self._current_hwnd = None
         self._current_task = None
+        self._log_context = {"hwnd": None, "task": None} # 工作循环中日志所属的窗口和任务，用于日志索引
         
         # 核心能力模块
-        self.wincap = WindowCapture()
-        self.clicker = AutoClicker()
+        self.clock = clock if clock is not None else real_clock
+        if wincap is None:
+            # 默认使用真实窗口，延迟导入避免在没有 win32 的环境（模拟器）中导入失败
+            from ...modules.window_capture import WindowCapture
+            wincap = WindowCapture()
+        if clicker is None:
+            from ...modules.auto_clicker import AutoClicker
+            clicker = AutoClicker()
+        self.thumbnails = thumbnails if thumbnails is not None else frame_cache
+        self.wincap = ThumbnailCapture(wincap, self.thumbnails) # 任务截图时顺带更新缩略图
+        self.clicker = clicker
+        self.overlay = overlay if overlay is not None else MatchOverlay() # 匹配预览记录
+        self.watchdog = StuckWatchdog(clock=self.clock) # 卡死看门狗
+        self.match_pool = pool if pool is not None else match_pool # 所有执行器共享的匹配线程池
+        self.governor = cpu_governor        # 所有执行器共享的 CPU 调速器
+        self.phase = None                   # 轮询相位，多开时由管理器分配
+        self.match_server: MatchServer = match_server # 匹配服务，运行时每个执行器连接一个客户端
+        self._match_client = None
+        self.max_task_restarts = 1          # 看门狗请求重启时，单个任务最多重启次数
+
+    def set_phase(self, phase):
+        """
+        设置轮询相位，下次启动时注入任务
+        Args:
+            phase(PhaseOffset | None): 轮询相位，为 None 时不对齐
+        """
+        self.phase = phase
+
+    def set_match_server(self, server: MatchServer):
+        """
+        设置匹配服务，下次启动时生效
+        Args:
+            server(MatchServer): 匹配服务，未运行时在本进程匹配
+        """
+        self.match_server = server
+
+    def _connect_match_server(self, tasks):
+        """
+        匹配服务运行时创建本次运行使用的客户端，并让服务预先加载这些任务的模板
+        """
+        if not self.match_server.is_running():
+            return None
+        try:
+            client = self.match_server.connect()
+            templates = set()
+            for task in tasks:
+                if hasattr(task, 'get_template_path_list'):
+                    templates.update(task.get_template_path_list())
+            client.warm(sorted(templates))
+            return client
+        except Exception as e:
+            logger.error(f"连接匹配服务失败，改为本地匹配: {e}", mode=self.log_mode)
+            return None
+
+    def get_thumbnail(self):
+        """
+        获取窗口最近画面的缩略图，不会额外截图
+        Returns:
+            tuple[int, np.ndarray | None]: (序号, 缩略图)，序号不变说明没有新画面
+        """
+        return self.thumbnails.get(self.wincap.hwnd)
+
+    def set_preview(self, enabled: bool, fps: float | None = None):
+        """
+        打开或关闭匹配预览的记录
+        Args:
+            enabled(bool): 是否记录每轮的截图和匹配结果
+            fps(float | None): 每秒最多记录的轮数，为 None 时不修改
+        """
+        self.overlay.set_enabled(enabled, fps)
+
+    def get_overlay(self):
+        """
+        获取最近一轮的截图和匹配结果，不会额外截图
+        Returns:
+            tuple[int, np.ndarray | None, list]: (序号, 截图, 匹配记录)，见 MatchOverlay.snapshot()
+        """
+        return self.overlay.snapshot()
 
     def is_running(self) -> bool:
         """
@@ -46,7 +139,7 @@ class TaskRunner(QObject):
         """
         return self._is_running
 
-    def start(self, tasks: list, hwnd: int, loop_count: int = 1, timeout: int = 600):
+    def start(self, tasks: list, hwnd: int, loop_count: int = 1, timeout: int = 600, stuck_timeout: float = 60):
         """
         启动任务队列
         Args:
@@ -54,6 +147,7 @@ class TaskRunner(QObject):
             hwnd(int): 目标窗口句柄
             loop_count(int): 循环次数
             timeout(int): 单个任务超时时间
+            stuck_timeout(float): 画面和操作无变化多久判定为卡住（秒），0 表示关闭卡死检测
         """
         if self._is_running:
             logger.warning("任务队列已在运行中", mode=self.log_mode)
@@ -74,23 +168,19 @@ class TaskRunner(QObject):
         self._is_running = True
         self._current_hwnd = hwnd
         self._current_task = None
+        self._log_context = {"hwnd": hwnd, "task": None}
+        self.watchdog.set_stuck_timeout(stuck_timeout)
         
         # 设置底层模块的句柄
         self.wincap.set_hwnd(hwnd)
         self.clicker.set_hwnd(hwnd)
         self.clicker.connect_window() # 确保连接
 
-        # 启动工作线程
-        self._thread = threading.Thread(
-            target=self._run_loop,
-            args=(tasks, loop_count, timeout),
-            daemon=True
-        )
-        self._thread.start()
+        self._launch(tasks, loop_count, timeout)
         
         self.started.emit()
         self.status_msg_changed.emit("运行中")
-        logger.info("任务队列已启动...", mode=self.log_mode)
+        logger.info("任务队列已启动...", mode=self.log_mode, hwnd=self._log_context["hwnd"])
 
     def stop(self):
         """
@@ -99,7 +189,7 @@ class TaskRunner(QObject):
         if not self._is_running:
             return
             
-        logger.info("正在停止任务队列...", mode=1)
+        logger.info("正在停止任务队列...", mode=1, hwnd=self._log_context["hwnd"])
         # 设置停止事件
         self._stop_event.set()
         
@@ -122,7 +212,7 @@ class TaskRunner(QObject):
             self._is_paused = True
             self.status_msg_changed.emit("已暂停")
             self.paused.emit()
-            logger.info("任务队列已暂停", mode=1)
+            logger.info("任务队列已暂停", mode=1, hwnd=self._log_context["hwnd"])
 
     def resume(self):
         """
@@ -134,7 +224,7 @@ class TaskRunner(QObject):
                 self._pause_condition.notify_all()
             self.status_msg_changed.emit("运行中")
             self.resumed.emit()
-            logger.info("任务队列已恢复", mode=1)
+            logger.info("任务队列已恢复", mode=1, hwnd=self._log_context["hwnd"])
 
     def _check_window_valid(self, hwnd) -> bool:
         """
@@ -142,22 +232,62 @@ class TaskRunner(QObject):
         """
         if not hwnd:
             return False
-        return bool(win32gui.IsWindow(hwnd) and win32gui.IsWindowVisible(hwnd))
+        self.wincap.set_hwnd(hwnd)
+        return self.wincap.is_window_valid()
+
+    def _launch(self, tasks, loop_count, timeout):
+        """
+        启动工作线程运行任务队列，子类可改为交给调度器运行
+        """
+        self._thread = threading.Thread(
+            target=self._run_loop,
+            args=(tasks, loop_count, timeout),
+            daemon=True
+        )
+        self._thread.start()
+
+    def _wait(self, seconds: float) -> bool:
+        """
+        暂停时先等待恢复，再等待指定时间（可被停止打断）
+        Returns:
+            bool: 被要求停止返回 True
+        """
+        with self._pause_condition:
+            while self._is_paused and not self._stop_event.is_set():
+                self._pause_condition.wait()
+        if self._stop_event.is_set():
+            return True
+        if seconds <= 0:
+            return False
+        return self.clock.wait(self._stop_event, seconds)
 
     def _run_loop(self, tasks, loop_count, timeout):
         """
         核心工作循环（运行在子线程）
         """
+        drive_steps(self._loop_steps(tasks, loop_count, timeout), self._wait)
+
+    def _loop_steps(self, tasks, loop_count, timeout):
+        """
+        核心工作循环（生成器），推进时日志自动带上本执行器的窗口和当前任务
+        """
+        return with_log_context(self._queue_steps(tasks, loop_count, timeout), self._log_context)
+
+    def _queue_steps(self, tasks, loop_count, timeout):
+        """
+        按循环次数依次运行任务队列（生成器），等待通过 yield 交给驱动方完成
+        """
         total_tasks_count = len(tasks)
         current_loop = 0
-        all_loop_start_time = time.time()
+        all_loop_start_time = self.clock.time()
         self.progress_changed.emit(0)
+        self._match_client = self._connect_match_server(tasks)
 
         try:
             # 外部循环：控制总的运行次数
             while current_loop < loop_count and not self._stop_event.is_set():
                 logger.info(f"--- 开始第 {current_loop + 1} 次循环 (共 {loop_count} 次) ---", mode=self.log_mode)
-                loop_start_time = time.time()
+                loop_start_time = self.clock.time()
                 
                 # 内部循环：迭代任务列表
                 for task_idx, task in enumerate(tasks):
@@ -167,14 +297,10 @@ class TaskRunner(QObject):
                         self.status_msg_changed.emit("窗口失效")
                         return # 直接退出线程
 
-                    # 暂停/停止检查
-                    with self._pause_condition:
-                        while self._is_paused:
-                            self.status_msg_changed.emit("已暂停")
-                            self._pause_condition.wait()
-                            if self._stop_event.is_set():
-                                logger.info("接收到停止信号，任务队列中止。", mode=self.log_mode)
-                                return
+                    # 暂停/停止检查，Sleep(0) 会先等到恢复运行
+                    if self._is_paused:
+                        self.status_msg_changed.emit("已暂停")
+                        yield Sleep(0)
 
                     if self._stop_event.is_set():
                         logger.info("接收到停止信号，任务队列中止。", mode=self.log_mode)
@@ -182,10 +308,11 @@ class TaskRunner(QObject):
 
                     # 任务准备
                     task_name = task.get_task_name()
+                    self._log_context["task"] = task_name
                     self.current_task_changed.emit(task_name, task_idx)
                     logger.info(f"开始运行任务: {task_name} (超时限制: {timeout}秒)", mode=self.log_mode)
                     
-                    task_start_time = time.time()
+                    task_start_time = self.clock.time()
                     self._current_task = task
 
                     # 注入依赖
@@ -202,12 +329,43 @@ class TaskRunner(QObject):
                         # 设置日志模式
                         if hasattr(task, 'set_log_mode'):
                             task.set_log_mode(self.log_mode)
+                        # 注入时钟
+                        if hasattr(task, 'set_clock'):
+                            task.set_clock(self.clock)
+                        # 注入共享匹配线程池
+                        if hasattr(task, 'set_match_pool'):
+                            task.set_match_pool(self.match_pool)
+                        # 注入 CPU 调速器
+                        if hasattr(task, 'set_governor'):
+                            task.set_governor(self.governor)
+                        # 注入匹配服务客户端
+                        if hasattr(task, 'set_match_client'):
+                            task.set_match_client(self._match_client)
+                        # 注入轮询相位
+                        if hasattr(task, 'set_phase'):
+                            task.set_phase(self.phase)
+                        # 注入匹配预览记录
+                        if hasattr(task, 'set_overlay'):
+                            task.set_overlay(self.overlay)
+                        # 注入卡死看门狗
+                        if hasattr(task, 'set_watchdog'):
+                            task.set_watchdog(self.watchdog)
                             
-                        # 执行任务 (阻塞调用)
-                        if hasattr(task, 'run'):
-                            task.run()
-                        else:
-                            task.start()
+                        # 执行任务，看门狗请求重启时重新执行
+                        restarts = 0
+                        while True:
+                            if hasattr(task, 'run_steps'):
+                                yield from task.run_steps()
+                            elif hasattr(task, 'run'):
+                                task.run()
+                            else:
+                                task.start()
+                            if (getattr(task, 'restart_requested', False) and restarts < self.max_task_restarts
+                                    and not self._stop_event.is_set()):
+                                restarts += 1
+                                logger.warning(f"任务 {task_name} 卡住，正在重启 (第 {restarts} 次)", mode=self.log_mode)
+                                continue
+                            break
                         
                     except Exception as e:
                         logger.error(f"任务 {task_name} 执行出错: {e}", mode=self.log_mode)
@@ -216,8 +374,9 @@ class TaskRunner(QObject):
                         self._current_task = None
 
                     # 更新进度与统计
-                    task_duration = time.time() - task_start_time
+                    task_duration = self.clock.time() - task_start_time
                     logger.info(f"任务 {task_name} 完成。耗时: {task_duration:.2f}秒", mode=self.log_mode)
+                    self._log_context["task"] = None
                     
                     progress = int((task_idx + 1) / total_tasks_count * 100)
                     self.progress_changed.emit(progress)
@@ -226,17 +385,17 @@ class TaskRunner(QObject):
                 if not self._stop_event.is_set():
                     current_loop += 1
                     self.progress_changed.emit(100)
-                    loop_total_duration = time.time() - loop_start_time
+                    loop_total_duration = self.clock.time() - loop_start_time
                     logger.info(f"第 {current_loop} 次循环完成，耗时: {loop_total_duration:.2f}秒", mode=self.log_mode)
                     
                     # 循环间歇，重置进度
                     if current_loop < loop_count:
-                        time.sleep(1) 
+                        yield Sleep(1)
                         self.progress_changed.emit(0)
 
             # 所有循环结束
             if not self._stop_event.is_set():
-                total_time = time.time() - all_loop_start_time
+                total_time = self.clock.time() - all_loop_start_time
                 logger.info(f"所有任务执行完毕，共运行 {current_loop} 次，总耗时 {total_time:.2f}秒", mode=self.log_mode)
                 self.status_msg_changed.emit("已完成")
                 self.finished.emit()
@@ -254,6 +413,9 @@ class TaskRunner(QObject):
             self._current_task = None
             self.current_task_changed.emit("无", -1)
             self.progress_changed.emit(0)
+            if self._match_client is not None:
+                self._match_client.close()
+                self._match_client = None
             # 确保在退出线程时，唤醒 Condition，防止其他线程在此等待
             with self._pause_condition:
                 self._is_paused = False
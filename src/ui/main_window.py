@@ -1,15 +1,13 @@
+import time
+_IMPORT_START = time.perf_counter() # 开始导入主窗口模块的时间，用于统计导入耗时
+
 import sys
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QPushButton, QStackedLayout
 )
-from .pages.page_dir import PageDir
-from .pages.page_task import PageScript
-from .pages.page_setting import PageSetting
 from .core.theme_manager import theme_manager
 from .models.settings_model import SettingsModel
-from .pages.page_multiple import PageMultiple
-from .pages.page_create_template import PageCreateTemplate
 from .core.logger import logger
 
 class MainWindow(QMainWindow):
@@ -17,6 +15,7 @@ class MainWindow(QMainWindow):
     主窗口类，包含导航栏和内容区域.
     """
     def __init__(self):
+        self._init_start = time.perf_counter() # 开始创建窗口的时间，用于统计首次绘制耗时
         super().__init__()
         self.setWindowTitle("YMJH Script")
         self.setGeometry(200, 100, 1200, 800)
@@ -50,26 +49,22 @@ class MainWindow(QMainWindow):
         self.stack_layout = QStackedLayout(self.content_widget)
         self.main_layout.addWidget(self.content_widget, 1)
 
-        # 页面
-        self.page_dir = PageDir()
-        self.page_script = PageScript()
-        self.page_multiple = PageMultiple()
-        self.page_setting = PageSetting(main_window=self)
-        self.page_create_template = PageCreateTemplate()
-
-        self.stack_layout.addWidget(self.page_dir)
-        self.stack_layout.addWidget(self.page_script)
-        self.stack_layout.addWidget(self.page_multiple)
-        self.stack_layout.addWidget(self.page_setting)
-        self.stack_layout.addWidget(self.page_create_template)
-        # 映射
-        self.page_dict = {
-            "dir": (self.page_dir, self.btn_dir),
-            "script": (self.page_script, self.btn_script),
-            "multiple": (self.page_multiple, self.btn_multiple),
-            "setting": (self.page_setting, self.btn_setting),
-            "create_template": (self.page_create_template, self.btn_create_template)
+        # 页面在第一次切换到时才创建，页面模块（OpenCV、任务类、win32 等）也在那时才导入
+        self.page_dir = None
+        self.page_script = None
+        self.page_multiple = None
+        self.page_setting = None
+        self.page_create_template = None
+        # 映射：页面名称 -> 导航按钮
+        self.nav_buttons = {
+            "dir": self.btn_dir,
+            "script": self.btn_script,
+            "multiple": self.btn_multiple,
+            "setting": self.btn_setting,
+            "create_template": self.btn_create_template
         }
+        self.page_dict = {} # 已创建的页面：页面名称 -> (页面, 导航按钮)
+        self.startup_times: dict[str, float] = {} # 启动各阶段耗时（秒），见 mark_startup()
 
         # 按钮绑定
         self.btn_dir.clicked.connect(lambda: self.switch_page("dir"))
@@ -85,17 +80,56 @@ class MainWindow(QMainWindow):
         current_theme = self.settings_model.get_current_theme() if self.settings_model.get_current_theme() else "light"
         theme_manager.apply_theme(current_theme)
 
+    def _create_page(self, name: str) -> QWidget:
+        """
+        创建页面，页面模块在这里才导入.
+        Args:
+            name (str): 页面名称
+        """
+        if name == "dir":
+            from .pages.page_dir import PageDir
+            return PageDir()
+        if name == "script":
+            from .pages.page_task import PageScript
+            return PageScript()
+        if name == "multiple":
+            from .pages.page_multiple import PageMultiple
+            return PageMultiple()
+        if name == "setting":
+            from .pages.page_setting import PageSetting
+            return PageSetting(main_window=self)
+        if name == "create_template":
+            from .pages.page_create_template import PageCreateTemplate
+            return PageCreateTemplate()
+        raise KeyError(name)
+
+    def get_page(self, name: str) -> QWidget:
+        """
+        获取页面，第一次获取时创建并加入内容区.
+        Args:
+            name (str): 页面名称，必须在 self.nav_buttons 中
+        """
+        if name not in self.page_dict:
+            start = time.perf_counter()
+            page = self._create_page(name)
+            self.stack_layout.addWidget(page)
+            self.page_dict[name] = (page, self.nav_buttons[name])
+            setattr(self, f"page_{name}", page)
+            logger.info(f"页面 {name} 创建耗时 {time.perf_counter() - start:.3f} 秒", mode=1)
+        return self.page_dict[name][0]
+
     # 页面切换
     def switch_page(self, name):
         """
         切换到指定页面.
         Args:
-            name (str): 页面名称，必须在 self.page_dict 中
+            name (str): 页面名称，必须在 self.nav_buttons 中
         """
-        page, btn = self.page_dict[name]
+        page = self.get_page(name)
+        btn = self.nav_buttons[name]
         index = self.stack_layout.indexOf(page)
         self.stack_layout.setCurrentIndex(index)
-        for _, b in self.page_dict.values():
+        for b in self.nav_buttons.values():
             b.setEnabled(True)
             b.setStyleSheet("")
         btn.setEnabled(False)
@@ -107,12 +141,12 @@ class MainWindow(QMainWindow):
         """
         logger.info("程序正在退出，开始清理线程...", mode=1)
 
-        # 清理多开页面的所有任务线程
-        if hasattr(self.page_multiple, 'manager'):
+        # 清理多开页面的所有任务线程（页面未创建时没有任务）
+        if self.page_multiple is not None and hasattr(self.page_multiple, 'manager'):
             self.page_multiple.manager.clear_items()
 
         # 清理脚本执行页面的任务线程
-        if hasattr(self.page_script, 'model'):
+        if self.page_script is not None and hasattr(self.page_script, 'model'):
             # 如果正在运行，先停止
             self.page_script.runner.stop()
             # 等待内部 Python 线程结束，防止它在 QObject 销毁后继续发射信号
@@ -124,6 +158,24 @@ class MainWindow(QMainWindow):
 
         super().closeEvent(event)
 
+    def mark_startup(self, stage: str):
+        """
+        记录从开始创建窗口到某个启动阶段的耗时.
+        Args:
+            stage (str): 阶段名称，如 "window_created"、"first_paint"
+        """
+        self.startup_times[stage] = round(time.perf_counter() - self._init_start, 3)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if "first_paint" not in self.startup_times:
+            # 首次绘制时写一条启动耗时报告：导入模块 + 创建窗口到首次绘制
+            self.mark_startup("first_paint")
+            times = self.startup_times
+            imported = times.get("imported", 0)
+            logger.info(f"启动耗时: 导入模块 {imported:.3f} 秒, 创建窗口 {times.get('window_created', 0):.3f} 秒, "
+                        f"首次绘制 {times['first_paint']:.3f} 秒, 合计 {imported + times['first_paint']:.3f} 秒", mode=1)
+
 def is_admin() -> bool:
     """
     检查当前是否以管理员权限运行
@@ -153,11 +205,14 @@ def run():
     """
     主函数，启动应用.
     """
+    imported = round(time.perf_counter() - _IMPORT_START, 3)
     app = QApplication(sys.argv)
     if not is_admin():
         if not show_admin_warning():
             sys.exit(1)
     window = MainWindow()
+    window.startup_times["imported"] = imported
+    window.mark_startup("window_created")
     window.show()
     sys.exit(app.exec())
 
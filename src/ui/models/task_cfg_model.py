@@ -33,6 +33,16 @@ class _TaskCfgModel(QObject):
             "template_retry_delay": 0.5,        # 模板匹配失败重试延迟（秒）
             "match_loop_delay": 1,              # 模板匹配循环延迟（秒）
             "rand_delay": 0.5,                  # 随机延迟范围（秒）
+            "stuck_timeout": 60,                # 画面和操作无变化多久判定为卡住（秒），0 表示关闭
+            "match_workers": 0,                 # 共享模板匹配线程数，0 表示按线程预算和实例数自动分配
+            "thread_budget": 0,                 # 匹配线程、OpenCV 和 ONNX Runtime 合计的线程预算，0 表示使用 CPU 核数
+            "execution_mode": "thread",         # 多开运行方式，thread 为线程，process 为每个窗口一个子进程
+            "max_match_rate": 0,                # 所有窗口合计的模板匹配速率上限（次/秒），0 表示不限制
+            "max_cpu_percent": 0,               # 本程序的 CPU 占用上限（%），0 表示不限制
+            "start_stagger": 2.0,               # 多开全部运行时相邻两个窗口的启动间隔（秒），0 表示同时启动
+            "match_server": False,              # 是否在独立的匹配服务进程中执行模板匹配
+            "match_server_cpus": "",            # 匹配服务进程绑定的 CPU，如 "0-3,6"，为空表示不限制
+            "preview_fps": 5,                   # 匹配预览每秒最多刷新的次数
         }
 
         self.load_task_cfg()
@@ -1,6 +1,5 @@
 from PySide6.QtCore import QObject, Signal
-from ...tasks.ri_chang_fu_ben import RiChangFuBen
-from ...tasks.lun_jian import LunJian
+from ...tasks.registry import TASK_MAP
 from .task_cfg_model import task_cfg_model
 from ..core.logger import logger
 
@@ -10,11 +9,8 @@ class TaskDataModel(QObject):
     """
     run_list_changed = Signal()  # 列表增删改时发送
 
-    # 任务名称到类的映射
-    TASK_MAP = {
-        "日常副本": RiChangFuBen,
-        "论剑": LunJian
-    }
+    # 任务名称到类的映射（见 src/tasks/registry.py）
+    TASK_MAP = TASK_MAP
 
     def __init__(self, log_mode: int = 0):
         super().__init__()
@@ -0,0 +1,118 @@
+import time
+from PySide6.QtWidgets import QDialog, QLabel, QPushButton, QGridLayout, QLineEdit, QComboBox
+from PySide6.QtCore import Qt
+from ..core.logger import logger
+from ..widgets.log_view import LogView
+
+
+class LogSearchWindow(QDialog):
+    """
+    日志搜索窗口，按窗口、任务、日志类型、时间和关键词筛选所有实例的历史日志.
+
+    查询走日志索引（见 LogIndex），只取出最新的 MAX_RESULTS 条，内容从日志文件中读出。
+    """
+    MAX_RESULTS = 2000  # 最多显示的日志条数
+    TIME_RANGES = (("全部时间", None), ("最近10分钟", 600), ("最近1小时", 3600), ("最近6小时", 6 * 3600), ("最近24小时", 24 * 3600))
+
+    def __init__(self, color_for_type=None, names: dict | None = None, parent=None):
+        """
+        Args:
+            color_for_type (Callable[[str], str] | None): 日志类型 -> 颜色名称。
+            names (dict[int, str] | None): 窗口句柄 -> 进程名称，用于窗口下拉框的显示。
+            parent (QWidget | None): 父窗口。
+        """
+        super().__init__(parent)
+        self.setWindowTitle("搜索日志")
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose) # 非模态打开，关闭后释放
+        self.resize(900, 600)
+        self.names = names or {}
+
+        self.main_layout = QGridLayout(self)
+        self.main_layout.setSpacing(10)
+        self.main_layout.setContentsMargins(10, 10, 10, 10)
+
+        # 筛选条件
+        self.text_input = QLineEdit()
+        self.text_input.setPlaceholderText("日志内容包含的文字，为空不限")
+        self.hwnd_box = QComboBox()
+        self.task_box = QComboBox()
+        self.level_box = QComboBox()
+        self.time_box = QComboBox()
+        for label, seconds in self.TIME_RANGES:
+            self.time_box.addItem(label, seconds)
+        self.search_btn = QPushButton("搜索")
+        self.status_label = QLabel()
+        self.result_view = LogView(color_for_type, "没有符合条件的日志", capacity=self.MAX_RESULTS)
+
+        self.main_layout.addWidget(QLabel("关键词:"), 0, 0)
+        self.main_layout.addWidget(self.text_input, 0, 1, 1, 3)
+        self.main_layout.addWidget(self.search_btn, 0, 4)
+        self.main_layout.addWidget(self.hwnd_box, 1, 0, 1, 2)
+        self.main_layout.addWidget(self.task_box, 1, 2)
+        self.main_layout.addWidget(self.level_box, 1, 3)
+        self.main_layout.addWidget(self.time_box, 1, 4)
+        self.main_layout.addWidget(self.result_view, 2, 0, 1, 5)
+        self.main_layout.addWidget(self.status_label, 3, 0, 1, 5)
+
+        self.search_btn.clicked.connect(self.search)
+        self.text_input.returnPressed.connect(self.search)
+        for box in (self.hwnd_box, self.task_box, self.level_box, self.time_box):
+            box.activated.connect(lambda _: self.search())
+
+        self.refresh_filters()
+        self.search()
+
+    def refresh_filters(self):
+        """
+        按日志索引中出现过的窗口、任务和日志类型刷新下拉框，保留当前选择.
+        """
+        facets = logger.get_log_index().facets()
+        for box, all_label, values, label_for in (
+            (self.hwnd_box, "全部窗口", facets["hwnd"], self._hwnd_label),
+            (self.task_box, "全部任务", facets["task"], lambda task: task or "(无任务)"),
+            (self.level_box, "全部类型", facets["level"], str),
+        ):
+            current = box.currentData()
+            box.blockSignals(True)
+            box.clear()
+            box.addItem(all_label, None)
+            for value in values:
+                box.addItem(label_for(value), value)
+            index = box.findData(current)
+            box.setCurrentIndex(max(0, index) if current is not None else 0)
+            box.blockSignals(False)
+
+    def _hwnd_label(self, hwnd: int) -> str:
+        """
+        窗口下拉框中显示的文字.
+        """
+        if not hwnd:
+            return "(无窗口)"
+        name = self.names.get(hwnd)
+        return f"{name} ({hwnd})" if name else str(hwnd)
+
+    def search(self):
+        """
+        按当前筛选条件查询并显示日志.
+        """
+        seconds = self.time_box.currentData()
+        start = time.time() - seconds if seconds is not None else None
+        filters = {"hwnd": self.hwnd_box.currentData(), "task": self.task_box.currentData(),
+                   "level": self.level_box.currentData(), "start": start}
+        text = self.text_input.text().strip()
+
+        t0 = time.perf_counter()
+        index = logger.get_log_index()
+        records = index.query(text=text or None, limit=self.MAX_RESULTS, **filters)
+        total = None if text else index.count(**filters)
+        elapsed = (time.perf_counter() - t0) * 1000
+
+        self.result_view.clear()
+        for record in records:
+            self.result_view.append(record["line"], record["level"])
+        self.result_view.log_model.flush()
+        self.result_view.scrollToBottom()
+        if total is not None and total > len(records):
+            self.status_label.setText(f"共约 {total} 条，显示最近 {len(records)} 条，用时 {elapsed:.0f} 毫秒")
+        else:
+            self.status_label.setText(f"找到 {len(records)} 条{'（只显示最近的部分）' if len(records) >= self.MAX_RESULTS else ''}，用时 {elapsed:.0f} 毫秒")
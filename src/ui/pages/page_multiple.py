@@ -1,15 +1,19 @@
 
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QLabel, QComboBox, QGridLayout, QTextEdit, QTableView, QHeaderView, QAbstractItemView
+    QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QLabel, QComboBox, QGridLayout, QTableView, QHeaderView, QAbstractItemView, QTabWidget
 )
-from PySide6.QtGui import QTextCursor
 from PySide6.QtCore import QTimer, Qt
 from src.ui.core.logger import logger
 from src.ui.core.mutiple_manager import MultipleProcessManager
 from ..widgets.task_list import MultipleTaskList
 from ..widgets.multiple_table_model import MultipleTableModel
+from ..widgets.log_view import LogView
+from ..widgets.thumbnail_grid import ThumbnailGrid
+from ..widgets.match_preview import MatchPreview
+from ..models.task_cfg_model import task_cfg_model
 from ..core.theme_manager import theme_manager
 from .script_cfg_window import ScriptCfgWindow
+from .log_search_window import LogSearchWindow
 from ..core.process_item import ProcessItem
 
 class PageMultiple(QWidget):
@@ -63,6 +67,7 @@ class PageMultiple(QWidget):
         self.change_task_btn = QPushButton("更新任务列表")
         self.change_task_cfg_btn = QPushButton("修改任务配置")
         self.add_process_btn = QPushButton("添加到列表")
+        self.search_log_btn = QPushButton("搜索日志")
 
         # 任务选择框
         self.task_box = QComboBox()
@@ -103,10 +108,7 @@ class PageMultiple(QWidget):
         self.change_task_btn.setEnabled(False)
         
         # 日志显示区域
-        self.log_area = QTextEdit()
-        self.log_area.setReadOnly(True)
-        self.log_area.setPlaceholderText("日志输出区域")
-        self.log_area.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse | Qt.TextInteractionFlag.TextSelectableByKeyboard)
+        self.log_area = LogView(self.get_color_for_type, "日志输出区域")
 
         # 进程列表
         self.process_view = QTableView()
@@ -116,6 +118,15 @@ class PageMultiple(QWidget):
         self.process_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.process_view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
 
+        # 缩略图面板，与进程列表放在同一位置的两个标签页中
+        self.thumbnail_grid = ThumbnailGrid()
+        # 选中进程的匹配预览，只在标签页可见时记录
+        self.match_preview = MatchPreview(task_cfg_model.task_cfg.get("preview_fps", 5))
+        self.process_tabs = QTabWidget()
+        self.process_tabs.addTab(self.process_view, "列表")
+        self.process_tabs.addTab(self.thumbnail_grid, "画面")
+        self.process_tabs.addTab(self.match_preview, "匹配")
+
         # 操作按钮布局
         self.op_hbox_layout = QHBoxLayout()
         self.op_hbox_layout.addWidget(self.pause_all_btn)
@@ -138,9 +149,10 @@ class PageMultiple(QWidget):
         self.operation_layout.addWidget(self.handle_box, 2, 2, 1, 1)
         self.operation_layout.addWidget(self.refresh_button, 2, 3, 1, 1)
         self.operation_layout.addWidget(self.show_window_button, 2, 4, 1, 1)
-        self.operation_layout.addWidget(self.process_view, 3, 0, 1, 5)
+        self.operation_layout.addWidget(self.process_tabs, 3, 0, 1, 5)
         self.operation_layout.addLayout(self.op_hbox_layout, 4, 0, 1, 5)
         self.operation_layout.addWidget(QLabel("日志"), 5, 0, 1, 1)
+        self.operation_layout.addWidget(self.search_log_btn, 5, 4, 1, 1)
         self.operation_layout.addWidget(self.log_area, 6, 0, 1, 5)
 
         # 任务列表
@@ -179,9 +191,17 @@ class PageMultiple(QWidget):
         self.table_model.data_changed_signal.connect(self._update_button_status)
         self.clear_task_btn.clicked.connect(lambda: self.task_list.clear())
         self.change_task_cfg_btn.clicked.connect(self.open_script_cfg)
+        self.search_log_btn.clicked.connect(self.open_log_search)
         self.change_task_btn.clicked.connect(lambda: self.on_task_list_modified())
-        self.manager.task_status_changed.connect(self.handle__status_cache_update)
+        self.manager.task_status_batch_changed.connect(self.handle__status_cache_update)
+        self.manager.process_item_changed.connect(self.thumbnail_grid.set_items)
+        self.manager.task_status_batch_changed.connect(self.thumbnail_grid.update_status)
+        self.thumbnail_grid.item_clicked.connect(self.select_process)
+        self.manager.process_item_changed.connect(lambda _: self._update_preview_runner())
+        task_cfg_model.task_cfg_updated.connect(lambda cfg: self.match_preview.set_fps(cfg.get("preview_fps", 5)))
         logger.log_multiprocess_signal.connect(self.display_log_message)
+        # 日志颜色在绘制时按主题取，切换主题后重绘
+        theme_manager.theme_changed.connect(lambda _: self.log_area.viewport().update())
 
 # --- 辅助方法 ---
     def show_window(self):
@@ -245,21 +265,29 @@ class PageMultiple(QWidget):
         return handle
 
 # --- 槽函数 ---
-    def handle__status_cache_update(self, handle: int, status_dict: dict):
+    def handle__status_cache_update(self, batch: dict):
         """
-        接收并处理 TaskModel 的详细状态更新。
+        接收并处理一个刷新周期内各 TaskModel 的状态更新。
+
+        Args:
+            batch (dict): 窗口句柄 -> 状态字典。
         """
+        updates = {}
+        for handle, status_dict in batch.items():
+            updates[handle] = {
+                "current_run": status_dict.get("current_task", "N/A"),
+                "progress": status_dict.get("progress", 0),
+                "status": status_dict.get("overall_status", "N/A"),
+            }
+        self.table_model.update_rows(updates)
 
-        current_task = status_dict.get("current_task", "N/A")
-        progress = status_dict.get("progress", 0)
-        overall_status = status_dict.get("overall_status", "N/A")
-        
-        status = {
-            "current_run": current_task,
-            "progress": progress,
-            "status": overall_status
-        }
-        self._refresh_process_status(handle, status)
+    def select_process(self, handle: int):
+        """
+        在进程列表中选中指定句柄的进程.
+        """
+        index = self.table_model.find_index_by_handle_int(handle)
+        if index is not None:
+            self.process_view.selectRow(index)
 
     def _update_widget_status(self):
         """
@@ -270,19 +298,30 @@ class PageMultiple(QWidget):
         
         handle = self.get_current_handle()
         self.handle_box.setCurrentText(str(handle))
+        self._update_preview_runner()
+
+    def _update_preview_runner(self):
+        """
+        匹配预览跟随当前选中的进程.
+        """
+        handle = self.get_current_handle()
+        item = self.manager.get_item(handle) if handle is not None else None
+        self.match_preview.set_runner(item.runner if item is not None else None)
 
     def run_all_processes(self):
         """
         运行所有进程
         """
-        for item in self.manager.get_all_items().values():
-            if item._status_cache["overall_status"] == "已停止" or item._status_cache["overall_status"] == "未运行":
-                item.start_process()
+        items = [item for item in self.manager.get_all_items().values()
+                 if item._status_cache["overall_status"] in ("已停止", "未运行") and not self.manager.has_pending_start(item.handle)]
+        # 由管理器错开启动时间和轮询相位
+        self.manager.start_all(items)
 
     def stop_all_processes(self):
         """
         停止所有进程
         """
+        self.manager.cancel_pending_starts()
         for item in self.manager.get_all_items().values():
             if item._status_cache["overall_status"] == "运行中" or item._status_cache["overall_status"] == "已暂停":
                 item.stop_process()
@@ -340,6 +379,14 @@ class PageMultiple(QWidget):
         cfg_window = ScriptCfgWindow(self)
         cfg_window.exec()
 
+    def open_log_search(self):
+        """
+        打开日志搜索窗口，窗口下拉框显示各进程的名称.
+        """
+        names = {hwnd: item.name for hwnd, item in self.manager.get_all_items().items()}
+        search_window = LogSearchWindow(self.get_color_for_type, names, self)
+        search_window.show()
+
     def on_task_list_modified(self):
         """
         当任务列表被用户修改时，将新列表发送回 Manager 和子进程。
@@ -482,16 +529,6 @@ class PageMultiple(QWidget):
                 "progress": item._status_cache["progress"],
             })
 
-    def _refresh_process_status(self, handle: int, status: dict):
-        """
-        刷新指定进程的状态
-        """
-        index = self.table_model.find_index_by_handle_int(handle)
-        if index != None and index != -1:
-            self.table_model.update_data(index, 2, status["status"])
-            self.table_model.update_data(index, 3, status["current_run"])
-            self.table_model.update_data(index, 4, status["progress"])
-
     def control_process(self):
         """
         控制选中进程的启动/停止
@@ -507,9 +544,9 @@ class PageMultiple(QWidget):
             return
 
         if item._status_cache["overall_status"] == "已停止" or item._status_cache["overall_status"] == "未运行":
-            item.start_process()
+            self.manager.start_item(item)
         else:
-            item.stop_process()
+            self.manager.stop_item(item)
         
     def add_process(self):
         """
@@ -533,21 +570,8 @@ class PageMultiple(QWidget):
         """
         接收日志并以不同的颜色显示。
         """
-        color = self.get_color_for_type(log_type)
-        # 使用 HTML 格式化文本
-        html_message = f'<span style="color: {color};">{message}</span>'
-        # 将 HTML 文本追加到 QTextEdit
-        self.log_area.append(html_message)
-
-        # 限制最大显示块数，防止内存溢出
-        if self.log_area.document().blockCount() > 500:
-            cursor = self.log_area.textCursor()
-            cursor.movePosition(QTextCursor.MoveOperation.Start)
-            cursor.select(QTextCursor.SelectionType.BlockUnderCursor)
-            cursor.removeSelectedText()
-            cursor.deleteChar() # 删除换行符
-        # 滚动到底部
-        self.log_area.ensureCursorVisible()
+        # 只放入日志模型的待添加队列，由定时器批量插入
+        self.log_area.append(message, log_type)
 
     def add_task_to_list(self):
         """
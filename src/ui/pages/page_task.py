@@ -1,6 +1,5 @@
-from PySide6.QtWidgets import QWidget, QGridLayout, QLabel, QComboBox, QProgressBar, QTextEdit, QVBoxLayout, QPushButton
-from PySide6.QtGui import QColor, QBrush, QTextCursor
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QWidget, QGridLayout, QLabel, QComboBox, QProgressBar, QVBoxLayout, QPushButton
+from PySide6.QtGui import QColor, QBrush
 
 
 from ..models.task_data_model import TaskDataModel
@@ -9,7 +8,9 @@ from ..core.window_manager import WindowManager
 from ..models.task_cfg_model import task_cfg_model
 
 from ..widgets.task_list import TaskList
+from ..widgets.log_view import LogView
 from .script_cfg_window import ScriptCfgWindow
+from .log_search_window import LogSearchWindow
 from ..core.logger import logger
 from ..core.theme_manager import theme_manager
 
@@ -44,10 +45,7 @@ class PageScript(QWidget):
         # 创建任务列表控件
         self.task_list = TaskList(self.data_model, "点击右侧“添加”按钮以添加任务")
         # 创建日志输出区域
-        self.log_area = QTextEdit()
-        self.log_area.setPlaceholderText("日志输出区域")
-        self.log_area.setReadOnly(True)
-        self.log_area.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse | Qt.TextInteractionFlag.TextSelectableByKeyboard)
+        self.log_area = LogView(self.get_color_for_type, "日志输出区域")
 
         # 创建状态标签并设置样式
         self.status_label = QLabel("")
@@ -74,6 +72,7 @@ class PageScript(QWidget):
         self.show_window_btn = QPushButton("显示窗口")
         self.clear_run_list_btn = QPushButton("清空列表")
         self.pause_btn = QPushButton("暂停任务")
+        self.search_log_btn = QPushButton("搜索日志")
 
         # 设置按钮宽度
         self.find_window_btn.setFixedWidth(100)
@@ -123,6 +122,7 @@ class PageScript(QWidget):
         self.scfg_grid.addWidget(self.running_task, 3, 3, 1, 1)
         self.scfg_grid.addWidget(self.progress_bar, 4, 0, 1, 5)
         self.scfg_grid.addWidget(QLabel("日志"), 5, 0, 1, 1)
+        self.scfg_grid.addWidget(self.search_log_btn, 5, 4, 1, 1)
         self.scfg_grid.addWidget(self.log_area, 6, 0, 1, 5)
 
         # 将左侧容器和脚本配置布局添加到主布局
@@ -137,6 +137,13 @@ class PageScript(QWidget):
         """
         cfg_window = ScriptCfgWindow(self)
         cfg_window.exec()
+
+    def open_log_search(self):
+        """
+        打开日志搜索窗口.
+        """
+        search_window = LogSearchWindow(self.get_color_for_type, parent=self)
+        search_window.show()
             
     def get_color_for_type(self, log_type: str) -> str:
         """
@@ -162,27 +169,15 @@ class PageScript(QWidget):
         """
         接收日志并以不同的颜色显示。
         """
-        color = self.get_color_for_type(log_type)
-        # 使用 HTML 格式化文本
-        html_message = f'<span style="color: {color};">{message}</span>'
-        # 将 HTML 文本追加到 QTextEdit
-        self.log_area.append(html_message)
-
-        # 限制最大显示块数，防止内存溢出
-        if self.log_area.document().blockCount() > 500:
-            cursor = self.log_area.textCursor()
-            cursor.movePosition(QTextCursor.MoveOperation.Start)
-            cursor.select(QTextCursor.SelectionType.BlockUnderCursor)
-            cursor.removeSelectedText()
-            cursor.deleteChar() # 删除换行符
-        # 滚动到底部
-        self.log_area.ensureCursorVisible()
+        # 只放入日志模型的待添加队列，由定时器批量插入
+        self.log_area.append(message, log_type)
 
     
     def _setup_connections(self):
         """
         连接所有信号与槽.
         """
+        self.search_log_btn.clicked.connect(self.open_log_search)
         self.runner.status_msg_changed.connect(self.status_label.setText)
         self.runner.status_msg_changed.connect(self.update_run_button_state) # 复用按钮状态逻辑
         self.runner.progress_changed.connect(self.progress_bar.setValue)
@@ -205,6 +200,8 @@ class PageScript(QWidget):
         
         # 日志
         logger.log_signal.connect(self.display_log_message)
+        # 日志颜色在绘制时按主题取，切换主题后重绘
+        theme_manager.theme_changed.connect(lambda _: self.log_area.viewport().update())
 
     def _on_window_connected(self, hwnd, title):
         self.window_title.setText(title)
@@ -289,8 +286,9 @@ class PageScript(QWidget):
 
             loop_count = task_cfg_model.task_cfg.get("loop_count", 1)
             timeout = task_cfg_model.task_cfg.get("timeout", 600)
+            stuck_timeout = task_cfg_model.task_cfg.get("stuck_timeout", 60)
             
-            self.runner.start(tasks, hwnd, loop_count=loop_count, timeout=timeout)
+            self.runner.start(tasks, hwnd, loop_count=loop_count, timeout=timeout, stuck_timeout=stuck_timeout)
 
     def _toggle_pause_task(self):
         """
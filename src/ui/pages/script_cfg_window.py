@@ -1,4 +1,4 @@
-from PySide6.QtWidgets import QDialog, QLabel, QPushButton, QSpinBox, QDoubleSpinBox, QGridLayout, QLineEdit
+from PySide6.QtWidgets import QDialog, QLabel, QPushButton, QSpinBox, QDoubleSpinBox, QGridLayout, QLineEdit, QComboBox, QCheckBox
 from ..models.task_cfg_model import task_cfg_model
 
 class ScriptCfgWindow(QDialog):
@@ -31,6 +31,16 @@ class ScriptCfgWindow(QDialog):
         self.loop_count = QLabel("循环次数：")                              # 循环次数
         self.timeout = QLabel("任务超时时间(秒):")                          # 任务超时时间（秒）
         self.rand_delay = QLabel("随机等待时间(秒):")                       # 随机等待时间（秒）
+        self.stuck_timeout = QLabel("卡死检测时间(秒, 0为关闭):")            # 卡死检测时间（秒）
+        self.match_workers = QLabel("匹配线程数(0为自动):")                  # 模板匹配线程数
+        self.thread_budget = QLabel("线程预算(0为CPU核数):")                 # 匹配/OpenCV/ONNX 合计线程预算
+        self.execution_mode = QLabel("多开运行方式:")                        # 多开运行方式
+        self.max_match_rate = QLabel("匹配速率上限(次/秒, 0为不限):")         # 所有窗口合计的匹配速率上限
+        self.max_cpu_percent = QLabel("CPU占用上限(%, 0为不限):")             # CPU 占用上限
+        self.start_stagger = QLabel("多开启动间隔(秒):")                       # 多开全部运行时的启动间隔
+        self.match_server = QLabel("独立匹配服务进程:")                        # 是否使用独立的匹配服务进程
+        self.match_server_cpus = QLabel("匹配服务绑定CPU(如0-3):")              # 匹配服务进程绑定的 CPU
+        self.preview_fps = QLabel("匹配预览帧率(次/秒):")                        # 匹配预览每秒最多刷新的次数
 
         # 创建目标窗口标题输入框，默认"一梦江湖"
         self.window_title_input = QLineEdit()
@@ -84,6 +94,63 @@ class ScriptCfgWindow(QDialog):
         self.rand_delay_input.setSingleStep(0.01)
         self.rand_delay_input.setValue(0.2)
 
+        # 创建卡死检测时间输入框，范围0-600，步长10，默认60
+        self.stuck_timeout_input = QSpinBox()
+        self.stuck_timeout_input.setRange(0, 600)
+        self.stuck_timeout_input.setSingleStep(10)
+        self.stuck_timeout_input.setValue(60)
+
+        # 创建匹配线程数输入框，范围0-64，步长1，默认0（自动）
+        self.match_workers_input = QSpinBox()
+        self.match_workers_input.setRange(0, 64)
+        self.match_workers_input.setSingleStep(1)
+        self.match_workers_input.setValue(0)
+
+        # 创建线程预算输入框，范围0-128，步长1，默认0（CPU核数）
+        self.thread_budget_input = QSpinBox()
+        self.thread_budget_input.setRange(0, 128)
+        self.thread_budget_input.setSingleStep(1)
+        self.thread_budget_input.setValue(0)
+
+        # 创建匹配速率上限输入框，范围0-1000，步长5，默认0（不限制）
+        self.max_match_rate_input = QSpinBox()
+        self.max_match_rate_input.setRange(0, 1000)
+        self.max_match_rate_input.setSingleStep(5)
+        self.max_match_rate_input.setValue(0)
+
+        # 创建CPU占用上限输入框，范围0-100，步长5，默认0（不限制）
+        self.max_cpu_percent_input = QSpinBox()
+        self.max_cpu_percent_input.setRange(0, 100)
+        self.max_cpu_percent_input.setSingleStep(5)
+        self.max_cpu_percent_input.setValue(0)
+
+        # 创建多开启动间隔输入框，范围0-60，步长0.5，默认2
+        self.start_stagger_input = QDoubleSpinBox()
+        self.start_stagger_input.setRange(0, 60.0)
+        self.start_stagger_input.setSingleStep(0.5)
+        self.start_stagger_input.setValue(2.0)
+
+        # 创建匹配服务开关，开启后所有窗口的模板匹配在一个独立进程中执行
+        self.match_server_input = QCheckBox("启用")
+        self.match_server_input.setChecked(False)
+
+        # 创建匹配服务绑定 CPU 输入框，为空表示不限制
+        self.match_server_cpus_input = QLineEdit()
+        self.match_server_cpus_input.setPlaceholderText("为空不限制")
+
+        # 创建匹配预览帧率输入框，范围1-30，步长1，默认5
+        self.preview_fps_input = QSpinBox()
+        self.preview_fps_input.setRange(1, 30)
+        self.preview_fps_input.setSingleStep(1)
+        self.preview_fps_input.setValue(5)
+
+        # 创建多开运行方式下拉框，线程模式为默认，进程模式下每个窗口一个子进程，协作模式下所有窗口共用一个调度线程，异步模式下所有窗口共用一个 asyncio 事件循环（对新添加的进程生效）
+        self.execution_mode_input = QComboBox()
+        self.execution_mode_input.addItem("线程(默认)", "thread")
+        self.execution_mode_input.addItem("进程(每个窗口一个子进程)", "process")
+        self.execution_mode_input.addItem("协作(所有窗口共用一个线程)", "coop")
+        self.execution_mode_input.addItem("异步(asyncio 事件循环)", "async")
+
         # 将各控件添加到主布局的指定位置
         self.main_layout.addWidget(self.match_threshold, 1, 0)
         self.main_layout.addWidget(self.mt_input, 1, 1, 1, 2)
@@ -112,7 +179,37 @@ class ScriptCfgWindow(QDialog):
         self.main_layout.addWidget(self.rand_delay, 9, 0)
         self.main_layout.addWidget(self.rand_delay_input, 9, 1, 1, 2)
 
-        self.main_layout.addWidget(accept_btn, 10, 2)
+        self.main_layout.addWidget(self.stuck_timeout, 10, 0)
+        self.main_layout.addWidget(self.stuck_timeout_input, 10, 1, 1, 2)
+
+        self.main_layout.addWidget(self.match_workers, 11, 0)
+        self.main_layout.addWidget(self.match_workers_input, 11, 1, 1, 2)
+
+        self.main_layout.addWidget(self.execution_mode, 12, 0)
+        self.main_layout.addWidget(self.execution_mode_input, 12, 1, 1, 2)
+
+        self.main_layout.addWidget(self.max_match_rate, 13, 0)
+        self.main_layout.addWidget(self.max_match_rate_input, 13, 1, 1, 2)
+
+        self.main_layout.addWidget(self.max_cpu_percent, 14, 0)
+        self.main_layout.addWidget(self.max_cpu_percent_input, 14, 1, 1, 2)
+
+        self.main_layout.addWidget(self.start_stagger, 15, 0)
+        self.main_layout.addWidget(self.start_stagger_input, 15, 1, 1, 2)
+
+        self.main_layout.addWidget(self.thread_budget, 16, 0)
+        self.main_layout.addWidget(self.thread_budget_input, 16, 1, 1, 2)
+
+        self.main_layout.addWidget(self.match_server, 17, 0)
+        self.main_layout.addWidget(self.match_server_input, 17, 1, 1, 2)
+
+        self.main_layout.addWidget(self.match_server_cpus, 18, 0)
+        self.main_layout.addWidget(self.match_server_cpus_input, 18, 1, 1, 2)
+
+        self.main_layout.addWidget(self.preview_fps, 19, 0)
+        self.main_layout.addWidget(self.preview_fps_input, 19, 1, 1, 2)
+
+        self.main_layout.addWidget(accept_btn, 20, 2)
 
         self.load_task_cfg()
 
@@ -131,6 +228,16 @@ class ScriptCfgWindow(QDialog):
         self.loop_count_input.setValue(task_cfg["loop_count"])
         self.timeout_input.setValue(task_cfg["timeout"])
         self.rand_delay_input.setValue(task_cfg["rand_delay"])
+        self.stuck_timeout_input.setValue(task_cfg["stuck_timeout"])
+        self.match_workers_input.setValue(task_cfg["match_workers"])
+        self.thread_budget_input.setValue(task_cfg["thread_budget"])
+        self.execution_mode_input.setCurrentIndex(max(0, self.execution_mode_input.findData(task_cfg["execution_mode"])))
+        self.max_match_rate_input.setValue(task_cfg["max_match_rate"])
+        self.max_cpu_percent_input.setValue(task_cfg["max_cpu_percent"])
+        self.start_stagger_input.setValue(task_cfg["start_stagger"])
+        self.match_server_input.setChecked(task_cfg["match_server"])
+        self.match_server_cpus_input.setText(task_cfg["match_server_cpus"])
+        self.preview_fps_input.setValue(task_cfg["preview_fps"])
     
     def apply_task_cfg(self):
         """
@@ -146,5 +253,15 @@ class ScriptCfgWindow(QDialog):
             "loop_count": self.loop_count_input.value(),
             "timeout": self.timeout_input.value(),
             "rand_delay": self.rand_delay_input.value(),
+            "stuck_timeout": self.stuck_timeout_input.value(),
+            "match_workers": self.match_workers_input.value(),
+            "thread_budget": self.thread_budget_input.value(),
+            "execution_mode": self.execution_mode_input.currentData(),
+            "max_match_rate": self.max_match_rate_input.value(),
+            "max_cpu_percent": self.max_cpu_percent_input.value(),
+            "start_stagger": self.start_stagger_input.value(),
+            "match_server": self.match_server_input.isChecked(),
+            "match_server_cpus": self.match_server_cpus_input.text().strip(),
+            "preview_fps": self.preview_fps_input.value(),
         })
         self.accept()
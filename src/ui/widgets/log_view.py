@@ -0,0 +1,167 @@
+from collections import deque
+from PySide6.QtWidgets import QListView, QAbstractItemView, QApplication
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, QTimer
+from PySide6.QtGui import QPainter, QColor, QKeySequence
+
+
+class LogListModel(QAbstractListModel):
+    """
+    日志列表模型.
+
+    日志保存在固定容量的环形缓冲区中，新日志先放入待添加队列，由定时器按固定间隔批量插入，
+    每批只发出一次 rowsInserted（超出容量时再加一次 rowsRemoved），日志再多界面线程的开销也只和刷新频率有关。
+    """
+    DEFAULT_CAPACITY = 5000     # 最多保留的日志条数
+    DEFAULT_INTERVAL = 100      # 批量插入的间隔（毫秒）
+
+    def __init__(self, color_for_type=None, capacity: int = DEFAULT_CAPACITY, interval: int = DEFAULT_INTERVAL, parent=None):
+        """
+        Args:
+            color_for_type (Callable[[str], str] | None): 日志类型 -> 颜色名称，显示时调用，切换主题后自动生效。
+            capacity (int): 最多保留的日志条数。
+            interval (int): 批量插入的间隔（毫秒）。
+        """
+        super().__init__(parent)
+        self.capacity = capacity
+        self.color_for_type = color_for_type
+        self._rows: deque = deque()                     # (日志, 类型)，已显示
+        self._pending: deque = deque(maxlen=capacity)   # (日志, 类型)，等待插入
+        self._colors: dict = {}                         # 颜色名称 -> QColor
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.flush)
+
+    def append(self, message: str, log_type: str = "INFO"):
+        """
+        添加一条日志（只放入待添加队列）.
+
+        Args:
+            message (str): 日志内容。
+            log_type (str): 日志类型。
+        """
+        self._pending.append((message, log_type))
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        """
+        把待添加的日志批量插入模型.
+        """
+        if not self._pending:
+            self._timer.stop()
+            return
+        batch = list(self._pending)
+        self._pending.clear()
+        # 先删掉放不下的旧日志
+        overflow = len(self._rows) + len(batch) - self.capacity
+        if overflow > 0:
+            overflow = min(overflow, len(self._rows))
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            for _ in range(overflow):
+                self._rows.popleft()
+            self.endRemoveRows()
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(batch) - 1)
+        self._rows.extend(batch)
+        self.endInsertRows()
+
+    def clear(self):
+        """
+        清空日志.
+        """
+        self.beginResetModel()
+        self._rows.clear()
+        self._pending.clear()
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        """
+        返回日志内容和颜色.
+        """
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        message, log_type = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole or role == Qt.ItemDataRole.ToolTipRole:
+            return message
+        if role == Qt.ItemDataRole.ForegroundRole and self.color_for_type is not None:
+            name = self.color_for_type(log_type)
+            color = self._colors.get(name)
+            if color is None:
+                color = self._colors[name] = QColor(name)
+            return color
+        return None
+
+    def text(self, rows: list[int]) -> str:
+        """
+        指定行的日志文本，每行一条.
+        """
+        return "\n".join(self._rows[row][0] for row in sorted(rows) if row < len(self._rows))
+
+
+class LogView(QListView):
+    """
+    日志显示控件.
+
+    QListView 只绘制可见的行，配合 LogListModel 批量插入，日志量大时界面依然流畅。
+    停留在底部时自动滚动到最新日志，往上翻看时不打断；支持多选后 Ctrl+C 复制。
+    """
+
+    def __init__(self, color_for_type=None, placeholder: str = "日志输出区域", capacity: int = LogListModel.DEFAULT_CAPACITY):
+        """
+        Args:
+            color_for_type (Callable[[str], str] | None): 日志类型 -> 颜色名称。
+            placeholder (str): 没有日志时显示的提示文字。
+            capacity (int): 最多保留的日志条数。
+        """
+        super().__init__()
+        self.placeholder = placeholder
+        self.log_model = LogListModel(color_for_type, capacity, parent=self)
+        self.setModel(self.log_model)
+        # 行高一致时视图不必逐行计算尺寸
+        self.setUniformItemSizes(True)
+        self.setWordWrap(False)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setHorizontalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self._follow = True # 是否跟随最新日志
+        self.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+        # 行数变化后滚动范围在布局完成时才更新，在范围变化时滚到底部
+        self.verticalScrollBar().rangeChanged.connect(self._on_range_changed)
+
+    def append(self, message: str, log_type: str = "INFO"):
+        """
+        添加一条日志，可直接连接 logger 的日志信号.
+        """
+        self.log_model.append(message, log_type)
+
+    def clear(self):
+        """
+        清空日志.
+        """
+        self.log_model.clear()
+
+    def _on_scrolled(self, value: int):
+        bar = self.verticalScrollBar()
+        self._follow = value >= bar.maximum()
+
+    def _on_range_changed(self, _minimum: int, maximum: int):
+        if self._follow:
+            self.verticalScrollBar().setValue(maximum)
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.StandardKey.Copy):
+            rows = [index.row() for index in self.selectionModel().selectedRows()]
+            if rows:
+                QApplication.clipboard().setText(self.log_model.text(rows))
+            return
+        super().keyPressEvent(event)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.log_model.rowCount() == 0:
+            painter = QPainter(self.viewport())
+            painter.setPen(QColor(150, 150, 150))
+            painter.drawText(10, 20, self.placeholder)
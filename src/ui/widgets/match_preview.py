@@ -0,0 +1,108 @@
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QSizePolicy
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QImage, QPixmap
+from ...modules.match_overlay import MatchOverlay, render_overlay
+
+
+class MatchPreview(QWidget):
+    """
+    实时显示一个实例最近一轮的模板匹配结果.
+
+    可见时打开执行器的匹配预览记录，按设定的帧率读取最近一轮的截图和匹配结果，
+    在界面线程中缩小并画出搜索区域、匹配框和相似度；不可见时关闭记录，任务线程不再为预览做任何事。
+    """
+    PREVIEW_WIDTH = 640     # 预览图宽度（像素）
+
+    def __init__(self, fps: float = MatchOverlay.DEFAULT_FPS):
+        """
+        Args:
+            fps (float): 每秒最多刷新的次数。
+        """
+        super().__init__()
+        self.runner = None
+        self.fps = fps
+        self._shown = (0, 0) # 已显示的 (轮次序号, 匹配数)
+        self.image_label = QLabel("没有选中进程或预览的进程没有在运行")
+        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.image_label.setMinimumSize(self.PREVIEW_WIDTH // 2, self.PREVIEW_WIDTH * 9 // 32)
+        self.image_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self.image_label.setStyleSheet("background-color: #202020; color: #909090;")
+        self.info_label = QLabel()
+        self.info_label.setWordWrap(True)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.image_label)
+        layout.addWidget(self.info_label)
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+        self._update_interval()
+
+    def _update_interval(self):
+        self._timer.setInterval(max(1, int(1000 / self.fps)) if self.fps > 0 else 1000)
+
+    def _set_runner_preview(self, enabled: bool):
+        set_preview = getattr(self.runner, "set_preview", None)
+        if set_preview is not None:
+            set_preview(enabled, self.fps)
+
+    def set_runner(self, runner):
+        """
+        切换预览的执行器，原执行器关闭记录.
+
+        Args:
+            runner (TaskRunner | ProcessRunner | None): 执行器，为 None 时清空预览。
+        """
+        if runner is self.runner:
+            return
+        self._set_runner_preview(False)
+        self.runner = runner
+        self._shown = (0, 0)
+        self.image_label.clear()
+        self.image_label.setText("没有选中进程或预览的进程没有在运行")
+        self.info_label.clear()
+        if self.isVisible():
+            self._set_runner_preview(True)
+
+    def set_fps(self, fps: float):
+        """
+        设置预览帧率.
+
+        Args:
+            fps (float): 每秒最多刷新的次数。
+        """
+        self.fps = fps
+        self._update_interval()
+        if self.isVisible():
+            self._set_runner_preview(True)
+
+    def refresh(self):
+        """
+        读取最近一轮的匹配结果，有变化时重绘.
+        """
+        get_overlay = getattr(self.runner, "get_overlay", None)
+        if get_overlay is None or not self.isVisible():
+            return
+        seq, frame, matches = get_overlay()
+        if frame is None or (seq, len(matches)) == self._shown:
+            return
+        self._shown = (seq, len(matches))
+        image = render_overlay(frame, matches, self.PREVIEW_WIDTH)
+        h, w = image.shape[:2]
+        qimage = QImage(image.data, w, h, image.strides[0], QImage.Format.Format_BGR888)
+        # QImage 不持有 numpy 数据，转换为 QPixmap 时完成复制
+        pixmap = QPixmap.fromImage(qimage).scaled(self.image_label.size(), Qt.AspectRatioMode.KeepAspectRatio,
+                                                   Qt.TransformationMode.SmoothTransformation)
+        self.image_label.setPixmap(pixmap)
+        self.info_label.setText("  ".join(
+            f"{name}: {score:.2f}{'✓' if center is not None and score >= threshold else '✗'}"
+            for name, _, _, center, score, _, threshold in matches) or "本轮没有匹配")
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._set_runner_preview(True)
+        self._timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._timer.stop()
+        self._set_runner_preview(False)
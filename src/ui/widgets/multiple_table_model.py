@@ -158,6 +158,36 @@ class MultipleTableModel(QAbstractTableModel):
             
         return False
     
+    def update_rows(self, updates: dict[int, dict]) -> int:
+        """
+        按句柄批量更新多行，只对值真正变化的单元格发出 dataChanged，最后只发一次 data_changed_signal。
+
+        Args:
+            updates: 窗口句柄 -> {键名: 新值}，键名见 self._keys。
+
+        Returns:
+            int: 变化的单元格数。
+        """
+        rows = {task["handle"]: row for row, task in enumerate(self._data)}
+        changed = 0
+        for handle, values in updates.items():
+            row = rows.get(handle)
+            if row is None:
+                continue
+            columns = []
+            for key, value in values.items():
+                new_value = str(value)
+                if str(self._data[row].get(key)) != new_value:
+                    self._data[row][key] = new_value
+                    columns.append(self._keys.index(key))
+            if columns:
+                # 一行中变化的单元格合并为一个范围
+                self.dataChanged.emit(self.index(row, min(columns)), self.index(row, max(columns)), [Qt.ItemDataRole.DisplayRole])
+                changed += len(columns)
+        if changed:
+            self.data_changed_signal.emit()
+        return changed
+
     def add_data(self, task_data: dict):
         """
         向列表末尾添加一个新任务。
@@ -0,0 +1,146 @@
+from PySide6.QtWidgets import QWidget, QScrollArea, QGridLayout, QVBoxLayout, QLabel, QSizePolicy
+from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtGui import QImage, QPixmap
+
+
+class ThumbnailTile(QWidget):
+    """
+    单个实例的缩略图和状态.
+    """
+    clicked = Signal(int) # 参数为窗口句柄
+
+    def __init__(self, item, width: int):
+        """
+        Args:
+            item (ProcessItem): 对应的实例。
+            width (int): 缩略图显示宽度。
+        """
+        super().__init__()
+        self.item = item
+        self.seq = 0 # 已显示的缩略图序号
+        self.image_label = QLabel("暂无画面")
+        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.image_label.setFixedSize(width, width * 9 // 16)
+        self.image_label.setStyleSheet("background-color: #202020; color: #909090;")
+        self.title_label = QLabel()
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        layout.setSpacing(2)
+        layout.addWidget(self.image_label)
+        layout.addWidget(self.title_label)
+        self.update_title()
+
+    def update_title(self):
+        """
+        刷新名称和状态文字.
+        """
+        status = self.item._status_cache
+        self.title_label.setText(f"{self.item.name} [{status['overall_status']}] {status['current_task']} {status['progress']}%")
+
+    def update_image(self) -> bool:
+        """
+        有新的缩略图时重绘，不会触发截图.
+
+        Returns:
+            bool: 重绘了画面返回 True。
+        """
+        get_thumbnail = getattr(self.item.runner, "get_thumbnail", None)
+        if get_thumbnail is None:
+            return False
+        seq, thumbnail = get_thumbnail()
+        if thumbnail is None or seq == self.seq:
+            return False
+        self.seq = seq
+        h, w = thumbnail.shape[:2]
+        channels = thumbnail.shape[2] if thumbnail.ndim == 3 else 1
+        if channels == 3:
+            image = QImage(thumbnail.data, w, h, thumbnail.strides[0], QImage.Format.Format_BGR888)
+        else:
+            image = QImage(thumbnail.data, w, h, thumbnail.strides[0], QImage.Format.Format_Grayscale8)
+        # QImage 不持有 numpy 数据，转换为 QPixmap 时完成复制
+        pixmap = QPixmap.fromImage(image).scaled(self.image_label.size(), Qt.AspectRatioMode.KeepAspectRatio,
+                                                  Qt.TransformationMode.SmoothTransformation)
+        self.image_label.setPixmap(pixmap)
+        return True
+
+    def mousePressEvent(self, event):
+        self.clicked.emit(self.item.handle)
+        super().mousePressEvent(event)
+
+
+class ThumbnailGrid(QScrollArea):
+    """
+    所有实例的低帧率缩略图面板.
+
+    缩略图由任务工作线程截图时顺带生成（见 FrameCache），这里只按固定频率读取最新的缩略图，
+    序号没变时不重绘，控件不可见时不刷新，不会额外截图，也不需要把游戏窗口切到前台。
+    """
+    REFRESH_INTERVAL = 500      # 刷新间隔（毫秒），即 2 FPS
+    TILE_WIDTH = 240            # 缩略图显示宽度（像素）
+    item_clicked = Signal(int)  # 点击缩略图，参数为窗口句柄
+
+    def __init__(self, columns: int = 3):
+        """
+        Args:
+            columns (int): 每行显示的缩略图数。
+        """
+        super().__init__()
+        self.columns = columns
+        self.tiles: dict[int, ThumbnailTile] = {} # hwnd -> 缩略图
+        self.setWidgetResizable(True)
+        self.container = QWidget()
+        self.container.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Maximum)
+        self.grid = QGridLayout(self.container)
+        self.grid.setAlignment(Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft)
+        self.setWidget(self.container)
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.REFRESH_INTERVAL)
+        self._timer.timeout.connect(self.refresh)
+
+    def set_items(self, items: dict):
+        """
+        按实例列表重建缩略图.
+
+        Args:
+            items (dict[int, ProcessItem]): 窗口句柄 -> 实例。
+        """
+        for tile in self.tiles.values():
+            self.grid.removeWidget(tile)
+            tile.deleteLater()
+        self.tiles.clear()
+        for index, (hwnd, item) in enumerate(items.items()):
+            tile = ThumbnailTile(item, self.TILE_WIDTH)
+            tile.clicked.connect(self.item_clicked.emit)
+            self.grid.addWidget(tile, index // self.columns, index % self.columns)
+            self.tiles[hwnd] = tile
+        self.refresh()
+
+    def update_status(self, batch: dict):
+        """
+        刷新状态有变化的实例的文字.
+
+        Args:
+            batch (dict): 窗口句柄 -> 状态，见 MultipleProcessManager.task_status_batch_changed。
+        """
+        for hwnd in batch:
+            tile = self.tiles.get(hwnd)
+            if tile is not None:
+                tile.update_title()
+
+    def refresh(self):
+        """
+        读取各实例的最新缩略图，有变化的才重绘.
+        """
+        if not self.isVisible():
+            return
+        for tile in self.tiles.values():
+            tile.update_image()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self._timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._timer.stop()